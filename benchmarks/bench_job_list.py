@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Job list conversion benchmark: compares converting a synthetic list of
+100k native jobs as it was done before bulk conversion (a drmaa2_j struct
+allocated per job, fields set through ByteString descriptors) against
+Job.to_py_job_list(). The list accessors are emulated in Python, so the
+DRMAA2 library is not needed.
+"""
+
+import timeit
+from ctypes import addressof
+from ctypes import cast
+from ctypes import POINTER
+
+from drmaa2.job import Job
+from drmaa2.byte_string import ByteString
+from drmaa2.drmaa2_ctypes import drmaa2_j
+from drmaa2.drmaa2_ctypes import drmaa2_string
+from drmaa2.drmaa2_object_descriptors import Drmaa2StringDescriptor
+
+N_JOBS = 100000
+N_REPEATS = 3
+
+
+class SyntheticJobList(object):
+    """ Emulates DRMAA2 list accessors for a list of native jobs. """
+
+    def __init__(self, n_jobs):
+        self.jobs = [drmaa2_j(str(i).encode(), b'session', b'job%d' % i) for i in range(n_jobs)]
+        self.addresses = [addressof(j) for j in self.jobs]
+
+    def drmaa2_list_size(self, ctypes_list):
+        return len(self.addresses)
+
+    def drmaa2_list_get(self, ctypes_list, i):
+        return self.addresses[i]
+
+
+class LegacyStringDescriptor(Drmaa2StringDescriptor):
+    """ String descriptor as it was before the fast codec, converting through ByteString. """
+
+    def __get__(self, obj, type=None):
+        value = None
+        if self.can_read(obj):
+            value = getattr(obj._struct.contents, self.name)
+            if hasattr(value, 'value'):
+                value = value.value
+        return ByteString(value).decode()
+
+    def __set__(self, obj, value):
+        if not self.can_write(obj):
+            return
+        if value is not None:
+            value = ByteString(value).encode()
+        else:
+            value = ByteString(drmaa2_string()).encode()
+        setattr(obj._struct.contents, self.name, value)
+        obj._dict[self.name] = value
+
+
+class LegacyJob(object):
+    """ Job as it was constructed before bulk conversion: a drmaa2_j struct is allocated per job. """
+
+    id = LegacyStringDescriptor('id')
+    session_name = LegacyStringDescriptor('session_name')
+    job_name = LegacyStringDescriptor('job_name')
+
+    def __init__(self, job):
+        self._struct = None
+        self._dict = {}
+        self._read_only = False
+        self._struct = POINTER(drmaa2_j)()
+        self._struct.contents = drmaa2_j()
+        self.id = ByteString(getattr(job.contents, 'id').value).decode()
+        self.session_name = ByteString(getattr(job.contents, 'session_name').value).decode()
+        self.job_name = ByteString(getattr(job.contents, 'job_name').value).decode()
+
+    def to_dict(self):
+        return {'id': self.id, 'session_name': self.session_name, 'job_name': self.job_name}
+
+
+def legacy_to_py_job_list(ctypes_list):
+    drmaa2_lib = Job.get_drmaa2_library()
+    py_job_list = []
+    if ctypes_list:
+        count = drmaa2_lib.drmaa2_list_size(ctypes_list)
+        Job.logger.debug('Converting ctypes job list of size {}'.format(count))
+        for i in range(count):
+            void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
+            if void_ptr:
+                j = cast(void_ptr, POINTER(drmaa2_j))
+                j = LegacyJob(j)
+                py_job_list.append(j)
+            else:
+                py_job_list.append(None)
+    return py_job_list
+
+
+def to_py_job_list(ctypes_list):
+    return Job.to_py_job_list(ctypes_list)
+
+
+if __name__ == '__main__':
+    Job.drmaa2_lib = SyntheticJobList(N_JOBS)
+    assert [j.to_dict() for j in legacy_to_py_job_list(1)[:10]] == [j.to_dict() for j in to_py_job_list(1)[:10]]
+    times = {}
+    for f in [legacy_to_py_job_list, to_py_job_list]:
+        times[f] = min(timeit.repeat(lambda: f(1), repeat=N_REPEATS, number=1))
+        print('%-22s %8.3f sec for %d jobs' % (f.__name__, times[f], N_JOBS))
+    print('Speedup: %.1fx' % (times[legacy_to_py_job_list] / times[to_py_job_list]))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Library startup benchmark: compares binding every DRMAA2 function
+prototype up front against binding only the functions a short-lived
+script actually uses (here, listing job session names).
+"""
+
+import ctypes
+import timeit
+
+from drmaa2 import LibraryManager
+from drmaa2.library_manager import Drmaa2Library
+from drmaa2.drmaa2_prototypes import DRMAA2_PROTOTYPES
+
+N_REPEATS = 5
+N_ITERATIONS = 200
+
+
+def bind_all(lib_path):
+    cdll = ctypes.CDLL(lib_path)
+    for (name, (restype, argtypes)) in DRMAA2_PROTOTYPES.items():
+        function = getattr(cdll, name)
+        function.restype = restype
+        function.argtypes = argtypes
+    return cdll.drmaa2_get_jsession_names
+
+
+def bind_on_demand(lib_path):
+    drmaa2_lib = Drmaa2Library(ctypes.CDLL(lib_path))
+    return drmaa2_lib.drmaa2_get_jsession_names
+
+
+if __name__ == '__main__':
+    lib_path = LibraryManager.get_instance().get_drmaa2_library()._cdll._name
+    print('Benchmarking prototype binding for %s' % lib_path)
+    for f in [bind_all, bind_on_demand]:
+        t = min(timeit.repeat(lambda: f(lib_path), repeat=N_REPEATS, number=N_ITERATIONS))
+        print('%-16s %10.1f usec per library load' % (f.__name__, t / N_ITERATIONS * 1e6))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Machine info column benchmark: compares building columns for a synthetic
+10k-host machine info list from MachineInfo objects, attribute by attribute,
+against the single-pass MachineInfo.to_py_machine_info_columns() conversion.
+The list accessors are emulated in Python, so the DRMAA2 library is not needed.
+"""
+
+import timeit
+from ctypes import addressof
+
+from drmaa2.machine_info import MachineInfo
+from drmaa2.drmaa2_ctypes import drmaa2_machineinfo
+
+N_MACHINES = 10000
+N_REPEATS = 3
+ATTRIBUTE_NAMES = ['load', 'sockets', 'cores_per_socket', 'phys_memory', 'virt_memory']
+
+
+class SyntheticMachineInfoList(object):
+    """ Emulates DRMAA2 list accessors for a list of native machine infos. """
+
+    def __init__(self, n_machines):
+        self.machine_infos = [drmaa2_machineinfo(name=b'host%d' % i, available=1, sockets=2, coresPerSocket=8,
+                                                 threadsPerCore=2, load=0.5, physMemory=64 << 20,
+                                                 virtMemory=128 << 20, machineArch=-1, machineOS=-1)
+                              for i in range(n_machines)]
+        self.addresses = [addressof(mi) for mi in self.machine_infos]
+
+    def drmaa2_list_size(self, ctypes_list):
+        return len(self.addresses)
+
+    def drmaa2_list_get(self, ctypes_list, i):
+        return self.addresses[i]
+
+
+def from_objects(ctypes_list):
+    mi_list = MachineInfo.to_py_machine_info_list(ctypes_list)
+    return dict((name, [getattr(mi, name) for mi in mi_list]) for name in ATTRIBUTE_NAMES)
+
+
+def from_columns(ctypes_list):
+    return MachineInfo.to_py_machine_info_columns(ctypes_list)
+
+
+if __name__ == '__main__':
+    MachineInfo.drmaa2_lib = SyntheticMachineInfoList(N_MACHINES)
+    MachineInfo.implementation_specific_keys = []
+    times = {}
+    for f in [from_objects, from_columns]:
+        times[f] = min(timeit.repeat(lambda: f(1), repeat=N_REPEATS, number=1))
+        print('%-14s %8.3f sec for %d machines' % (f.__name__, times[f], N_MACHINES))
+    print('Speedup: %.1fx' % (times[from_objects] / times[from_columns]))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Benchmark suite for the descriptor, conversion and submission hot paths:
+job template construction, to_dict() on job and machine info, job list
+conversion to Job objects and JobRef handles, string list and dictionary
+descriptor round-trips and reads, string encoding and decoding, and job
+submission. Unless SGE_ROOT or DRMAA2_LIBRARY_PATH is set, the benchmarks
+run against the stub DRMAA2 library from the test suite.
+
+Results are written by pyperf as JSON, and can be compared across releases:
+
+    $ python benchmarks/bench_suite.py -o build/bench-1.0.json
+    $ python benchmarks/bench_suite.py -o build/bench-1.1.json
+    $ python -m pyperf compare_to build/bench-1.0.json build/bench-1.1.json --table
+
+Use --fast for a quick run, and -b NAME to run selected benchmarks only.
+"""
+
+import os
+import sys
+import time
+from ctypes import addressof
+
+import pyperf
+
+# Use the repository sources and the stub library set up by the test package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from test.utils import setup_drmaa2_stub
+
+setup_drmaa2_stub()
+
+from drmaa2 import Job
+from drmaa2 import JobSession
+from drmaa2 import JobTemplate
+from drmaa2 import ListType
+from drmaa2 import MonitoringSession
+from drmaa2.drmaa2_object import Drmaa2Object
+from drmaa2.byte_string import ByteString
+from drmaa2.byte_string import encode_string
+from drmaa2.byte_string import decode_string
+from drmaa2.drmaa2_ctypes import drmaa2_j
+from drmaa2.drmaa2_ctypes import drmaa2_list_entryfree
+
+TEMPLATE_SMALL = {'remote_command': '/bin/sleep', 'args': ['10']}
+TEMPLATE_MEDIUM = {'remote_command': '/bin/sleep', 'args': ['10'], 'job_name': 'bench', 'working_directory': '/tmp',
+                   'output_path': '/tmp/bench.out', 'error_path': '/tmp/bench.err', 'join_files': True,
+                   'job_environment': {'OMP_NUM_THREADS': '4', 'LANG': 'C'}, 'priority': 10, 'min_slots': 1,
+                   'max_slots': 4, 'email': ['user@example.com']}
+TEMPLATE_LARGE = dict(TEMPLATE_MEDIUM,
+                      args=['arg%d' % i for i in range(100)],
+                      job_environment={'VAR%d' % i: 'value%d' % i for i in range(100)},
+                      candidate_machines=['node%02d' % i for i in range(100)],
+                      resource_limits={'h_rt': '3600', 'h_vmem': '4G'},
+                      stage_in_files={'/tmp/in%d' % i: '/scratch/in%d' % i for i in range(10)})
+TEMPLATES = [('small', TEMPLATE_SMALL), ('medium', TEMPLATE_MEDIUM), ('large', TEMPLATE_LARGE)]
+
+JOB_LIST_SIZES = [1000, 100000]
+STRINGS = ['string%d' % i for i in range(1000)]
+COLLECTION_SIZES = [10, 1000]
+
+
+def bench_job_template_from_dict(loops, template):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        JobTemplate(template)
+    return time.perf_counter() - t0
+
+
+def bench_job_template_from_dict_lazy(loops, template):
+    Drmaa2Object.enable_lazy_impl_spec_init()
+    try:
+        return bench_job_template_from_dict(loops, template)
+    finally:
+        Drmaa2Object.disable_lazy_impl_spec_init()
+
+
+def bench_to_dict(loops, obj):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        obj.to_dict()
+    return time.perf_counter() - t0
+
+
+def bench_to_dict_bytes(loops, obj):
+    obj.bytes_mode = True
+    try:
+        return bench_to_dict(loops, obj)
+    finally:
+        obj.bytes_mode = False
+
+
+def bench_byte_string_encode(loops, values):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        for v in values:
+            ByteString(v).encode()
+    return time.perf_counter() - t0
+
+
+def bench_byte_string_decode(loops, values):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        for v in values:
+            ByteString(v).decode()
+    return time.perf_counter() - t0
+
+
+def bench_encode_string(loops, values):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        for v in values:
+            encode_string(v)
+    return time.perf_counter() - t0
+
+
+def bench_decode_string(loops, values):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        for v in values:
+            decode_string(v)
+    return time.perf_counter() - t0
+
+
+def create_native_job_list(n_jobs):
+    """ Create native job list of given size; the returned structs must be kept alive while the list is used. """
+    drmaa2_lib = Job.get_drmaa2_library()
+    structs = [drmaa2_j(str(i).encode(), b'bench', b'job%d' % i) for i in range(n_jobs)]
+    ctypes_list = drmaa2_lib.drmaa2_list_create(int(ListType.JOBLIST), drmaa2_list_entryfree())
+    for j in structs:
+        drmaa2_lib.drmaa2_list_add(ctypes_list, addressof(j))
+    return (ctypes_list, structs)
+
+
+def bench_to_py_job_list(loops, ctypes_list, as_refs=False):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        Job.to_py_job_list(ctypes_list, as_refs)
+    return time.perf_counter() - t0
+
+
+def bench_string_list_round_trip(loops, jt, values):
+    # Alternate values, so that every assignment rewrites the whole list.
+    reversed_values = list(reversed(values))
+    t0 = time.perf_counter()
+    for i in range(loops):
+        jt.args = values if i % 2 else reversed_values
+        jt.args
+    return time.perf_counter() - t0
+
+
+def bench_dict_round_trip(loops, jt, values):
+    alternate_values = {k: v + '.' for (k, v) in values.items()}
+    t0 = time.perf_counter()
+    for i in range(loops):
+        jt.job_environment = values if i % 2 else alternate_values
+        jt.job_environment
+    return time.perf_counter() - t0
+
+
+def bench_get_attr(loops, obj, name):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        getattr(obj, name)
+    return time.perf_counter() - t0
+
+
+def bench_run_job(loops, js, jt):
+    t0 = time.perf_counter()
+    for i in range(loops):
+        js.run_job(jt)
+    return time.perf_counter() - t0
+
+
+def add_cmdline_args(cmd, args):
+    # Pass the benchmark selection on to pyperf worker processes.
+    for name in args.benchmarks or []:
+        cmd.extend(['--benchmark', name])
+
+
+if __name__ == '__main__':
+    runner = pyperf.Runner(add_cmdline_args=add_cmdline_args)
+    runner.argparser.add_argument('-b', '--benchmark', action='append', dest='benchmarks', metavar='NAME',
+                                  help='Run only the named benchmark; may be given more than once.')
+    selected = runner.parse_args().benchmarks
+    runner.metadata['drmaa2_library'] = os.environ.get('DRMAA2_LIBRARY_PATH', '')
+
+    def bench(name, setup, time_func, *args):
+        # Setup is skipped for benchmarks that are not selected.
+        if selected and name not in selected:
+            return
+        runner.bench_time_func(name, time_func, *(setup() + args))
+
+    for (size, template) in TEMPLATES:
+        bench('job_template_from_dict_%s' % size, tuple, bench_job_template_from_dict, template)
+
+    # The session is destroyed on exit.
+    js = JobSession('bench-suite-%s' % os.getpid())
+
+    def get_job_info():
+        j = js.run_job({'remote_command': '/bin/sleep', 'args': ['0']})
+        j.wait_terminated()
+        return (j.get_info(),)
+
+    bench('job_info_to_dict', get_job_info, bench_to_dict)
+    bench('machine_info_to_dict', lambda: (MonitoringSession('bench-suite').get_all_machines(None)[0],), bench_to_dict)
+
+    # Native job lists, with the structs they refer to.
+    job_lists = {}
+
+    def get_job_list(n_jobs):
+        job_lists[n_jobs] = create_native_job_list(n_jobs)
+        return (job_lists[n_jobs][0],)
+
+    for n_jobs in JOB_LIST_SIZES:
+        bench('to_py_job_list_%d' % n_jobs, lambda: get_job_list(n_jobs), bench_to_py_job_list)
+        bench('to_py_job_list_refs_%d' % n_jobs, lambda: get_job_list(n_jobs), bench_to_py_job_list, True)
+
+    for n in COLLECTION_SIZES:
+        bench('string_list_round_trip_%d' % n, lambda: (JobTemplate(),), bench_string_list_round_trip,
+              ['arg%d' % i for i in range(n)])
+        bench('dict_round_trip_%d' % n, lambda: (JobTemplate(),), bench_dict_round_trip,
+              {'VAR%d' % i: 'value%d' % i for i in range(n)})
+        # Reads only, for the per-element conversion cost.
+        bench('string_list_get_%d' % n, lambda: (JobTemplate({'args': ['arg%d' % i for i in range(n)]}),),
+              bench_get_attr, 'args')
+        bench('dict_get_%d' % n, lambda: (JobTemplate({'job_environment': {'VAR%d' % i: 'value%d' % i
+                                                                           for i in range(n)}}),),
+              bench_get_attr, 'job_environment')
+
+    bench('run_job', lambda: (js, JobTemplate(TEMPLATE_MEDIUM)), bench_run_job)
+    bench('job_template_from_dict_small_lazy', tuple, bench_job_template_from_dict_lazy, TEMPLATE_SMALL)
+
+    # String codec: ByteString wrapper against the fast functions, for 1000 strings.
+    encoded_strings = [v.encode() for v in STRINGS]
+    bench('byte_string_encode_1000', tuple, bench_byte_string_encode, STRINGS)
+    bench('encode_string_1000', tuple, bench_encode_string, STRINGS)
+    bench('byte_string_decode_1000', tuple, bench_byte_string_decode, encoded_strings)
+    bench('decode_string_1000', tuple, bench_decode_string, encoded_strings)
+    bench('job_info_to_dict_bytes', get_job_info, bench_to_dict_bytes)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Job template update benchmark: compares rewriting every field of a job
+template with a 200-entry job environment against updating a single
+environment entry via JobTemplate.update(), counting the DRMAA2 library
+calls made in each case.
+"""
+
+import timeit
+
+from drmaa2 import JobTemplate
+from drmaa2 import LibraryManager
+from drmaa2.drmaa2_object_descriptors import Drmaa2Descriptor
+
+N_ENV_ENTRIES = 200
+N_REPEATS = 5
+N_ITERATIONS = 100
+
+
+class CallCounter(object):
+    """ Wraps DRMAA2 library functions and counts calls made through them. """
+
+    def __init__(self, drmaa2_lib):
+        self.drmaa2_lib = drmaa2_lib
+        self.n_calls = 0
+
+    def __getattr__(self, name):
+        function = getattr(self.drmaa2_lib, name)
+
+        def counted(*args):
+            self.n_calls += 1
+            return function(*args)
+
+        return counted
+
+
+def get_template_dict(i):
+    env = dict(('VAR_%s' % j, 'value_%s' % j) for j in range(N_ENV_ENTRIES))
+    env['TASK'] = str(i)
+    return {'remote_command': '/bin/sleep', 'args': ['10'], 'job_name': 'bench',
+            'job_environment': env}
+
+
+def full_rewrite(jt, i):
+    # Forget previously written values, as before field diffing.
+    jt._dict.clear()
+    jt.from_dict(get_template_dict(i))
+
+
+def update(jt, i):
+    jt.update(**get_template_dict(i))
+
+
+if __name__ == '__main__':
+    counter = CallCounter(LibraryManager.get_instance().get_drmaa2_library())
+    JobTemplate.drmaa2_lib = counter
+    Drmaa2Descriptor.drmaa2_lib = counter
+    for f in [full_rewrite, update]:
+        jt = JobTemplate(get_template_dict(0))
+        counter.n_calls = 0
+        f(jt, 1)
+        n_calls = counter.n_calls
+        t = min(timeit.repeat(lambda: f(jt, 2), repeat=N_REPEATS, number=N_ITERATIONS))
+        print('%-14s %6d library calls %10.1f usec per update' % (f.__name__, n_calls, t / N_ITERATIONS * 1e6))
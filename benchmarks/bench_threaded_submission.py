@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Threaded submission stress benchmark: submits held jobs through
+JobSession.run_job() from a growing number of threads, mixing in
+submissions to non-existing queues that are expected to fail. For each
+thread count it reports submission throughput, the peak number of
+run_job library calls in flight at the same time (calls release the GIL),
+and the number of failures whose error message refers to another
+submission's queue, i.e. mis-attributed errors.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from drmaa2 import JobSession
+from drmaa2 import Drmaa2Exception
+from drmaa2 import LibraryManager
+
+N_JOBS = 400
+FAILURE_RATE = 4
+THREAD_COUNTS = [1, 2, 4, 8, 16]
+
+
+class InFlightCounter(object):
+    """ Tracks the peak number of concurrent calls to a library function. """
+
+    def __init__(self, function):
+        self.function = function
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def __call__(self, *args):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return self.function(*args)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def submit(js, i):
+    if i % FAILURE_RATE == 0:
+        queue_name = 'no_such_queue_%d' % i
+        try:
+            js.run_job({'remote_command': '/bin/sleep', 'args': ['1'], 'queue_name': queue_name,
+                        'submit_as_hold': True})
+        except Drmaa2Exception as ex:
+            # The error must not mention a queue used by another submission.
+            message = str(ex)
+            return 'misattributed' if 'no_such_queue_' in message and queue_name not in message else 'failed'
+        return 'unexpected_success'
+    j = js.run_job({'remote_command': '/bin/sleep', 'args': ['1'], 'submit_as_hold': True})
+    j.terminate()
+    return 'submitted'
+
+
+if __name__ == '__main__':
+    drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
+    counter = InFlightCounter(drmaa2_lib.drmaa2_jsession_run_job)
+    drmaa2_lib.drmaa2_jsession_run_job = counter
+    js = JobSession('bench-threaded-submission')
+    print('%8s %12s %10s %10s %14s' % ('threads', 'jobs/sec', 'peak', 'failed', 'misattributed'))
+    try:
+        for n_threads in THREAD_COUNTS:
+            counter.peak = 0
+            t = time.time()
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                results = list(executor.map(lambda i: submit(js, i), range(N_JOBS)))
+            t = time.time() - t
+            print('%8d %12.1f %10d %10d %14d' % (n_threads, N_JOBS / t, counter.peak, results.count('failed'),
+                                                 results.count('misattributed')))
+            assert results.count('unexpected_success') == 0
+    finally:
+        js.destroy()
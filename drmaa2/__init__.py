@@ -16,6 +16,8 @@
 # limitations under the License.
 #######################################################################################
 # ___INFO__MARK_END__
+import sys
+
 from .drmaa2_constants import (Bool, Capability, Cpu, Event, JobState,
     ListType, Os, ResourceLimit, StatusCode, Time)
 from .drmaa2_exceptions import (Drmaa2Exception, DeniedByDrms,
@@ -24,30 +26,77 @@ from .drmaa2_exceptions import (Drmaa2Exception, DeniedByDrms,
     InvalidSession, InvalidState, ResourceNotAvailable,
     UnsupportedAttribute, UnsupportedOperation,
     ImplementationSpecificError, AuthorizationError)
-from .library_manager import LibraryManager
-from .log_manager import LogManager
-from .job_session import JobSession
-from .job_info import JobInfo
-from .job_array import JobArray
-from .job_template import JobTemplate
-from .job import Job
-from .reservation_session import ReservationSession
-from .reservation_template import ReservationTemplate
-from .reservation_info import ReservationInfo
-from .reservation import Reservation
-from .sudo import Sudo
-from .version import Version
-from .monitoring_session import MonitoringSession
-from .machine_info import MachineInfo
-from .queue_info import QueueInfo
-from .notification import Notification
-
-get_drms_name = LibraryManager.get_drms_name
-get_drmaa_name = LibraryManager.get_drmaa_name
-drmaa_supports = LibraryManager.drmaa_supports
-get_drms_version = Version.get_drms_version
-get_drmaa_version = Version.get_drmaa_version
-get_job_session_names = JobSession.list_session_names
-get_reservation_session_names = ReservationSession.list_session_names
+
+# Classes and module methods below are imported on first access, so that,
+# for example, "from drmaa2 import JobSession" loads only the modules needed
+# for job sessions.
+_LAZY_ATTRIBUTES = {
+    'LibraryManager': ('library_manager', 'LibraryManager'),
+    'LogManager': ('log_manager', 'LogManager'),
+    'JobSession': ('job_session', 'JobSession'),
+    'JobInfo': ('job_info', 'JobInfo'),
+    'JobArray': ('job_array', 'JobArray'),
+    'JobTemplate': ('job_template', 'JobTemplate'),
+    'Job': ('job', 'Job'),
+    'JobRef': ('job', 'JobRef'),
+    'ReservationSession': ('reservation_session', 'ReservationSession'),
+    'ReservationTemplate': ('reservation_template', 'ReservationTemplate'),
+    'ReservationInfo': ('reservation_info', 'ReservationInfo'),
+    'Reservation': ('reservation', 'Reservation'),
+    'Sudo': ('sudo', 'Sudo'),
+    'Version': ('version', 'Version'),
+    'MonitoringSession': ('monitoring_session', 'MonitoringSession'),
+    'MachineInfo': ('machine_info', 'MachineInfo'),
+    'QueueInfo': ('queue_info', 'QueueInfo'),
+    'Notification': ('notification', 'Notification'),
+    'JobStateCache': ('job_state_cache', 'JobStateCache'),
+    'AsyncJobSession': ('async_job_session', 'AsyncJobSession'),
+    'ProcessPoolSubmitter': ('process_pool_submitter', 'ProcessPoolSubmitter'),
+    'RetryPolicy': ('retry_policy', 'RetryPolicy'),
+    'RateLimiter': ('rate_limiter', 'RateLimiter'),
+    'MetricsExporter': ('metrics_exporter', 'MetricsExporter'),
+
+    'get_drms_name': ('library_manager', 'LibraryManager.get_drms_name'),
+    'get_drmaa_name': ('library_manager', 'LibraryManager.get_drmaa_name'),
+    'drmaa_supports': ('library_manager', 'LibraryManager.drmaa_supports'),
+    'get_drms_version': ('version', 'Version.get_drms_version'),
+    'get_drmaa_version': ('version', 'Version.get_drmaa_version'),
+    'get_job_session_names': ('job_session', 'JobSession.list_session_names'),
+    'get_reservation_session_names': ('reservation_session', 'ReservationSession.list_session_names'),
+}
+
+__all__ = ['Bool', 'Capability', 'Cpu', 'Event', 'JobState', 'ListType', 'Os', 'ResourceLimit', 'StatusCode', 'Time',
+           'Drmaa2Exception', 'DeniedByDrms', 'DrmCommunicationError', 'TryLaterError', 'SessionManagementError',
+           'TimeoutError', 'InternalError', 'InvalidArgument', 'InvalidSession', 'InvalidState',
+           'ResourceNotAvailable', 'UnsupportedAttribute', 'UnsupportedOperation', 'ImplementationSpecificError',
+           'AuthorizationError'] + sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    """ Import lazily loaded attribute on first access (PEP 562). """
+    try:
+        (module_name, attribute_path) = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    # Relative import via __import__, so that the module shows up in "-X importtime" output.
+    value = __import__(module_name, globals(), None, ['__name__'], 1)
+    for attribute_name in attribute_path.split('.'):
+        value = getattr(value, attribute_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# Module level __getattr__ requires python 3.7 or later.
+if sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRIBUTES:
+        try:
+            __getattr__(_name)
+        except (ImportError, SyntaxError):
+            # For example, AsyncJobSession requires python 3.
+            pass
 
 __version__ = '8.12.1a0'
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .drmaa2_constants import Time
+from .drmaa2_constants import JobState
+from .drmaa2_exceptions import TimeoutError
+from .job_session import JobSession
+from .log_manager import LogManager
+
+
+class AsyncJobSession(object):
+    """
+    Asyncio wrapper around job session. Blocking library calls run on
+    a dedicated, bounded thread pool. If a job state cache registered for
+    event notifications is provided, waits for job termination are resolved
+    from notifications, and do not occupy pool threads.
+    """
+
+    FINAL_STATES = (JobState.DONE, JobState.FAILED)
+
+    logger = LogManager.get_instance().get_logger('AsyncJobSession')
+
+    def __init__(self, job_session=None, max_workers=4, state_cache=None, **kwargs):
+        """
+        Constructor.
+
+        :param job_session: Job session; if not provided, a new one is created using remaining keyword arguments (see JobSession.__init__()).
+        :type job_session: JobSession
+
+        :param max_workers: Maximum number of threads used for blocking library calls.
+        :type max_workers: int
+
+        :param state_cache: Optional job state cache registered for event notifications.
+        :type state_cache: JobStateCache
+
+        >>> state_cache = JobStateCache()
+        >>> state_cache.register()
+        >>> aj_session = AsyncJobSession(max_workers=4, state_cache=state_cache, name='js-01')
+        """
+        self.job_session = job_session or JobSession(**kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.state_cache = state_cache
+        # Job id to list of (loop, future) tuples for termination waits.
+        self.__waiters = {}
+        self.__lock = threading.Lock()
+        if state_cache is not None:
+            state_cache.add_listener(self.__on_job_state)
+
+    def close(self):
+        """
+        Stop listening for job state changes and shut down the thread pool.
+        The underlying job session is not closed.
+
+        >>> aj_session.close()
+        """
+        if self.state_cache is not None:
+            self.state_cache.remove_listener(self.__on_job_state)
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def run_in_executor(self, function, *args):
+        """
+        Run blocking function on the session thread pool.
+
+        :param function: Function to run.
+        :type function: callable
+
+        :returns: Function result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(function, *args))
+
+    async def run_job(self, template, auth=None):
+        """
+        Run a job (see JobSession.run_job()).
+
+        :param template: Job template; it can be specified either as a dictionary, or directly as a JobTemplate object.
+        :type template: JobTemplate or dict
+
+        :param auth: Optional sudo object for running the job.
+        :type auth: Sudo or dict
+
+        :returns: Job object.
+
+        >>> j = await aj_session.run_job({'remote_command' : '/bin/sleep', 'args' : ['10']})
+        """
+        return await self.run_in_executor(self.job_session.run_job, template, auth)
+
+    async def get_info(self, job):
+        """
+        Get job info (see Job.get_info()).
+
+        :param job: Job object.
+        :type job: Job
+
+        :returns: JobInfo object.
+
+        >>> ji = await aj_session.get_info(j)
+        """
+        return await self.run_in_executor(job.get_info)
+
+    async def get_state(self, job):
+        """
+        Get job state, from the job state cache if possible (see Job.get_state()).
+
+        :param job: Job object.
+        :type job: Job
+
+        :returns: (JobState object, sub-state string) tuple.
+        """
+        if self.state_cache is not None:
+            return await self.run_in_executor(self.state_cache.get_state, job)
+        return await self.run_in_executor(job.get_state)
+
+    async def wait_terminated(self, job, timeout=Time.INFINITE_TIME):
+        """
+        Wait until the job terminates or specified timeout occurs.
+
+        :param job: Job object.
+        :type job: Job
+
+        :param timeout: Wait timeout in seconds (default: infinite time).
+        :type timeout: int
+
+        :returns: Terminated Job object.
+
+        >>> j = await aj_session.run_job({'remote_command' : '/bin/sleep', 'args' : ['10']})
+        >>> await aj_session.wait_terminated(j)
+        """
+        if self.state_cache is None:
+            await self.run_in_executor(job.wait_terminated, timeout)
+            return job
+        return await self.__wait_any_terminated_via_notifications([job], timeout)
+
+    async def wait_any_terminated(self, job_list, timeout=Time.INFINITE_TIME):
+        """
+        Wait for termination of any job from the given list.
+
+        :param job_list: Job list.
+        :type job_list: [Job]
+
+        :param timeout: Wait timeout in seconds (default: infinite time).
+        :type timeout: int
+
+        :returns: Terminated Job object.
+
+        >>> j = await aj_session.wait_any_terminated([j1, j2])
+        """
+        if self.state_cache is None:
+            return await self.run_in_executor(self.job_session.wait_any_terminated, job_list, timeout)
+        return await self.__wait_any_terminated_via_notifications(job_list, timeout)
+
+    async def __wait_any_terminated_via_notifications(self, job_list, timeout):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        jobs = dict((j.id, j) for j in job_list)
+        waiter = (loop, future)
+        # Register waiter before checking current states, so that
+        # notifications received in between are not lost.
+        with self.__lock:
+            for job_id in jobs:
+                self.__waiters.setdefault(job_id, []).append(waiter)
+        try:
+            # Current states are checked in a single executor call.
+            job_id = await self.run_in_executor(self.__find_terminated, job_list)
+            if job_id is not None and not future.done():
+                future.set_result(job_id)
+            if timeout == Time.INFINITE_TIME:
+                job_id = await future
+            else:
+                try:
+                    job_id = await asyncio.wait_for(future, max(int(timeout), 0))
+                except asyncio.TimeoutError:
+                    raise TimeoutError('Timeout waiting for termination of jobs %s' % list(jobs))
+            return jobs[job_id]
+        finally:
+            with self.__lock:
+                for job_id in jobs:
+                    waiters = self.__waiters.get(job_id, [])
+                    if waiter in waiters:
+                        waiters.remove(waiter)
+                    if not waiters:
+                        self.__waiters.pop(job_id, None)
+
+    def __find_terminated(self, job_list):
+        # Called on the thread pool.
+        for j in job_list:
+            (state, _) = self.state_cache.get_state(j)
+            if state in self.FINAL_STATES:
+                return j.id
+        return None
+
+    def __on_job_state(self, job_id, state):
+        # Called from the notification thread.
+        if state not in self.FINAL_STATES:
+            return
+        with self.__lock:
+            waiters = list(self.__waiters.get(job_id, []))
+        for (loop, future) in waiters:
+            loop.call_soon_threadsafe(self.__resolve, future, job_id)
+
+    @classmethod
+    def __resolve(cls, future, job_id):
+        if not future.done():
+            future.set_result(job_id)
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    async def main():
+        async with AsyncJobSession(name='js-01') as aj_session:
+            j = await aj_session.run_job({'remote_command': '/bin/sleep', 'args': ['1']})
+            await aj_session.wait_terminated(j)
+            print(await aj_session.get_info(j))
+
+    asyncio.run(main())
@@ -48,3 +48,52 @@ class ByteString:
             return self.s.decode()
         except AttributeError:
             return self.s
+
+
+# Fast codec functions, chosen once at import time. They convert without
+# allocating a ByteString wrapper; values other than str and bytes are
+# handled as by ByteString.
+if ByteString.python_version == '2':
+    def encode_string(s):
+        """ Encode string for passing to the library (identity on Python 2). """
+        return s
+
+    def decode_string(b):
+        """ Decode string returned by the library (identity on Python 2). """
+        return b
+else:
+    def encode_string(s):
+        """
+        Encode string for passing to the library.
+
+        :param s: String; bytes and None are returned unchanged.
+        :type s: str
+
+        :returns: Encoded string.
+
+        >>> encode_string('abc')
+        b'abc'
+        """
+        if s.__class__ is str:
+            return s.encode()
+        if s is None or s.__class__ is bytes:
+            return s
+        return ByteString(s).encode()
+
+    def decode_string(b):
+        """
+        Decode string returned by the library.
+
+        :param b: Byte string; str and None are returned unchanged.
+        :type b: bytes
+
+        :returns: Decoded string.
+
+        >>> decode_string(b'abc')
+        'abc'
+        """
+        if b.__class__ is bytes:
+            return b.decode()
+        if b is None or b.__class__ is str:
+            return b
+        return ByteString(b).decode()
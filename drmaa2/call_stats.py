@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import math
+import threading
+
+
+class CallStats(object):
+    """
+    Call statistics for a single library function: number of calls,
+    cumulative, minimum and maximum latency, error codes, and a latency
+    histogram with logarithmic buckets. Bucket i counts calls that took
+    less than MIN_LATENCY*2**i seconds (and at least half of that, for i > 0);
+    the last bucket counts all slower calls. Percentiles are estimated as
+    bucket upper bounds, and are therefore accurate within a factor of 2.
+    """
+
+    # Upper bound of the first bucket, in seconds (1 microsecond).
+    MIN_LATENCY = 1e-6
+    # With 28 buckets, the last bounded bucket ends at about 134 seconds.
+    N_BUCKETS = 28
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, name):
+        """
+        Constructor.
+
+        :param name: Function name.
+        :type name: str
+        """
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = 0.0
+        self.error_codes = {}
+        self.histogram = [0] * self.N_BUCKETS
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_bucket(cls, latency):
+        """
+        Get histogram bucket index for latency.
+
+        :param latency: Latency in seconds.
+        :type latency: float
+
+        :returns: Bucket index.
+        """
+        if latency < cls.MIN_LATENCY:
+            return 0
+        return min(int(math.log(latency / cls.MIN_LATENCY, 2)) + 1, cls.N_BUCKETS - 1)
+
+    @classmethod
+    def get_bucket_upper_bound(cls, bucket):
+        """
+        Get upper latency bound for histogram bucket.
+
+        :param bucket: Bucket index.
+        :type bucket: int
+
+        :returns: Upper bound in seconds, or None for the last bucket.
+        """
+        if bucket >= cls.N_BUCKETS - 1:
+            return None
+        return cls.MIN_LATENCY * 2 ** bucket
+
+    def record(self, latency, error_code=None):
+        """
+        Record a call.
+
+        :param latency: Call latency in seconds.
+        :type latency: float
+
+        :param error_code: Error code if the call failed, None otherwise.
+        :type error_code: int
+        """
+        bucket = self.get_bucket(latency)
+        with self.__lock:
+            self.count += 1
+            self.total_time += latency
+            if self.min_time is None or latency < self.min_time:
+                self.min_time = latency
+            if latency > self.max_time:
+                self.max_time = latency
+            self.histogram[bucket] += 1
+            if error_code is not None:
+                self.error_codes[error_code] = self.error_codes.get(error_code, 0) + 1
+
+    def get_percentile(self, percentile, histogram=None, count=None):
+        """
+        Estimate latency percentile from histogram.
+
+        :param percentile: Percentile, between 0 and 100.
+        :type percentile: float
+
+        :returns: Upper bound of the bucket containing the percentile, in seconds (maximum latency for the last bucket), or None if no calls were recorded.
+        """
+        if histogram is None:
+            (histogram, count) = (list(self.histogram), self.count)
+        if not count:
+            return None
+        rank = math.ceil(count * percentile / 100.0)
+        n = 0
+        for (bucket, bucket_count) in enumerate(histogram):
+            n += bucket_count
+            if n >= rank:
+                return self.get_bucket_upper_bound(bucket) or self.max_time
+        return self.max_time
+
+    def to_dict(self):
+        """
+        Conversion to dictionary.
+
+        :returns: Dictionary with 'count', 'total_time', 'mean_time', 'min_time', 'max_time', 'p50', 'p90', 'p99', 'error_codes', and 'histogram' (list of (upper bound, count) tuples for non-empty buckets) keys.
+        """
+        with self.__lock:
+            (count, total_time, min_time, max_time) = (self.count, self.total_time, self.min_time, self.max_time)
+            error_codes = dict(self.error_codes)
+            histogram = list(self.histogram)
+        d = {'count': count, 'total_time': total_time, 'mean_time': total_time / count if count else None,
+             'min_time': min_time, 'max_time': max_time, 'error_codes': error_codes,
+             'histogram': [(self.get_bucket_upper_bound(i), n) for (i, n) in enumerate(histogram) if n]}
+        for p in self.PERCENTILES:
+            d['p%s' % p] = self.get_percentile(p, histogram, count)
+        return d
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    stats = CallStats('drmaa2_jsession_run_job')
+    for latency in [0.001, 0.002, 0.004, 0.1]:
+        stats.record(latency)
+    stats.record(0.05, 3)
+    print(stats.to_dict())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import array
+
+
+class Columns(object):
+    """
+    Helper for building column-oriented data. Numeric columns are returned
+    as NumPy arrays if NumPy is installed, and as array.array objects
+    otherwise; other columns are returned as lists.
+    """
+
+    # Column typecode to NumPy dtype and array.array typecode.
+    NUMPY_DTYPES = {'?': 'bool', 'q': 'int64', 'd': 'float64'}
+    ARRAY_TYPECODES = {'?': 'b', 'q': 'q', 'd': 'd'}
+
+    __numpy = None
+    __numpy_checked = False
+
+    @classmethod
+    def get_numpy(cls):
+        """
+        Get NumPy module, if available. NumPy is imported on first use.
+
+        :returns: NumPy module, or None if it cannot be imported.
+        """
+        if not cls.__numpy_checked:
+            try:
+                import numpy
+                cls.__numpy = numpy
+            except ImportError:
+                cls.__numpy = None
+            cls.__numpy_checked = True
+        return cls.__numpy
+
+    @classmethod
+    def to_column(cls, values, typecode=None):
+        """
+        Convert list of values to column.
+
+        :param values: Column values.
+        :type values: list
+
+        :param typecode: Column typecode: '?' (bool), 'q' (64-bit int), 'd' (float), or None for a list column.
+        :type typecode: str
+
+        :returns: NumPy array, array.array, or list.
+
+        >>> print(Columns.to_column([1, 2, 3], 'q'))
+        [1 2 3]
+        """
+        if typecode is None:
+            return values
+        numpy = cls.get_numpy()
+        if numpy is not None:
+            return numpy.array(values, dtype=cls.NUMPY_DTYPES[typecode])
+        return array.array(cls.ARRAY_TYPECODES[typecode], values)
+
+    @classmethod
+    def to_columns(cls, value_lists, typecodes):
+        """
+        Convert dictionary of value lists to dictionary of columns.
+
+        :param value_lists: Column values, keyed by column name.
+        :type value_lists: dict
+
+        :param typecodes: Column typecodes, keyed by column name; missing names denote list columns.
+        :type typecodes: dict
+
+        :returns: Dictionary of columns.
+        """
+        return {name: cls.to_column(values, typecodes.get(name)) for (name, values) in value_lists.items()}
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    print(Columns.to_column([1, 2, 3], 'q'))
@@ -260,6 +260,14 @@ class drmaa2_j(drmaa2_struct):
                 ("job_name", drmaa2_string)]
 
 
+# Same layout as drmaa2_j, but fields are read directly as bytes;
+# used for bulk conversion of job lists.
+class drmaa2_j_view(Structure):
+    _fields_ = [("id", c_char_p),
+                ("session_name", c_char_p),
+                ("job_name", c_char_p)]
+
+
 class drmaa2_jarray(drmaa2_struct):
     _fields_ = [("id", drmaa2_string),
                 ("job_list", drmaa2_j_list),
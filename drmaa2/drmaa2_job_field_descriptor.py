@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+from .byte_string import encode_string
+from .drmaa2_object_descriptors import Drmaa2StringDescriptor
+
+
+class Drmaa2JobFieldDescriptor(Drmaa2StringDescriptor):
+    """
+    A descriptor for drmaa2_j string fields. Values are read from the
+    object's dictionary, and written to the struct only if it has already
+    been allocated, so that field access does not allocate it.
+    """
+
+    def __init__(self, name):
+        Drmaa2StringDescriptor.__init__(self, name)
+
+    def __get__(self, obj, type=None):
+        if obj is None:
+            return None
+        return self.to_py_value(obj, obj._dict.get(self.name))
+
+    def __set__(self, obj, value):
+        if '_struct' in obj.__dict__:
+            Drmaa2StringDescriptor.__set__(self, obj, value)
+        elif not obj._read_only:
+            obj._dict[self.name] = encode_string(value)
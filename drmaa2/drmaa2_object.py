@@ -19,8 +19,9 @@
 # ___INFO__MARK_END__
 
 
+import os
 import copy
-import re
+import logging
 from ctypes import cast
 from ctypes import c_void_p
 from ctypes import pointer
@@ -28,7 +29,8 @@ from ctypes import pointer
 from .drmaa2_constants import PY_STRING_TYPE
 from .drmaa2_constants import PY_BYTES_TYPE
 from .drmaa2_constants import ListType
-from .byte_string import ByteString
+from .byte_string import encode_string
+from .byte_string import decode_string
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_ctypes import drmaa2_list_entryfree
 
@@ -48,6 +50,7 @@ from .drmaa2_object_descriptors import Drmaa2StringDescriptor
 from .drmaa2_object_descriptors import Drmaa2StringListDescriptor
 from .drmaa2_object_descriptors import Drmaa2DictDescriptor
 from .drmaa2_object_descriptors import Drmaa2ImplSpecDescriptor
+from .drmaa2_object_descriptors import Drmaa2Descriptor
 
 
 class Drmaa2Object(object):
@@ -70,7 +73,9 @@ class Drmaa2Object(object):
     drmaa2_lib = None
     implementation_specific_keys = None
     implementation_specific_attrs = None
-    attribute_names = None
+    field_table = None
+    lazy_impl_spec_init = False
+    bytes_mode = False
 
     def __init__(self, struct=None):
         """ Constructor. """
@@ -78,6 +83,41 @@ class Drmaa2Object(object):
         self._dict = {}
         self._read_only = False
 
+    def __init_subclass__(cls, **kwargs):
+        super(Drmaa2Object, cls).__init_subclass__(**kwargs)
+        cls.field_table = cls.build_field_table()
+
+    @classmethod
+    def build_field_table(cls):
+        """
+        Build field table from the descriptors of this class and its base classes.
+
+        :returns: Tuple of (attribute name, descriptor, native field name) tuples, sorted by native field name.
+
+        >>> print([(attr_name, field_name) for (attr_name, descriptor, field_name) in Version.build_field_table()])
+        [('implementation_specific', 'implementationSpecific'), ('major', 'major'), ('minor', 'minor')]
+        """
+        descriptors = {}
+        for c in reversed(cls.__mro__):
+            for (attr_name, value) in vars(c).items():
+                if isinstance(value, Drmaa2Descriptor):
+                    descriptors[attr_name] = value
+                else:
+                    # Attribute is overridden by a non-descriptor.
+                    descriptors.pop(attr_name, None)
+        return tuple(sorted([(attr_name, descriptor, descriptor.name) for (attr_name, descriptor) in descriptors.items()],
+                            key=lambda entry: entry[2]))
+
+    @classmethod
+    def get_field_table(cls):
+        """ Get field table (see build_field_table()); it is built on first use if needed. """
+        field_table = cls.__dict__.get('field_table')
+        if field_table is None:
+            # Python 2 does not call __init_subclass__().
+            field_table = cls.build_field_table()
+            cls.field_table = field_table
+        return field_table
+
     def __eq__(self, other):
         return self.to_dict() == other.to_dict()
 
@@ -90,26 +130,129 @@ class Drmaa2Object(object):
             cls.drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
         return cls.drmaa2_lib
 
+    @classmethod
+    def reset_drmaa2_library(cls):
+        """ 
+        Drop library references cached by object and descriptor classes, 
+        so that they are retrieved again from the library manager. This is
+        called automatically in child processes created with os.fork().
+        """
+        classes = [Drmaa2Object, Drmaa2Descriptor]
+        while classes:
+            c = classes.pop()
+            if 'drmaa2_lib' in c.__dict__:
+                c.drmaa2_lib = None
+            classes.extend(c.__subclasses__())
+
     @classmethod
     def scrub_dict(cls, d):
         """ Remove empty keys from the dictionary. """
         return {k: v for (k, v) in d.items() if v is not None}
 
+    @classmethod
+    def enable_lazy_impl_spec_init(cls):
+        """
+        Stop initializing implementation specific keys to empty values when
+        objects are created from dictionaries; keys are only written when
+        set. This saves one library call per key on each construction.
+
+        >>> Drmaa2Object.enable_lazy_impl_spec_init()
+        """
+        Drmaa2Object.lazy_impl_spec_init = True
+
+    @classmethod
+    def disable_lazy_impl_spec_init(cls):
+        """
+        Initialize implementation specific keys to empty values when objects
+        are created from dictionaries (the default).
+
+        >>> Drmaa2Object.disable_lazy_impl_spec_init()
+        """
+        Drmaa2Object.lazy_impl_spec_init = False
+
+    @classmethod
+    def enable_bytes_mode(cls):
+        """
+        Return string, string list and dictionary field values as bytes,
+        as they come from the library, instead of decoding them to str.
+        When called on a subclass, only objects of that class are affected;
+        the mode can also be set for a single object through its bytes_mode
+        attribute. Assigned values may be either str or bytes.
+
+        >>> JobInfo.enable_bytes_mode()
+        >>> print(j.get_info().job_owner)
+        b'user'
+        """
+        cls.bytes_mode = True
+
+    @classmethod
+    def disable_bytes_mode(cls):
+        """
+        Decode string field values to str (the default).
+
+        >>> JobInfo.disable_bytes_mode()
+        """
+        cls.bytes_mode = False
+
     def get_impl_spec_key_value(self, key):
         """ Get value for an implementation specific key. """
-        ctypes_string = self.drmaa2_lib.drmaa2_get_instance_value(cast(self._struct, c_void_p), key.encode())
-        # ExceptionMapper.check_last_error_code()
-        return self.to_py_string(ctypes_string)
+        return self.get_impl_spec_key_values([key]).get(key)
+
+    def get_impl_spec_key_values(self, keys=None):
+        """
+        Get values for implementation specific keys in a single pass.
+
+        :param keys: Keys to look up; by default, all implementation specific keys of the class.
+        :type keys: [str]
+
+        :returns: Dictionary of keys with non-empty values; keys that are not set are omitted.
+
+        >>> print(jt.get_impl_spec_key_values())
+        {'uge_jt_pe': 'mpi'}
+        """
+        if keys is None:
+            keys = self.get_implementation_specific_keys()
+        drmaa2_lib = self.get_drmaa2_library()
+        get_instance_value = drmaa2_lib.drmaa2_get_instance_value
+        instance = cast(self._struct, c_void_p)
+        values = {}
+        for key in keys:
+            ctypes_string = get_instance_value(instance, key.encode())
+            # Unset keys yield NULL; the library error is not checked, as it is expected.
+            if ctypes_string.value is None:
+                continue
+            value = decode_string(ctypes_string.value)
+            drmaa2_lib.drmaa2_string_free(pointer(ctypes_string))
+            if value:
+                values[key] = value
+        return values
 
     def set_impl_spec_key_value(self, key, value):
-        """ Get value for an implementation specific key. """
-        ExceptionMapper.check_status_code(
-            self.drmaa2_lib.drmaa2_set_instance_value(cast(self._struct, c_void_p), key.encode(), value.encode()))
+        """ Set value for an implementation specific key. """
+        self.set_impl_spec_key_values({key: value})
+
+    def set_impl_spec_key_values(self, values):
+        """
+        Set values for implementation specific keys in a single pass.
+
+        :param values: Dictionary of keys and values; None is written as an empty value.
+        :type values: dict
+
+        :raises Drmaa2Exception: if a value cannot be set.
+
+        >>> jt.set_impl_spec_key_values({'uge_jt_pe': 'mpi', 'uge_jt_native': '-l h_rt=60'})
+        """
+        set_instance_value = self.get_drmaa2_library().drmaa2_set_instance_value
+        instance = cast(self._struct, c_void_p)
+        for (key, value) in values.items():
+            ExceptionMapper.check_status_code(
+                set_instance_value(instance, encode_string(key), encode_string(value or '')))
 
     def init_impl_spec_key_values(self):
-        """ Initialize values for implementation specific keys. """
-        for key in self.get_implementation_specific_keys():
-            self.set_impl_spec_key_value(key, '')
+        """ Initialize values for implementation specific keys, unless lazy initialization is enabled. """
+        if self.lazy_impl_spec_init:
+            return
+        self.set_impl_spec_key_values(dict.fromkeys(self.get_implementation_specific_keys(), ''))
 
     @classmethod
     def create_from_ctypes(cls, ctypes_struct):
@@ -150,8 +293,10 @@ class Drmaa2Object(object):
             self._dict.join(d)
             return
 
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         for (key, value) in d.items():
-            self.logger.debug('Setting {}={}'.format(key, str(value)))
+            if debug:
+                self.logger.debug('Setting %s=%s', key, value)
             setattr(self, key, value)
 
     def to_dict(self):
@@ -177,25 +322,24 @@ class Drmaa2Object(object):
                         except AttributeError:
                             pass
         else:
-            attributes = self.get_attribute_names(self._struct)
-            for attr_name in attributes:
-                v = getattr(self, attr_name)
+            # Fields are read from the struct in a single pass, and converted by their descriptors.
+            contents = self._struct.contents
+            for (attr_name, descriptor, field_name) in self.get_field_table():
+                v = descriptor.to_py_value(self, getattr(contents, field_name))
                 if v is not None:
                     d[attr_name] = v
         return d
 
     @classmethod
-    def get_attribute_names(cls, struct):
-        if cls.attribute_names is None and struct is not None:
-            attributes = [field[0] for field in struct.contents._fields_]
-            cls.attribute_names = []
-            for attr_name in sorted(attributes):
-                # Convert aXY to a_XY
-                attr_name2 = re.sub('([a-z])([A-Z]{2,})', r'\1_\2', attr_name)
-                # Convert Xa to _Xa
-                attr_name2 = re.sub('([A-Z][a-z]{1,})', r'_\1', attr_name2).lower()
-                cls.attribute_names.append(attr_name2)
-        return cls.attribute_names
+    def get_attribute_names(cls, struct=None):
+        """
+        Get attribute names, sorted by native field name.
+
+        :param struct: Unused; kept for backward compatibility.
+
+        :returns: List of attribute names.
+        """
+        return [entry[0] for entry in cls.get_field_table()]
 
     def __str__(self):
         """ Conversion to string. """
@@ -218,8 +362,8 @@ class Drmaa2Object(object):
                 void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
                 key_ptr = cast(void_ptr, drmaa2_string).value
                 value_ptr = drmaa2_lib.drmaa2_dict_get(ctypes_dict, key_ptr)
-                key = ByteString(key_ptr).decode()
-                value = ByteString(value_ptr).decode()
+                key = decode_string(key_ptr)
+                value = decode_string(value_ptr)
                 py_dict[key] = value
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_list)))
             drmaa2_lib.drmaa2_dict_free(pointer(c_void_p(ctypes_dict)))
@@ -235,14 +379,14 @@ class Drmaa2Object(object):
                 ExceptionMapper.check_last_error_code()
             for i in range(list_size):
                 void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
-                value = ByteString(cast(void_ptr, drmaa2_string).value).decode()
+                value = decode_string(cast(void_ptr, drmaa2_string).value)
                 py_list.append(value)
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_list)))
         return py_list
 
     @classmethod
     def to_py_string(cls, ctypes_string, free_original=False):
-        py_string = ByteString(ctypes_string.value).decode()
+        py_string = decode_string(ctypes_string.value)
         if free_original:
             cls.get_drmaa2_library().drmaa2_string_free(pointer(ctypes_string))
         if not py_string:
@@ -250,26 +394,33 @@ class Drmaa2Object(object):
         return py_string
 
     @classmethod
-    def to_ctypes_string_list(cls, py_list):
+    def to_ctypes_string_list(cls, py_list, value_list=None):
+        # The list does not own its strings: the caller must keep value_list
+        # alive for as long as the list is used.
         drmaa2_lib = cls.get_drmaa2_library()
         ctypes_list = drmaa2_lib.drmaa2_list_create(int(ListType.STRINGLIST), drmaa2_list_entryfree())
-        value_list = [ByteString(v).encode() for v in py_list]
-        for i in range(len(value_list)):
-            v = value_list[i]
+        encoded_list = [encode_string(v) for v in py_list]
+        if value_list is not None:
+            value_list.extend(encoded_list)
+        for v in encoded_list:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_list_add(ctypes_list, v))
         return ctypes_list
 
     @classmethod
-    def to_ctypes_string_list_or_none(cls, py_list):
+    def to_ctypes_string_list_or_none(cls, py_list, value_list=None):
         if py_list is None:
             return None
-        return cls.to_ctypes_string_list(py_list)
+        return cls.to_ctypes_string_list(py_list, value_list)
 
     @classmethod
     def get_implementation_specific_keys(cls):
         return cls.implementation_specific_keys
 
 
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Drmaa2Object.reset_drmaa2_library)
+
+
 #######################################################################
 # Test.
 if __name__ == '__main__':
@@ -20,9 +20,11 @@
 
 import types
 import datetime
+import logging
 from ctypes import cast
 
-from .byte_string import ByteString
+from .byte_string import encode_string
+from .byte_string import decode_string
 
 from .drmaa2_constants import UNSET_BOOL
 from .drmaa2_constants import UNSET_NUM
@@ -34,7 +36,6 @@ from .drmaa2_constants import ListType
 from .drmaa2_constants import Bool
 from .drmaa2_constants import Time
 
-from .drmaa2_exceptions import UnsupportedAttribute
 
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_ctypes import drmaa2_list
@@ -83,6 +84,29 @@ class Drmaa2Descriptor(object):
             return True
         return False
 
+    @staticmethod
+    def keep_bytes(b):
+        return b
+
+    @classmethod
+    def get_decoder(cls, obj):
+        """ Get function converting strings read from the library, according to the object's bytes mode. """
+        if obj is not None and obj.bytes_mode:
+            return cls.keep_bytes
+        return decode_string
+
+    def is_unchanged(self, obj, value):
+        """ Check whether value is the one last written to the field. """
+        return self.name in obj._dict and obj._dict[self.name] == value
+
+    def to_py_value(self, obj, value):
+        """
+        Convert native field value, already read from the object's struct,
+        to the value returned by the descriptor. Descriptors that do not
+        override this read the field again.
+        """
+        return self.__get__(obj, type(obj))
+
 
 class Drmaa2BoolDescriptor(Drmaa2Descriptor):
     """ A descriptor for drmaa2_bool fields. """
@@ -94,6 +118,9 @@ class Drmaa2BoolDescriptor(Drmaa2Descriptor):
         value = False
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
         return Bool(value).name
 
     def __set__(self, obj, value):
@@ -109,6 +136,8 @@ class Drmaa2BoolDescriptor(Drmaa2Descriptor):
                 value = int(Bool.FALSE)
         else:
             value = UNSET_BOOL
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -124,6 +153,9 @@ class Drmaa2EnumDescriptor(Drmaa2Descriptor):
         value = UNSET_ENUM
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
         if value == UNSET_ENUM:
             return None
         return self.cls(value).name
@@ -136,6 +168,8 @@ class Drmaa2EnumDescriptor(Drmaa2Descriptor):
                 value = self.cls[value].value
         else:
             value = UNSET_ENUM
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -150,6 +184,9 @@ class Drmaa2TimeDescriptor(Drmaa2Descriptor):
         value = int(Time.UNSET_TIME)
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
         try:
             t = Time(value)
             if t == Time.UNSET_TIME:
@@ -172,6 +209,8 @@ class Drmaa2TimeDescriptor(Drmaa2Descriptor):
                 value = int(value)
         else:
             value = int(Time.UNSET_TIME)
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -187,6 +226,9 @@ class Drmaa2NumericTypeDescriptor(Drmaa2Descriptor):
         value = self.unset_value
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
         if value == self.unset_value:
             value = None
         return value
@@ -195,6 +237,8 @@ class Drmaa2NumericTypeDescriptor(Drmaa2Descriptor):
         if not self.can_write(obj):
             return
         value = value if value is not None else self.unset_value
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -237,16 +281,23 @@ class Drmaa2CharBufferDescriptor(Drmaa2Descriptor):
         value = None
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
-            if hasattr(value, 'value'):
-                value = value.value
-        return ByteString(value).decode()
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
+        if hasattr(value, 'value'):
+            value = value.value
+        if obj is not None and obj.bytes_mode:
+            return value
+        return decode_string(value)
 
     def __set__(self, obj, value):
         if not self.can_write(obj):
             return
         if value is None:
             return
-        value = ByteString(value).encode()
+        value = encode_string(value)
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -261,17 +312,24 @@ class Drmaa2StringDescriptor(Drmaa2Descriptor):
         value = None
         if self.can_read(obj):
             value = getattr(obj._struct.contents, self.name)
-            if hasattr(value, 'value'):
-                value = value.value
-        return ByteString(value).decode()
+        return self.to_py_value(obj, value)
+
+    def to_py_value(self, obj, value):
+        if hasattr(value, 'value'):
+            value = value.value
+        if obj is not None and obj.bytes_mode:
+            return value
+        return decode_string(value)
 
     def __set__(self, obj, value):
         if not self.can_write(obj):
             return
         if value is not None:
-            value = ByteString(value).encode()
+            value = encode_string(value)
         else:
-            value = ByteString(drmaa2_string()).encode()
+            value = encode_string(drmaa2_string())
+        if self.is_unchanged(obj, value):
+            return
         setattr(obj._struct.contents, self.name, value)
         obj._dict[self.name] = value
 
@@ -287,16 +345,21 @@ class Drmaa2StringListDescriptor(Drmaa2Descriptor):
     def __get__(self, obj, type=None):
         if not self.can_read(obj):
             return None
+        return self.to_py_value(obj, getattr(obj._struct.contents, self.name))
+
+    def to_py_value(self, obj, ctypes_list):
         value_list = list()
-        ctypes_list = getattr(obj._struct.contents, self.name)
         if ctypes_list:
             count = self.get_drmaa2_library().drmaa2_list_size(ctypes_list)
-            self.logger.debug('Converting ctypes list {} of size {}'.format(self.name, count))
+            self.logger.debug('Converting ctypes list %s of size %s', self.name, count)
+            decode = self.get_decoder(obj)
+            debug = self.logger.isEnabledFor(logging.DEBUG)
             for i in range(count):
                 void_ptr = self.get_drmaa2_library().drmaa2_list_get(ctypes_list, i)
                 if void_ptr:
-                    value = ByteString(cast(void_ptr, drmaa2_string).value).decode()
-                    self.logger.debug('{}[{}] = {}'.format(self.name, i, value))
+                    value = decode(cast(void_ptr, drmaa2_string).value)
+                    if debug:
+                        self.logger.debug('%s[%s] = %s', self.name, i, value)
                     value_list.append(value)
                 else:
                     ExceptionMapper.check_last_error_code()
@@ -308,23 +371,39 @@ class Drmaa2StringListDescriptor(Drmaa2Descriptor):
             return
         if value_list is None:
             value_list = []
+        value_list = [encode_string(v) for v in value_list]
+        if self.is_unchanged(obj, value_list):
+            return
         ctypes_list = getattr(obj._struct.contents, self.name)
-        if ctypes_list:
+        old_value_list = obj._dict.get(self.name)
+        n_unchanged = 0
+        if ctypes_list and old_value_list is not None:
+            # Only entries after the common prefix of the old and new list are replaced.
+            n_max = min(len(old_value_list), len(value_list))
+            while n_unchanged < n_max and old_value_list[n_unchanged] == value_list[n_unchanged]:
+                n_unchanged += 1
+            self.logger.debug('Updating string list %s from index %s', self.name, n_unchanged)
+            for i in range(len(old_value_list) - 1, n_unchanged - 1, -1):
+                ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_list_del(ctypes_list, i))
+            # The native list still refers to the old prefix strings.
+            value_list = old_value_list[:n_unchanged] + value_list[n_unchanged:]
+        elif ctypes_list:
             count = self.get_drmaa2_library().drmaa2_list_size(ctypes_list)
-            self.logger.debug('Clearing string list {} (size {})'.format(self.name, count))
+            self.logger.debug('Clearing string list %s (size %s)', self.name, count)
             while count > 0:
                 ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_list_del(ctypes_list, 0))
                 count = self.get_drmaa2_library().drmaa2_list_size(ctypes_list)
         else:
-            self.logger.debug('Creating string list {}'.format(self.name))
+            self.logger.debug('Creating string list %s', self.name)
             ctypes_list = self.get_drmaa2_library().drmaa2_list_create(int(ListType.STRINGLIST),
                                                                        drmaa2_list_entryfree())
             setattr(obj._struct.contents, self.name, ctypes_list)
 
-        value_list = [ByteString(v).encode() for v in value_list]
-        for i in range(len(value_list)):
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        for i in range(n_unchanged, len(value_list)):
             v = value_list[i]
-            self.logger.debug('Adding {}[{}] = {}'.format(self.name, i, v))
+            if debug:
+                self.logger.debug('Adding %s[%s] = %s', self.name, i, v)
             ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_list_add(ctypes_list, v))
         # this assures proper memory management in python 3
         obj._dict[self.name] = value_list
@@ -341,21 +420,26 @@ class Drmaa2DictDescriptor(Drmaa2Descriptor):
     def __get__(self, obj, type=None):
         if not self.can_read(obj):
             return None
+        return self.to_py_value(obj, getattr(obj._struct.contents, self.name))
+
+    def to_py_value(self, obj, ctypes_dict):
         value_dict = dict()
-        ctypes_dict = getattr(obj._struct.contents, self.name)
         if ctypes_dict:
             key_list = self.get_drmaa2_library().drmaa2_dict_list(ctypes_dict)
             if key_list:
                 count = self.get_drmaa2_library().drmaa2_list_size(key_list)
+                decode = self.get_decoder(obj)
+                debug = self.logger.isEnabledFor(logging.DEBUG)
                 for i in range(count):
                     void_ptr = self.get_drmaa2_library().drmaa2_list_get(key_list, i)
                     key = cast(void_ptr, drmaa2_string).value
                     value = self.get_drmaa2_library().drmaa2_dict_get(ctypes_dict, key)
-                    key = ByteString(key).decode()
-                    value = ByteString(value).decode()
-                    self.logger.debug('{}[{}] = {}'.format(self.name, key, value))
+                    key = decode(key)
+                    value = decode(value)
+                    if debug:
+                        self.logger.debug('%s[%s] = %s', self.name, key, value)
                     value_dict[key] = value
-                self.logger.debug('Clearing key list for dict {}'.format(self.name))
+                self.logger.debug('Clearing key list for dict %s', self.name)
                 self.get_drmaa2_library().drmaa2_list_free(cast(key_list, drmaa2_string_list))
         return value_dict
 
@@ -364,27 +448,47 @@ class Drmaa2DictDescriptor(Drmaa2Descriptor):
             return
         if value_dict is None:
             value_dict = {}
+        value_dict = {encode_string(k): encode_string(v) for (k, v) in value_dict.items()}
+        if self.is_unchanged(obj, value_dict):
+            return
         ctypes_dict = getattr(obj._struct.contents, self.name)
-        if ctypes_dict:
+        old_value_dict = obj._dict.get(self.name)
+        if ctypes_dict and old_value_dict is not None:
+            # Only removed and modified entries are touched; the native dict
+            # still refers to the old key and value strings of the others.
+            self.logger.debug('Updating dict %s', self.name)
+            unchanged_dict = {}
+            for (k, v) in old_value_dict.items():
+                if value_dict.get(k) == v:
+                    unchanged_dict[k] = v
+                else:
+                    ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_dict_del(ctypes_dict, k))
+            for k in unchanged_dict:
+                del value_dict[k]
+        elif ctypes_dict:
+            unchanged_dict = {}
             key_list = self.get_drmaa2_library().drmaa2_dict_list(ctypes_dict)
             if key_list:
                 count = self.get_drmaa2_library().drmaa2_list_size(key_list)
-                self.logger.debug('Clearing dict {} (size {})'.format(self.name, count))
+                self.logger.debug('Clearing dict %s (size %s)', self.name, count)
                 for i in range(count):
                     void_ptr = self.get_drmaa2_library().drmaa2_list_get(key_list, i)
                     key = cast(void_ptr, drmaa2_string).value
                     ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_dict_del(ctypes_dict, key))
         else:
-            self.logger.debug('Creating dict {}'.format(self.name))
+            unchanged_dict = {}
+            self.logger.debug('Creating dict %s', self.name)
             ctypes_dict = self.get_drmaa2_library().drmaa2_dict_create(drmaa2_dict_entryfree())
             setattr(obj._struct.contents, self.name, ctypes_dict)
 
-        value_dict = {ByteString(k).encode(): ByteString(v).encode() for (k, v) in value_dict.items()}
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         for (k, v) in value_dict.items():
-            self.logger.debug('{}[{}] = {}'.format(self.name, k, v))
+            if debug:
+                self.logger.debug('%s[%s] = %s', self.name, k, v)
             ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_dict_set(ctypes_dict, k, v))
+        unchanged_dict.update(value_dict)
         # this assures proper memory management in python 3
-        obj._dict[self.name] = value_dict
+        obj._dict[self.name] = unchanged_dict
 
 
 class Drmaa2ImplSpecDescriptor(Drmaa2Descriptor):
@@ -398,24 +502,32 @@ class Drmaa2ImplSpecDescriptor(Drmaa2Descriptor):
     def __get__(self, obj, type=None):
         if not self.can_read(obj):
             return None
-        implSpecDict = {}
-        for key in obj.get_implementation_specific_keys():
-            try:
-                value = obj.get_impl_spec_key_value(key)
-            except UnsupportedAttribute as ex:
-                # Okay, attribute was not set.
-                value = None
-            if value is not None:
-                implSpecDict[key] = value
-        return implSpecDict
+        return self.to_py_value(obj, None)
+
+    def to_py_value(self, obj, value):
+        # Values are looked up by key through the library, not read from the field.
+        return obj.get_impl_spec_key_values()
 
     def __set__(self, obj, implSpecDict):
         if not self.can_write(obj):
             return
+        implSpecDict = implSpecDict or {}
+        # Keys set previously, but missing now, are reset to the initial empty value.
+        old_implSpecDict = obj._dict.get(self.name, {})
+        new_implSpecDict = {}
+        changes = {}
         for key in obj.get_implementation_specific_keys():
             value = implSpecDict.get(key)
-            if value is not None:
-                obj.set_impl_spec_key_value(key, value)
+            if value is None:
+                if old_implSpecDict.get(key):
+                    changes[key] = ''
+                continue
+            if old_implSpecDict.get(key) != value:
+                changes[key] = value
+            new_implSpecDict[key] = value
+        if changes:
+            obj.set_impl_spec_key_values(changes)
+        obj._dict[self.name] = new_implSpecDict
 
 
 #######################################################################
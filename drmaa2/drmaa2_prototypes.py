@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+"""
+Prototypes (result type and argument types) for DRMAA2 C library functions.
+"""
+
+from ctypes import c_char_p
+from ctypes import c_void_p
+from ctypes import c_long
+from ctypes import c_longlong
+from ctypes import POINTER
+
+from .drmaa2_ctypes import drmaa2_error
+from .drmaa2_ctypes import drmaa2_bool
+from .drmaa2_ctypes import drmaa2_capability
+
+from .drmaa2_ctypes import drmaa2_string
+from .drmaa2_ctypes import drmaa2_string_list
+from .drmaa2_ctypes import drmaa2_list
+from .drmaa2_ctypes import drmaa2_listtype
+from .drmaa2_ctypes import drmaa2_list_entryfree
+from .drmaa2_ctypes import drmaa2_dict
+from .drmaa2_ctypes import drmaa2_dict_entryfree
+
+from .drmaa2_ctypes import drmaa2_j
+from .drmaa2_ctypes import drmaa2_j_list
+from .drmaa2_ctypes import drmaa2_jarray
+from .drmaa2_ctypes import drmaa2_jinfo
+from .drmaa2_ctypes import drmaa2_jtemplate
+from .drmaa2_ctypes import drmaa2_jstate
+
+from .drmaa2_ctypes import drmaa2_r
+from .drmaa2_ctypes import drmaa2_r_list
+from .drmaa2_ctypes import drmaa2_rinfo
+from .drmaa2_ctypes import drmaa2_rtemplate
+
+from .drmaa2_ctypes import drmaa2_slotinfo
+from .drmaa2_ctypes import drmaa2_queueinfo
+from .drmaa2_ctypes import drmaa2_queueinfo_list
+
+from .drmaa2_ctypes import drmaa2_machineinfo
+from .drmaa2_ctypes import drmaa2_machineinfo_list
+
+from .drmaa2_ctypes import drmaa2_jsession
+from .drmaa2_ctypes import drmaa2_rsession
+from .drmaa2_ctypes import drmaa2_msession
+
+from .drmaa2_ctypes import drmaa2_sudo
+from .drmaa2_ctypes import drmaa2_notification
+from .drmaa2_ctypes import drmaa2_version
+from .drmaa2_ctypes import drmaa2_time
+from .drmaa2_ctypes import drmaa2_callback
+
+# Function name: (restype, argtypes)
+DRMAA2_PROTOTYPES = {
+    'drmaa2_string_free': (None, [POINTER(drmaa2_string)]),
+
+    'drmaa2_list_create': (drmaa2_list, [drmaa2_listtype, drmaa2_list_entryfree]),
+    'drmaa2_list_free': (None, [POINTER(drmaa2_list)]),
+    'drmaa2_list_get': (c_void_p, [drmaa2_list, c_long]),
+    'drmaa2_list_add': (drmaa2_error, [drmaa2_list, c_void_p]),
+    'drmaa2_list_del': (drmaa2_error, [drmaa2_list, c_long]),
+    'drmaa2_list_size': (c_long, [drmaa2_list]),
+
+    'drmaa2_lasterror': (drmaa2_error, []),
+    'drmaa2_lasterror_text': (drmaa2_string, []),
+
+    # UGE-specific
+    'uge_drmaa2_list_free_root': (None, [POINTER(drmaa2_list)]),
+    'uge_drmaa2_list_set': (drmaa2_error, [drmaa2_list, c_long, c_void_p]),
+
+    'uge_vi_impl_spec_get': (drmaa2_dict, [POINTER(drmaa2_version)]),
+
+    'drmaa2_dict_create': (drmaa2_dict, [drmaa2_dict_entryfree]),
+    'drmaa2_dict_free': (None, [POINTER(drmaa2_dict)]),
+    'drmaa2_dict_list': (drmaa2_string_list, [drmaa2_dict]),
+    'drmaa2_dict_has': (drmaa2_bool, [drmaa2_dict, c_char_p]),
+    'drmaa2_dict_get': (c_char_p, [drmaa2_dict, c_char_p]),
+    'drmaa2_dict_del': (drmaa2_error, [drmaa2_dict, c_char_p]),
+    'drmaa2_dict_set': (drmaa2_error, [drmaa2_dict, c_char_p, c_char_p]),
+
+    'drmaa2_jinfo_create': (POINTER(drmaa2_jinfo), []),
+    'drmaa2_jinfo_free': (None, [POINTER(POINTER(drmaa2_jinfo))]),
+
+    'drmaa2_slotinfo_free': (None, [POINTER(POINTER(drmaa2_slotinfo))]),
+
+    'drmaa2_rinfo_create': (POINTER(drmaa2_rinfo), []),
+    'drmaa2_rinfo_free': (None, [POINTER(POINTER(drmaa2_rinfo))]),
+
+    'drmaa2_jtemplate_create': (POINTER(drmaa2_jtemplate), []),
+    'drmaa2_jtemplate_free': (None, [POINTER(POINTER(drmaa2_jtemplate))]),
+
+    'drmaa2_rtemplate_create': (POINTER(drmaa2_rtemplate), []),
+    'drmaa2_rtemplate_free': (None, [POINTER(POINTER(drmaa2_rtemplate))]),
+
+    'drmaa2_queueinfo_free': (None, [POINTER(POINTER(drmaa2_queueinfo))]),
+
+    'drmaa2_machineinfo_free': (None, [POINTER(POINTER(drmaa2_machineinfo))]),
+
+    'drmaa2_notification_free': (None, [POINTER(POINTER(drmaa2_notification))]),
+
+    'drmaa2_version_free': (None, [POINTER(POINTER(drmaa2_version))]),
+
+    'drmaa2_jtemplate_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_jinfo_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_rtemplate_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_rinfo_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_queueinfo_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_machineinfo_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_notification_impl_spec': (drmaa2_string_list, []),
+    'drmaa2_version_impl_spec': (drmaa2_string_list, []),
+
+    'drmaa2_get_instance_value': (drmaa2_string, [c_void_p, c_char_p]),
+    'drmaa2_describe_attribute': (drmaa2_string, [c_void_p, c_char_p]),
+    'drmaa2_set_instance_value': (drmaa2_error, [c_void_p, c_char_p, c_char_p]),
+
+    'drmaa2_jsession_free': (None, [POINTER(POINTER(drmaa2_jsession))]),
+    'drmaa2_rsession_free': (None, [POINTER(POINTER(drmaa2_rsession))]),
+    'drmaa2_msession_free': (None, [POINTER(POINTER(drmaa2_msession))]),
+
+    'drmaa2_j_free': (None, [POINTER(POINTER(drmaa2_j))]),
+    'drmaa2_jarray_free': (None, [POINTER(POINTER(drmaa2_jarray))]),
+    'drmaa2_r_free': (None, [POINTER(POINTER(drmaa2_r))]),
+
+    'drmaa2_rsession_get_contact': (drmaa2_string, [drmaa2_rsession]),
+    'drmaa2_rsession_get_session_name': (drmaa2_string, [drmaa2_rsession]),
+    'drmaa2_rsession_get_reservation': (POINTER(drmaa2_r), [POINTER(drmaa2_rsession), drmaa2_string]),
+    'drmaa2_rsession_request_reservation': (POINTER(drmaa2_r), [POINTER(drmaa2_rsession), POINTER(drmaa2_rtemplate)]),
+    'drmaa2_rsession_request_reservation_as': (POINTER(drmaa2_r), [POINTER(drmaa2_sudo), POINTER(drmaa2_rsession),
+                                                                   POINTER(drmaa2_rtemplate)]),
+
+    'drmaa2_rsession_get_reservations': (drmaa2_r_list, [POINTER(drmaa2_rsession)]),
+
+    'drmaa2_r_get_id': (drmaa2_string, [drmaa2_r]),
+    'drmaa2_r_get_session_name': (drmaa2_string, [drmaa2_r]),
+    # 'drmaa2_r_get_reservation_template': (POINTER(drmaa2_rtemplate), [POINTER(drmaa2_r)]),
+    'drmaa2_r_get_rtemplate': (POINTER(drmaa2_rtemplate), [POINTER(drmaa2_r)]),
+    'drmaa2_r_get_info': (POINTER(drmaa2_rinfo), [POINTER(drmaa2_r)]),
+    'drmaa2_r_terminate': (drmaa2_error, [POINTER(drmaa2_r)]),
+    'drmaa2_r_terminate_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_r)]),
+
+    'drmaa2_jarray_get_id': (drmaa2_string, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_get_jobs': (drmaa2_j_list, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_get_session_name': (drmaa2_string, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_get_jtemplate': (POINTER(drmaa2_jtemplate), [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_suspend': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_resume': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_hold': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_release': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_terminate': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_terminate_all': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_reap': (drmaa2_error, [POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_suspend_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_resume_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_hold_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_release_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_terminate_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+    'drmaa2_jarray_terminate_all_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_jarray)]),
+
+    'drmaa2_jsession_get_contact': (drmaa2_string, [POINTER(drmaa2_jsession)]),
+    'drmaa2_jsession_get_session_name': (drmaa2_string, [POINTER(drmaa2_jsession)]),
+    'drmaa2_jsession_get_job_categories': (drmaa2_string_list, [POINTER(drmaa2_jsession)]),
+    'drmaa2_jsession_get_jobs': (drmaa2_j_list, [POINTER(drmaa2_jsession), POINTER(drmaa2_jinfo)]),
+    'drmaa2_jsession_get_job_array': (POINTER(drmaa2_jarray), [POINTER(drmaa2_jsession), drmaa2_string]),
+    'drmaa2_jsession_run_job': (POINTER(drmaa2_j), [POINTER(drmaa2_jsession), POINTER(drmaa2_jtemplate)]),
+    'drmaa2_jsession_run_job_as': (POINTER(drmaa2_j), [POINTER(drmaa2_sudo), POINTER(drmaa2_jsession),
+                                                       POINTER(drmaa2_jtemplate)]),
+    'drmaa2_jsession_run_bulk_jobs': (POINTER(drmaa2_jarray), [POINTER(drmaa2_jsession), POINTER(drmaa2_jtemplate),
+                                                               c_longlong, c_longlong, c_longlong, c_longlong]),
+    'drmaa2_jsession_run_bulk_jobs_as': (POINTER(drmaa2_jarray), [POINTER(drmaa2_sudo), POINTER(drmaa2_jsession),
+                                                                  POINTER(drmaa2_jtemplate), c_longlong, c_longlong,
+                                                                  c_longlong, c_longlong]),
+    'drmaa2_jsession_wait_any_started': (POINTER(drmaa2_j), [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]),
+    'drmaa2_jsession_wait_any_terminated': (POINTER(drmaa2_j), [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]),
+    'drmaa2_jsession_wait_all_started': (drmaa2_j_list, [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]),
+    'drmaa2_jsession_wait_all_terminated': (drmaa2_j_list, [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]),
+    'drmaa2_j_suspend': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_suspend_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]),
+    'drmaa2_j_resume': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_resume_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]),
+    'drmaa2_j_hold': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_hold_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]),
+    'drmaa2_j_release': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_release_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]),
+    'drmaa2_j_terminate': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_terminate_forced': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_terminate_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j), drmaa2_bool]),
+    'drmaa2_j_terminate_all': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_terminate_forced_all': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_terminate_all_as': (drmaa2_error, [POINTER(drmaa2_sudo), POINTER(drmaa2_j), drmaa2_bool]),
+    'drmaa2_j_reap': (drmaa2_error, [POINTER(drmaa2_j)]),
+    'drmaa2_j_get_id': (drmaa2_string, [POINTER(drmaa2_j)]),
+    'drmaa2_j_get_jtemplate': (POINTER(drmaa2_jtemplate), [POINTER(drmaa2_j)]),
+    'drmaa2_j_get_state': (drmaa2_jstate, [POINTER(drmaa2_j), POINTER(drmaa2_string)]),
+    'drmaa2_j_get_info': (POINTER(drmaa2_jinfo), [POINTER(drmaa2_j)]),
+    'drmaa2_j_wait_started': (drmaa2_error, [POINTER(drmaa2_j), drmaa2_time]),
+    'drmaa2_j_wait_terminated': (drmaa2_error, [POINTER(drmaa2_j), drmaa2_time]),
+
+    'drmaa2_msession_get_all_reservations': (drmaa2_r_list, [POINTER(drmaa2_msession)]),
+
+    'drmaa2_msession_get_all_jobs': (drmaa2_j_list, [POINTER(drmaa2_msession), POINTER(drmaa2_jinfo)]),
+    'drmaa2_msession_get_all_queues': (drmaa2_queueinfo_list, [POINTER(drmaa2_msession), drmaa2_string_list]),
+    'drmaa2_msession_get_all_machines': (drmaa2_machineinfo_list, [POINTER(drmaa2_msession), drmaa2_string_list]),
+
+    'drmaa2_get_drms_name': (drmaa2_string, []),
+    'drmaa2_get_drms_version': (POINTER(drmaa2_version), []),
+    'drmaa2_get_drmaa_name': (drmaa2_string, []),
+    'drmaa2_get_drmaa_version': (POINTER(drmaa2_version), []),
+    'drmaa2_supports': (drmaa2_bool, [drmaa2_capability]),
+    'drmaa2_create_jsession': (POINTER(drmaa2_jsession), [c_char_p, c_char_p]),
+    'drmaa2_create_jsession_as': (POINTER(drmaa2_jsession), [POINTER(drmaa2_sudo), c_char_p, c_char_p]),
+    'drmaa2_create_rsession': (POINTER(drmaa2_rsession), [c_char_p, c_char_p]),
+    'drmaa2_create_rsession_as': (POINTER(drmaa2_rsession), [POINTER(drmaa2_sudo), c_char_p, c_char_p]),
+    'drmaa2_open_jsession': (POINTER(drmaa2_jsession), [c_char_p]),
+    'drmaa2_open_rsession': (POINTER(drmaa2_rsession), [c_char_p]),
+    'drmaa2_open_msession': (POINTER(drmaa2_msession), [c_char_p]),
+    'drmaa2_close_jsession': (drmaa2_error, [POINTER(drmaa2_jsession)]),
+    'drmaa2_close_rsession': (drmaa2_error, [POINTER(drmaa2_rsession)]),
+    'drmaa2_close_msession': (drmaa2_error, [POINTER(drmaa2_msession)]),
+    'drmaa2_destroy_jsession': (drmaa2_error, [c_char_p]),
+    'drmaa2_destroy_jsession_as': (drmaa2_error, [POINTER(drmaa2_sudo), c_char_p]),
+    'drmaa2_destroy_rsession': (drmaa2_error, [c_char_p]),
+    'drmaa2_destroy_rsession_as': (drmaa2_error, [POINTER(drmaa2_sudo), c_char_p]),
+    'drmaa2_get_jsession_names': (drmaa2_string_list, []),
+    'drmaa2_get_rsession_names': (drmaa2_string_list, []),
+    'drmaa2_register_event_notification': (drmaa2_error, [drmaa2_callback]),
+}
+
+
+# Functions that communicate with the DRM, and whose failures are paired
+# with the library last error (see Drmaa2Library.get_last_error()).
+# Failures are detected from the result: a non-zero status code for
+# functions returning drmaa2_error, UNSET_JSTATE for drmaa2_j_get_state(),
+# and NULL for the others.
+DRMAA2_DRM_FUNCTIONS = frozenset(
+    [name for name in DRMAA2_PROTOTYPES if name.startswith((
+        'drmaa2_jsession_', 'drmaa2_rsession_', 'drmaa2_msession_', 'drmaa2_j_', 'drmaa2_jarray_', 'drmaa2_r_',
+        'drmaa2_create_', 'drmaa2_open_', 'drmaa2_close_', 'drmaa2_destroy_', 'drmaa2_get_'))
+     and not name.endswith('_free') and name != 'drmaa2_get_instance_value'] + ['drmaa2_register_event_notification'])
+
+# Functions returning drmaa2_error.
+DRMAA2_STATUS_FUNCTIONS = frozenset(
+    [name for (name, (restype, _)) in DRMAA2_PROTOTYPES.items() if restype is drmaa2_error]) - frozenset(
+    ['drmaa2_lasterror'])
+
+# Timed wait functions. These are not retried, since a retried wait
+# could block for several times the caller's timeout.
+DRMAA2_WAIT_FUNCTIONS = frozenset([name for name in DRMAA2_PROTOTYPES if '_wait_' in name])
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    print('%s DRMAA2 function prototypes' % len(DRMAA2_PROTOTYPES))
@@ -37,10 +37,12 @@ class Drmaa2SlotInfoListDescriptor(Drmaa2Descriptor):
             return None
         value_list = []
         if obj._struct is not None:
-            ctypes_list = getattr(obj._struct.contents, self.name)
-            value_list = SlotInfo.to_py_job_list(ctypes_list)
+            value_list = self.to_py_value(obj, getattr(obj._struct.contents, self.name))
         return value_list
 
+    def to_py_value(self, obj, ctypes_list):
+        return SlotInfo.to_py_job_list(ctypes_list)
+
     def __set__(self, obj, value_list):
         # Always used as read-only descriptor.
         return
@@ -36,10 +36,12 @@ class Drmaa2VersionDescriptor(Drmaa2Descriptor):
         if not obj:
             return None
         if obj._struct is not None:
-            ctypes_version = getattr(obj._struct.contents, self.name)
-            py_version = Version(ctypes_version)
+            py_version = self.to_py_value(obj, getattr(obj._struct.contents, self.name))
         return py_version
 
+    def to_py_value(self, obj, ctypes_version):
+        return Version(ctypes_version)
+
     def __set__(self, obj, ctypes_version):
         if not obj:
             return
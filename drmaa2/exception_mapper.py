@@ -62,6 +62,17 @@ class ExceptionMapper(object):
         StatusCode.AUTHORIZATION: AuthorizationError,
     }
 
+    @classmethod
+    def get_last_error(cls):
+        """ 
+        Retrieve the last error code and message for the calling thread
+        from the DRMAA2 library (see Drmaa2Library.get_last_error()).
+
+        :return tuple: (error number, error message)
+        """
+        drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
+        return drmaa2_lib.get_last_error()
+
     @classmethod
     def get_last_error_message(cls):
         """ 
@@ -69,13 +80,7 @@ class ExceptionMapper(object):
 
         :return str: Last error message
         """
-        drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
-        string_ptr = drmaa2_lib.drmaa2_lasterror_text()
-        message = ''
-        if string_ptr:
-            message = ByteString(string_ptr.value).decode()
-            drmaa2_lib.drmaa2_string_free(string_ptr)
-        return message
+        return cls.get_last_error()[1]
 
     @classmethod
     def last_error_code(cls):
@@ -94,21 +99,31 @@ class ExceptionMapper(object):
 
         :raises Drmaa2Exception: in case of a non-zero code
         """
-        code = cls.last_error_code()
-        cls.check_status_code(code)
+        (code, message) = cls.get_last_error()
+        cls.raise_error(code, message)
 
     @classmethod
     def check_status_code(cls, code):
         """ 
         Check the last error code from the DRMAA2 library.
 
+        :raises Drmaa2Exception: in case of a non-zero code
+        """
+        if code != StatusCode.SUCCESS:
+            (_, message) = cls.get_last_error()
+            cls.raise_error(code, message)
+
+    @classmethod
+    def raise_error(cls, code, message):
+        """ 
+        Raise exception matching the given error code.
+
         :raises Drmaa2Exception: in case of a non-zero code
         """
         status_code = StatusCode(code)
         if status_code != StatusCode.SUCCESS:
             error_class = cls.EXCEPTION_MAP.get(status_code, Drmaa2Exception)
-            error = error_class(error=cls.get_last_error_message())
-            raise error
+            raise error_class(error=message)
 
 
 #######################################################################
@@ -19,6 +19,7 @@
 # ___INFO__MARK_END__
 
 from ctypes import cast
+from ctypes import c_void_p
 from ctypes import pointer
 from ctypes import POINTER
 
@@ -28,14 +29,17 @@ from .drmaa2_constants import JobState
 from .drmaa2_constants import ListType
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_ctypes import drmaa2_j
+from .drmaa2_ctypes import drmaa2_j_view
 from .drmaa2_ctypes import drmaa2_list_entryfree
 
 from .sudo import Sudo
 
-from .byte_string import ByteString
+from .byte_string import encode_string
+from .byte_string import decode_string
 from .job_info import JobInfo
 from .job_template import JobTemplate
 from .drmaa2_object import Drmaa2Object
+from .drmaa2_job_field_descriptor import Drmaa2JobFieldDescriptor
 from .log_manager import LogManager
 from .exception_mapper import ExceptionMapper
 from .drmaa2_exceptions import InvalidArgument
@@ -44,24 +48,24 @@ from .drmaa2_exceptions import InvalidArgument
 class Job(Drmaa2Object):
     """ High-level DRMAA2 job class. """
 
-    id = Drmaa2Object.StringDescriptor('id')
+    id = Drmaa2JobFieldDescriptor('id')
     """ Job id (str). """
-    session_name = Drmaa2Object.StringDescriptor('session_name')
+    session_name = Drmaa2JobFieldDescriptor('session_name')
     """ Session name (str). """
-    job_name = Drmaa2Object.StringDescriptor('job_name')
+    job_name = Drmaa2JobFieldDescriptor('job_name')
     """ Job name (str). """
 
     logger = LogManager.get_instance().get_logger('Job')
 
     def __init__(self, job):
         """ Constructor. """
-        Drmaa2Object.__init__(self)
         if isinstance(job, POINTER(drmaa2_j)):
-            self._struct = POINTER(drmaa2_j)()
-            self._struct.contents = drmaa2_j()
-            self.id = ByteString(getattr(job.contents, 'id').value).decode()
-            self.session_name = ByteString(getattr(job.contents, 'session_name').value).decode()
-            self.job_name = ByteString(getattr(job.contents, 'job_name').value).decode()
+            # Field values are copied; as for create_from_fields(),
+            # the struct is allocated only when needed.
+            contents = job.contents
+            self._dict = {'id': contents.id.value, 'session_name': contents.session_name.value,
+                          'job_name': contents.job_name.value}
+            self._read_only = False
         else:
             raise InvalidArgument('Invalid argument: %s' % str(job))
 
@@ -77,11 +81,11 @@ class Job(Drmaa2Object):
         >>> print(j.get_info().job_state)
         SUSPENDED
         """
-        self.logger.debug('Suspending job id {}'.format(self.id))
+        self.logger.debug('Suspending job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_suspend_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_suspend(self._struct))
@@ -98,11 +102,11 @@ class Job(Drmaa2Object):
         >>> ...
         >>> j.resume()
         """
-        self.logger.debug('Resuming job id {}'.format(self.id))
+        self.logger.debug('Resuming job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_resume_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_resume(self._struct))
@@ -119,11 +123,11 @@ class Job(Drmaa2Object):
         >>> print(j.get_info().job_state)
         RUNNING_HELD
         """
-        self.logger.debug('Holding job id {}'.format(self.id))
+        self.logger.debug('Holding job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_hold_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_hold(self._struct))
@@ -140,11 +144,11 @@ class Job(Drmaa2Object):
         >>> ...
         >>> j.release()
         """
-        self.logger.debug('Releasing job id {}'.format(self.id))
+        self.logger.debug('Releasing job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_release_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_release(self._struct))
@@ -162,11 +166,11 @@ class Job(Drmaa2Object):
         >>> j.get_info().terminating_signal
         'SIGKILL'
         """
-        self.logger.debug('Terminating job id {}'.format(self.id))
+        self.logger.debug('Terminating job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             forced = Bool.FALSE
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_terminate_as(auth._struct, self._struct, forced))
         else:
@@ -183,11 +187,11 @@ class Job(Drmaa2Object):
         >>> ...
         >>> j.terminate_forced()
         """
-        self.logger.debug('Terminating (forced) job id {}'.format(self.id))
+        self.logger.debug('Terminating (forced) job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             forced = Bool.TRUE
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_terminate_as(auth._struct, self._struct, forced))
         else:
@@ -203,11 +207,11 @@ class Job(Drmaa2Object):
         >>> j = j_session.run_job({'remote_command' : '/bin/sleep', 'args' : ['100']})
         >>> j.terminate_all()
         """
-        self.logger.debug('Terminating all tasks for job id {}'.format(self.id))
+        self.logger.debug('Terminating all tasks for job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             forced = Bool.FALSE
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_terminate_all_as(auth._struct, self._struct, forced))
         else:
@@ -224,11 +228,11 @@ class Job(Drmaa2Object):
         >>> ...
         >>> j.terminate_forced_all()
         """
-        self.logger.debug('Terminating all tasks (forced) for job id {}'.format(self.id))
+        self.logger.debug('Terminating all tasks (forced) for job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             forced = Bool.TRUE
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_terminate_all_as(auth._struct, self._struct, forced))
         else:
@@ -242,7 +246,7 @@ class Job(Drmaa2Object):
         >>> ...
         >>> j.reap()
         """
-        self.logger.debug('Reaping job id {}'.format(self.id))
+        self.logger.debug('Reaping job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_reap(self._struct))
 
@@ -260,7 +264,7 @@ class Job(Drmaa2Object):
         >>> print(jt.args)
         ['100']
         """
-        self.logger.debug('Retrieving template for job id {}'.format(self.id))
+        self.logger.debug('Retrieving template for job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ctypes_job_template = drmaa2_lib.drmaa2_j_get_jtemplate(self._struct)
         if not ctypes_job_template:
@@ -280,7 +284,7 @@ class Job(Drmaa2Object):
         >>> print(state)
         JobState.DONE
         """
-        self.logger.debug('Retrieving state for job id {}'.format(self.id))
+        self.logger.debug('Retrieving state for job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         sub_state = POINTER(drmaa2_string)()
         sub_state.contents = drmaa2_string()
@@ -303,7 +307,7 @@ class Job(Drmaa2Object):
         >>> print(ji.slots)
         1
         """
-        self.logger.debug('Retrieving info for job id {}'.format(self.id))
+        self.logger.debug('Retrieving info for job id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ctypes_job_info = drmaa2_lib.drmaa2_j_get_info(self._struct)
         if not ctypes_job_info:
@@ -323,7 +327,7 @@ class Job(Drmaa2Object):
         (<JobState.RUNNING: 3>, None)
         """
         drmaa2_lib = self.get_drmaa2_library()
-        self.logger.debug('Waiting on job id {} start'.format(self.id))
+        self.logger.debug('Waiting on job id %s start', self.id)
         ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_wait_started(self._struct, timeout))
 
     def wait_terminated(self, timeout=Time.INFINITE_TIME):
@@ -338,36 +342,275 @@ class Job(Drmaa2Object):
         >>> print(j.get_state())
         (<JobState.DONE: 3>, None)
         """
-        self.logger.debug('Waiting on job id {} termination'.format(self.id))
+        self.logger.debug('Waiting on job id %s termination', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_j_wait_terminated(self._struct, int(timeout)))
 
     def __del__(self):
         pass
 
+    def __getattr__(self, name):
+        # Jobs created via create_from_fields() allocate their struct on first use.
+        if name == '_struct' and '_dict' in self.__dict__:
+            d = self._dict
+            self._struct = pointer(drmaa2_j(d['id'], d['session_name'], d['job_name']))
+            return self._struct
+        raise AttributeError(name)
+
+    def to_dict(self):
+        """
+        Conversion to dictionary; unlike for other objects, fields are read
+        without allocating the struct.
+
+        :returns: Dictionary with job id, session name and job name.
+
+        >>> print(j.to_dict())
+        {'id': '528', 'job_name': 'a_job', 'session_name': 'js-01'}
+        """
+        d = {}
+        for (attr_name, descriptor, field_name) in self.get_field_table():
+            v = descriptor.__get__(self, type(self))
+            if v is not None:
+                d[attr_name] = v
+        return d
+
+    @classmethod
+    def create_from_fields(cls, id, session_name, job_name):
+        """
+        Create lightweight job handle from its field values, bypassing
+        the constructor. Field access does not allocate the underlying
+        struct; it is allocated by the first library call that needs it.
+
+        :param id: Job id.
+        :type id: bytes
+
+        :param session_name: Session name.
+        :type session_name: bytes
+
+        :param job_name: Job name.
+        :type job_name: bytes
+
+        :returns: Job object.
+        """
+        job = cls.__new__(cls)
+        # this assures proper memory management in python 3
+        job._dict = {'id': id, 'session_name': session_name, 'job_name': job_name}
+        job._read_only = False
+        return job
+
     @classmethod
-    def to_py_job_list(cls, ctypes_list):
+    def iter_py_job_list(cls, ctypes_list, as_refs=False):
+        """
+        Iterate over DRMAA2 job list, creating Job objects lazily. Jobs are
+        created from the raw field values, without going through the
+        field descriptors. The list must not be freed before iteration ends.
+
+        :param ctypes_list: DRMAA2 job list.
+
+        :param as_refs: If true, yield JobRef handles instead of Job objects.
+        :type as_refs: bool
+
+        :returns: Generator of Job or JobRef objects.
+        """
+        if not ctypes_list:
+            return
         drmaa2_lib = cls.get_drmaa2_library()
-        py_job_list = []
-        if ctypes_list:
-            count = drmaa2_lib.drmaa2_list_size(ctypes_list)
-            cls.logger.debug('Converting ctypes job list of size {}'.format(count))
-            for i in range(count):
-                void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
-                if void_ptr:
-                    j = cast(void_ptr, POINTER(drmaa2_j))
-                    j = Job(j)
-                    py_job_list.append(j)
-                else:
-                    ExceptionMapper.check_last_error_code()
-                    py_job_list.append(None)
-        return py_job_list
+        count = drmaa2_lib.drmaa2_list_size(ctypes_list)
+        cls.logger.debug('Converting ctypes job list of size %s', count)
+        list_get = drmaa2_lib.drmaa2_list_get
+        from_address = drmaa2_j_view.from_address
+        create_from_fields = JobRef.create_from_fields if as_refs else cls.create_from_fields
+        for i in range(count):
+            void_ptr = list_get(ctypes_list, i)
+            if void_ptr:
+                j = from_address(void_ptr)
+                yield create_from_fields(j.id, j.session_name, j.job_name)
+            else:
+                ExceptionMapper.check_last_error_code()
+                yield None
 
     @classmethod
-    def to_ctypes_job_list(cls, py_job_list):
+    def to_py_job_list(cls, ctypes_list, as_refs=False):
+        """
+        Convert DRMAA2 job list to list of Job objects (see iter_py_job_list()).
+
+        :param ctypes_list: DRMAA2 job list.
+
+        :param as_refs: If true, return JobRef handles instead of Job objects.
+        :type as_refs: bool
+
+        :returns: List of Job or JobRef objects.
+        """
+        return list(cls.iter_py_job_list(ctypes_list, as_refs))
+
+    @classmethod
+    def to_ctypes_job_list(cls, py_job_list, native_jobs=None):
+        """
+        Convert list of Job objects or JobRef handles to DRMAA2 job list.
+        A temporary Job object is created for each JobRef handle.
+
+        :param py_job_list: List of Job or JobRef objects.
+
+        :param native_jobs: List to which the Job objects whose structs the native list refers to are appended, in list order; it must be kept alive for as long as the native list is used. It is required if the list contains JobRef handles.
+        :type native_jobs: list
+
+        :returns: DRMAA2 job list.
+        """
         drmaa2_lib = cls.get_drmaa2_library()
-        cls.logger.debug('Converting py job list of size {}'.format(len(py_job_list)))
+        cls.logger.debug('Converting py job list of size %s', len(py_job_list))
         ctypes_job_list = drmaa2_lib.drmaa2_list_create(int(ListType.JOBLIST), drmaa2_list_entryfree())
         for j in py_job_list:
+            if isinstance(j, JobRef):
+                if native_jobs is None:
+                    drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
+                    raise InvalidArgument('Converting JobRef handles requires a list for keeping native jobs alive')
+                j = j.to_job()
+            if native_jobs is not None:
+                native_jobs.append(j)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_list_add(ctypes_job_list, j._struct))
         return ctypes_job_list
+
+
+class JobRef(object):
+    """
+    Compact job handle holding only the job id, session name and job name
+    as Python strings, in slots rather than an instance dictionary. A
+    native job struct is created only for the duration of an operation
+    that needs one; use to_job() for a full Job object.
+    """
+
+    __slots__ = ('id', 'session_name', 'job_name')
+
+    def __init__(self, id, session_name=None, job_name=None):
+        """
+        Constructor.
+
+        :param id: Job id.
+        :type id: str
+
+        :param session_name: Session name.
+        :type session_name: str
+
+        :param job_name: Job name.
+        :type job_name: str
+
+        >>> j_list = j_session.get_jobs(None, as_refs=True)
+        >>> print(j_list[0])
+        {'id': '528', 'session_name': 'js-01', 'job_name': 'a_job'}
+        """
+        self.id = id
+        self.session_name = session_name
+        self.job_name = job_name
+
+    @classmethod
+    def create_from_fields(cls, id, session_name, job_name):
+        """
+        Create job handle from native field values.
+
+        :param id: Job id.
+        :type id: bytes
+
+        :param session_name: Session name.
+        :type session_name: bytes
+
+        :param job_name: Job name.
+        :type job_name: bytes
+
+        :returns: JobRef object.
+        """
+        return cls(decode_string(id), decode_string(session_name), decode_string(job_name))
+
+    def to_job(self):
+        """
+        Conversion to Job object.
+
+        :returns: Job object.
+        """
+        return Job.create_from_fields(encode_string(self.id), encode_string(self.session_name),
+                                      encode_string(self.job_name))
+
+    def to_dict(self):
+        """
+        Conversion to dictionary.
+
+        :returns: Dictionary with job id, session name and job name; unset values are omitted.
+        """
+        return Drmaa2Object.scrub_dict({'id': self.id, 'session_name': self.session_name, 'job_name': self.job_name})
+
+    def suspend(self, auth=None):
+        """ Suspend the job (see Job.suspend()). """
+        self.to_job().suspend(auth)
+
+    def resume(self, auth=None):
+        """ Resume the job (see Job.resume()). """
+        self.to_job().resume(auth)
+
+    def hold(self, auth=None):
+        """ Hold the job (see Job.hold()). """
+        self.to_job().hold(auth)
+
+    def release(self, auth=None):
+        """ Release the job (see Job.release()). """
+        self.to_job().release(auth)
+
+    def terminate(self, auth=None):
+        """ Terminate the job (see Job.terminate()). """
+        self.to_job().terminate(auth)
+
+    def terminate_forced(self, auth=None):
+        """ Terminate the job, forcing termination (see Job.terminate_forced()). """
+        self.to_job().terminate_forced(auth)
+
+    def terminate_all(self, auth=None):
+        """ Terminate all tasks of the job (see Job.terminate_all()). """
+        self.to_job().terminate_all(auth)
+
+    def terminate_forced_all(self, auth=None):
+        """ Terminate all tasks of the job, forcing termination (see Job.terminate_forced_all()). """
+        self.to_job().terminate_forced_all(auth)
+
+    def reap(self):
+        """ Reap the job from internal lists (see Job.reap()). """
+        self.to_job().reap()
+
+    def get_template(self):
+        """ Get job template (see Job.get_template()). """
+        return self.to_job().get_template()
+
+    def get_state(self):
+        """ Get job state (see Job.get_state()). """
+        return self.to_job().get_state()
+
+    def get_info(self):
+        """ Get job info (see Job.get_info()). """
+        return self.to_job().get_info()
+
+    def wait_started(self, timeout=Time.INFINITE_TIME):
+        """ Wait until the job starts or specified timeout occurs (see Job.wait_started()). """
+        self.to_job().wait_started(timeout)
+
+    def wait_terminated(self, timeout=Time.INFINITE_TIME):
+        """ Wait until the job terminates or specified timeout occurs (see Job.wait_terminated()). """
+        self.to_job().wait_terminated(timeout)
+
+    def __eq__(self, other):
+        if not isinstance(other, (JobRef, Job)):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash((self.id, self.session_name, self.job_name))
+
+    def __str__(self):
+        """ Conversion to string. """
+        return str(self.to_dict())
+
+    def __repr__(self):
+        """ Object representation. """
+        return 'JobRef(%s)' % self.__str__()
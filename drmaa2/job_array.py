@@ -66,11 +66,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.suspend()
         """
-        self.logger.debug('Suspending job array id {}'.format(self.id))
+        self.logger.debug('Suspending job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_suspend_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_suspend(self._struct))
@@ -88,11 +88,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.resume()
         """
-        self.logger.debug('Resuming job array id {}'.format(self.id))
+        self.logger.debug('Resuming job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_resume_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_resume(self._struct))
@@ -108,11 +108,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.hold()
         """
-        self.logger.debug('Holding job array id {}'.format(self.id))
+        self.logger.debug('Holding job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_hold_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_hold(self._struct))
@@ -130,11 +130,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.release()
         """
-        self.logger.debug('Releasing job array id {}'.format(self.id))
+        self.logger.debug('Releasing job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_release_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_release(self._struct))
@@ -150,11 +150,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.terminate()
         """
-        self.logger.debug('Terminating job array id {}'.format(self.id))
+        self.logger.debug('Terminating job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_terminate_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_terminate(self._struct))
@@ -170,11 +170,11 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.terminate_all()
         """
-        self.logger.debug('Terminating all tasks for job array id {}'.format(self.id))
+        self.logger.debug('Terminating all tasks for job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_terminate_all_as(auth._struct, self._struct))
         else:
             ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_terminate_all(self._struct))
@@ -187,7 +187,7 @@ class JobArray(Drmaa2Object):
         >>> ...
         >>> ja.reap()
         """
-        self.logger.debug('Reaping job array id {}'.format(self.id))
+        self.logger.debug('Reaping job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ExceptionMapper.check_status_code(drmaa2_lib.drmaa2_jarray_reap(self._struct))
 
@@ -205,7 +205,7 @@ class JobArray(Drmaa2Object):
         >>> print(jt.args)
         ['100']
         """
-        self.logger.debug('Retrieving template for job array id {}'.format(self.id))
+        self.logger.debug('Retrieving template for job array id %s', self.id)
         drmaa2_lib = self.get_drmaa2_library()
         ctypes_job_template = drmaa2_lib.drmaa2_jarray_get_jtemplate(self._struct)
         if not ctypes_job_template:
@@ -18,7 +18,13 @@
 #######################################################################################
 # ___INFO__MARK_END__
 
+import os
+import copy
+import math
+import time
+import weakref
 import getpass
+from collections import deque
 from uuid import uuid4
 from ctypes import pointer
 from ctypes import c_void_p
@@ -26,6 +32,8 @@ from .drmaa2_constants import Time
 from .drmaa2_constants import PY_DICT_TYPE
 
 from .byte_string import ByteString
+from .byte_string import encode_string
+from .byte_string import decode_string
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_object import Drmaa2Object
 
@@ -38,6 +46,9 @@ from .log_manager import LogManager
 from .exception_mapper import ExceptionMapper
 from .drmaa2_exceptions import Drmaa2Exception
 from .drmaa2_exceptions import InvalidArgument
+from .drmaa2_exceptions import InternalError
+
+get_time = getattr(time, 'monotonic', time.time)
 
 
 class JobSession(Drmaa2Object):
@@ -51,8 +62,11 @@ class JobSession(Drmaa2Object):
     logger = LogManager.get_instance().get_logger('JobSession')
     exception_mapper = ExceptionMapper()
 
+    # Open sessions, keyed by object id, to be reopened in forked children.
+    __sessions = weakref.WeakValueDictionary()
+
     def __init__(self, name=None, contact=None, destroy_on_exit=True, check_for_existing_session=True, session_dict={},
-                 auth=None):
+                 auth=None, rate_limiter=None):
         """ 
         Constructor. If the session with a given name does not already exist, 
         it will create a new one; otherwise, it will open the existing session.
@@ -75,12 +89,16 @@ class JobSession(Drmaa2Object):
         :param auth: Optional sudo object for creating the session; it can be specified either as a dictionary, or as a Sudo object directly.
         :type auth: Sudo or dict
 
+        :param rate_limiter: Optional rate limiter for job submissions; it can be shared with other sessions.
+        :type rate_limiter: RateLimiter
+
         >>> j_session = JobSession()
         >>> print(j_session.name)
         bab80df52a654dfda7552cbae8dacca
         """
         Drmaa2Object.__init__(self)
         self._destroy_on_exit = destroy_on_exit
+        self.rate_limiter = rate_limiter
         name = name or session_dict.get('name')
         if not name:
             name = uuid4().hex
@@ -98,7 +116,7 @@ class JobSession(Drmaa2Object):
             for n in session_names_to_check:
                 if n in existing_session_names:
                     name = n
-                    self.logger.debug('Discovered existing job session with name {}'.format(n))
+                    self.logger.debug('Discovered existing job session with name %s', n)
                     create_new_session = False
                     break
 
@@ -111,6 +129,46 @@ class JobSession(Drmaa2Object):
         self._struct_p = pointer(self._struct)
         self._name_bs = ByteString(name)
         self._read_only = True
+        JobSession.__sessions[id(self)] = self
+
+    @classmethod
+    def reopen_after_fork(cls):
+        """ 
+        Mark job sessions as stale in a child process created with os.fork().
+        Session handles inherited from the parent are abandoned without
+        being closed, and each session is reopened by name on the first
+        call that needs it; sessions that are not used in the child are
+        never reopened. The child never destroys inherited sessions on exit.
+        This is called automatically after fork.
+        """
+        for session in list(JobSession.__sessions.values()):
+            session._destroy_on_exit = False
+            if session.__dict__.get('_struct'):
+                del session._struct
+
+    def __getattr__(self, name):
+        # Sessions marked as stale after fork are reopened on first use.
+        if name == '_struct' and '_name_bs' in self.__dict__:
+            self._struct = None
+            self.logger.debug('Reopening job session %s after fork', self._name_bs.decode())
+            self.open()
+            return self._struct
+        raise AttributeError(name)
+
+    def __is_stale(self):
+        return '_struct' not in self.__dict__
+
+    @classmethod
+    def get_open_session_count(cls):
+        """ 
+        Get number of open job session objects in this process. 
+
+        :returns: Number of open job sessions.
+
+        >>> print(JobSession.get_open_session_count())
+        2
+        """
+        return len([s for s in list(JobSession.__sessions.values()) if s.__is_stale() or s._struct])
 
     @classmethod
     def list_session_names(cls):
@@ -125,24 +183,24 @@ class JobSession(Drmaa2Object):
         return Drmaa2Object.to_py_string_list(cls.get_drmaa2_library().drmaa2_get_jsession_names())
 
     def __create(self, name, contact, auth):
-        self.logger.debug('Creating job session with name {} (contact: {})'.format(name, contact))
+        self.logger.debug('Creating job session with name %s (contact: %s)', name, contact)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
-            struct = self.get_drmaa2_library().drmaa2_create_jsession_as(auth._struct, ByteString(name).encode(),
-                                                                         ByteString(contact).encode())
+            self.logger.debug('Using sudo object: %s', auth)
+            struct = self.get_drmaa2_library().drmaa2_create_jsession_as(auth._struct, encode_string(name),
+                                                                         encode_string(contact))
         else:
             if '@' in name:
                 raise InvalidArgument('session name with @ is not allowed')
-            struct = self.get_drmaa2_library().drmaa2_create_jsession(ByteString(name).encode(),
-                                                                      ByteString(contact).encode())
+            struct = self.get_drmaa2_library().drmaa2_create_jsession(encode_string(name),
+                                                                      encode_string(contact))
         if not struct:
             self.exception_mapper.check_last_error_code()
         return struct
 
     def __open(self, name):
-        self.logger.debug('Opening job session {}'.format(name))
-        struct = self.get_drmaa2_library().drmaa2_open_jsession(ByteString(name).encode())
+        self.logger.debug('Opening job session %s', name)
+        struct = self.get_drmaa2_library().drmaa2_open_jsession(encode_string(name))
         if not struct:
             self.exception_mapper.check_last_error_code()
         return struct
@@ -157,7 +215,7 @@ class JobSession(Drmaa2Object):
         >>> j_session.open()
         """
         if self._struct:
-            self.logger.debug('Job session {} is already open'.format(self._name_bs.decode()))
+            self.logger.debug('Job session %s is already open', self._name_bs.decode())
         else:
             self._struct = self.__open(self._name_bs)
             self._struct_p = pointer(self._struct)
@@ -170,8 +228,11 @@ class JobSession(Drmaa2Object):
         >>> ...
         >>> j_session.close()
         """
-        if self._struct:
-            self.logger.debug('Closing job session {}'.format(self._name_bs.decode()))
+        if self.__is_stale():
+            # Inherited handle is abandoned (see reopen_after_fork()).
+            self._struct = None
+        elif self._struct:
+            self.logger.debug('Closing job session %s', self._name_bs.decode())
             drmaa2_lib = self.get_drmaa2_library()
             self.exception_mapper.check_status_code(drmaa2_lib.drmaa2_close_jsession(self._struct))
             drmaa2_lib.drmaa2_jsession_free(self._struct_p)
@@ -188,16 +249,16 @@ class JobSession(Drmaa2Object):
         >>> ...
         >>> j_session.destroy()
         """
-        self.logger.debug('Destroying job session {}'.format(self._name_bs.decode()))
+        self.logger.debug('Destroying job session %s', self._name_bs.decode())
         auth = auth or self._auth
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
-            if self._name_bs.decode() != ByteString('').decode():
+            self.logger.debug('Using sudo object: %s', auth)
+            if self._name_bs.decode() != decode_string(''):
                 self.exception_mapper.check_status_code(
                     self.get_drmaa2_library().drmaa2_destroy_jsession_as(auth._struct, self._name_bs.encode()))
         else:
-            if self._name_bs.decode() != ByteString('').decode():
+            if self._name_bs.decode() != decode_string(''):
                 self.exception_mapper.check_status_code(
                     self.get_drmaa2_library().drmaa2_destroy_jsession(self._name_bs.encode()))
 
@@ -214,15 +275,15 @@ class JobSession(Drmaa2Object):
 
         >>> JobSession.destroy_by_name('js-01')
         """
-        cls.logger.debug('Destroying job session {}'.format(name))
+        cls.logger.debug('Destroying job session %s', name)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            cls.logger.debug('Using sudo object: {}'.format(auth))
+            cls.logger.debug('Using sudo object: %s', auth)
             cls.exception_mapper.check_status_code(
-                cls.get_drmaa2_library().drmaa2_destroy_jsession_as(auth._struct, ByteString(name).encode()))
+                cls.get_drmaa2_library().drmaa2_destroy_jsession_as(auth._struct, encode_string(name)))
         else:
             cls.exception_mapper.check_status_code(
-                cls.get_drmaa2_library().drmaa2_destroy_jsession(ByteString(name).encode()))
+                cls.get_drmaa2_library().drmaa2_destroy_jsession(encode_string(name)))
 
     def __del__(self):
         """ Destructor. """
@@ -231,9 +292,9 @@ class JobSession(Drmaa2Object):
             try:
                 self.destroy()
             except Drmaa2Exception as ex:
-                self.logger.warn('Could not destroy job session: {}'.format(str(ex)))
+                self.logger.warn('Could not destroy job session: %s', ex)
         else:
-            self.logger.debug('Will not destroy job session {}'.format(self._name_bs.decode()))
+            self.logger.debug('Will not destroy job session %s', self._name_bs.decode())
         if self._struct:
             self.get_drmaa2_library().drmaa2_jsession_free(self._struct_p)
 
@@ -257,22 +318,114 @@ class JobSession(Drmaa2Object):
         >>> print(j.id)
         521
         """
-        self.logger.debug('Running a job using template: {}'.format(template))
-        drmaa2_lib = self.get_drmaa2_library()
+        self.logger.debug('Running a job using template: %s', template)
         template = JobTemplate.create_from_dict(template)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
+        return self.__run_job(template, auth)
+
+    def __run_job(self, template, auth):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        drmaa2_lib = self.get_drmaa2_library()
+        if auth:
             ctypes_job = drmaa2_lib.drmaa2_jsession_run_job_as(auth._struct, self._struct, template._struct)
         else:
             ctypes_job = drmaa2_lib.drmaa2_jsession_run_job(self._struct, template._struct)
         if not ctypes_job:
             self.exception_mapper.check_last_error_code()
         py_job = Job(ctypes_job)
-        self.logger.debug('Got job {}'.format(py_job))
+        self.logger.debug('Got job %s', py_job)
         drmaa2_lib.drmaa2_j_free(pointer(ctypes_job))
         return py_job
 
+    def run_jobs(self, templates, auth=None, max_workers=None):
+        """ 
+        Run multiple jobs. Jobs are submitted as the returned generator is 
+        consumed, and Job objects are yielded in the order of the input templates.
+        Template dictionaries are written into a single native job template,
+        updating only the fields that differ from the previous dictionary.
+
+        :param templates: Iterable of job templates; each can be specified either as a dictionary, or directly as a JobTemplate object.
+        :type templates: iterable
+
+        :param auth: Optional sudo object for running the jobs; it can be specified either as a dictionary, or as a Sudo object directly.
+        :type auth: Sudo or dict
+
+        :param max_workers: If greater than 1, jobs are submitted from a thread pool of this size, with at most 2*max_workers submissions in flight; in this case only consecutive equal template dictionaries share a native job template.
+        :type max_workers: int
+
+        :returns: Generator of Job objects.
+
+        :raises Exception: If a submission fails when max_workers is greater than 1, the raised exception has a submitted_jobs attribute listing the jobs submitted by other in-flight submissions that were not yielded.
+
+        >>> templates = [{'remote_command' : '/bin/sleep', 'args' : [str(i)]} for i in range(3)]
+        >>> for j in j_session.run_jobs(templates, max_workers=2):
+        ...     print(j.id)
+        531
+        532
+        533
+        """
+        if auth:
+            auth = Sudo.create_from_dict(auth)
+            self.logger.debug('Using sudo object: %s', auth)
+        if max_workers is not None and max_workers > 1:
+            return self.__run_jobs_in_pool(templates, auth, max_workers)
+        return self.__run_jobs(templates, auth)
+
+    def __iter_job_templates(self, templates, reuse_template):
+        # With reuse_template, a single native template is updated in place
+        # for each dictionary, which writes only modified fields. Otherwise,
+        # consecutive equal dictionaries share a template; a copy of the last
+        # dictionary is kept, since the caller may modify it between submissions.
+        last_template_dict = None
+        template = None
+        for t in templates:
+            if isinstance(t, JobTemplate):
+                yield t
+                continue
+            if template is None or (not reuse_template and t != last_template_dict):
+                template = JobTemplate.create_from_dict(t)
+            elif reuse_template:
+                changes = dict(t)
+                for key in last_template_dict:
+                    if key not in changes:
+                        changes[key] = None
+                template.update(**changes)
+            last_template_dict = set(t) if reuse_template else copy.deepcopy(t)
+            yield template
+
+    def __run_jobs(self, templates, auth):
+        for template in self.__iter_job_templates(templates, reuse_template=True):
+            yield self.__run_job(template, auth)
+
+    def __run_jobs_in_pool(self, templates, auth, max_workers):
+        from concurrent.futures import ThreadPoolExecutor
+        self.logger.debug('Running jobs using %s worker threads', max_workers)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = deque()
+        try:
+            for template in self.__iter_job_templates(templates, reuse_template=False):
+                futures.append(executor.submit(self.__run_job, template, auth))
+                if len(futures) >= 2 * max_workers:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+        except Exception as ex:
+            # Submissions still in flight may have succeeded; wait for them,
+            # so that the caller can still wait for or terminate those jobs.
+            for f in futures:
+                f.cancel()
+            executor.shutdown(wait=True)
+            ex.submitted_jobs = [f.result() for f in futures if not f.cancelled() and f.exception() is None]
+            self.logger.debug('Submission failed, %s in-flight jobs were submitted', len(ex.submitted_jobs))
+            raise
+        finally:
+            for f in futures:
+                f.cancel()
+            executor.shutdown(wait=True)
+
     def run_bulk_jobs(self, template, begin_index, end_index, step, max_parallel, auth=None):
         """ 
         Run an array job using template. 
@@ -303,15 +456,16 @@ class JobSession(Drmaa2Object):
         >>> type(ja)
         <class 'drmaa2.job_array.JobArray'>
         """
-        self.logger.debug(
-            'Running an array job with task indices ({},{},{}), max. parallel {}, and using template: {}'.format(
-                begin_index, end_index, step, max_parallel, template))
+        self.logger.debug('Running an array job with task indices (%s,%s,%s), max. parallel %s, and using template: %s',
+                          begin_index, end_index, step, max_parallel, template)
         drmaa2_lib = self.get_drmaa2_library()
         template = JobTemplate.create_from_dict(template)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
 
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ctypes_job_array = drmaa2_lib.drmaa2_jsession_run_bulk_jobs_as(auth._struct, self._struct, template._struct,
                                                                            begin_index, end_index, step, max_parallel)
         else:
@@ -320,7 +474,7 @@ class JobSession(Drmaa2Object):
         if not ctypes_job_array:
             self.exception_mapper.check_last_error_code()
         py_job_array = JobArray(ctypes_job_array)
-        self.logger.debug('Got job array {}'.format(py_job_array))
+        self.logger.debug('Got job array %s', py_job_array)
         return py_job_array
 
     def wait_any_started(self, job_list, timeout=Time.INFINITE_TIME):
@@ -328,7 +482,7 @@ class JobSession(Drmaa2Object):
         Wait for start of any job from the given list . 
 
         :param job_list: Job list.
-        :type job_list: [Job]
+        :type job_list: [Job or JobRef]
 
         :param timeout: Wait timeout in seconds (default: infinite time).
         :type timeout: int
@@ -342,14 +496,15 @@ class JobSession(Drmaa2Object):
         >>> print(j)
         {'id': '542.1', 'session_name': 'js-01'}
         """
-        self.logger.debug('Waiting for any one of {} jobs to start'.format(len(job_list)))
+        self.logger.debug('Waiting for any one of %s jobs to start', len(job_list))
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_job_list = Job.to_ctypes_job_list(job_list)
+        native_jobs = []
+        ctypes_job_list = Job.to_ctypes_job_list(job_list, native_jobs)
         ctypes_job = drmaa2_lib.drmaa2_jsession_wait_any_started(self._struct, ctypes_job_list, int(timeout))
         if not ctypes_job:
             self.exception_mapper.check_last_error_code()
         py_job = Job(ctypes_job)
-        self.logger.debug('Job {} started'.format(py_job))
+        self.logger.debug('Job %s started', py_job)
         drmaa2_lib.drmaa2_j_free(pointer(ctypes_job))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
         return py_job
@@ -359,7 +514,7 @@ class JobSession(Drmaa2Object):
         Wait for termination of any job from the given list . 
 
         :param job_list: Job list.
-        :type job_list: [Job]
+        :type job_list: [Job or JobRef]
 
         :param timeout: Wait timeout in seconds (default: infinite time).
         :type timeout: int
@@ -373,24 +528,103 @@ class JobSession(Drmaa2Object):
         >>> print(j)
         {'id': '542.1', 'session_name': 'js-01'}
         """
-        self.logger.debug('Waiting for any one of {} jobs to terminate'.format(len(job_list)))
+        self.logger.debug('Waiting for any one of %s jobs to terminate', len(job_list))
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_job_list = Job.to_ctypes_job_list(job_list)
+        native_jobs = []
+        ctypes_job_list = Job.to_ctypes_job_list(job_list, native_jobs)
         ctypes_job = drmaa2_lib.drmaa2_jsession_wait_any_terminated(self._struct, ctypes_job_list, int(timeout))
         if not ctypes_job:
             self.exception_mapper.check_last_error_code()
         py_job = Job(ctypes_job)
-        self.logger.debug('Job {} terminated'.format(py_job))
+        self.logger.debug('Job %s terminated', py_job)
         drmaa2_lib.drmaa2_j_free(pointer(ctypes_job))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
         return py_job
 
+    def iter_terminated(self, job_list, timeout=Time.INFINITE_TIME):
+        """ 
+        Iterate over jobs from the given list as they terminate. A single
+        native job list is used for all waits, and terminated jobs are removed
+        from it in place; this relies on uge_drmaa2_list_set(), which is
+        specific to Univa/Altair Grid Engine.
+
+        :param job_list: Job list.
+        :type job_list: [Job or JobRef]
+
+        :param timeout: Overall wait timeout in seconds (default: infinite time); if it expires, TimeoutError is raised.
+        :type timeout: int
+
+        :returns: Generator of terminated Job objects from the given list.
+
+        >>> ja = j_session.run_bulk_jobs({'remote_command' : '/bin/sleep', 'args' : ['10']}, 1, 10, 3, 2)
+        >>> for j in j_session.iter_terminated(ja.job_list):
+        ...     print(j.id)
+        542.1
+        542.4
+        542.7
+        542.10
+        """
+        # Python job list mirrors the order of the native list;
+        # duplicate jobs are skipped.
+        indices = {}
+        unique_job_list = []
+        for j in job_list:
+            if j.id not in indices:
+                indices[j.id] = len(unique_job_list)
+                unique_job_list.append(j)
+        job_list = unique_job_list
+        self.logger.debug('Iterating over %s jobs as they terminate', len(job_list))
+        if not job_list:
+            return
+        drmaa2_lib = self.get_drmaa2_library()
+        deadline = None
+        if timeout != Time.INFINITE_TIME and timeout >= 0:
+            deadline = get_time() + int(timeout)
+        native_jobs = []
+        ctypes_job_list = Job.to_ctypes_job_list(job_list, native_jobs)
+        try:
+            while job_list:
+                if deadline is not None:
+                    # The remainder is rounded up, so that the wait does not time out early.
+                    timeout = max(int(math.ceil(deadline - get_time())), 0)
+                ctypes_job = drmaa2_lib.drmaa2_jsession_wait_any_terminated(self._struct, ctypes_job_list,
+                                                                            int(timeout))
+                if not ctypes_job:
+                    self.exception_mapper.check_last_error_code()
+                job_id = decode_string(ctypes_job.contents.id.value)
+                drmaa2_lib.drmaa2_j_free(pointer(ctypes_job))
+                i = indices.pop(job_id, None)
+                if i is None:
+                    raise InternalError('Terminated job %s is not in the job list' % job_id)
+                py_job = job_list[i]
+                self.__remove_job(ctypes_job_list, job_list, native_jobs, indices, i)
+                self.logger.debug('Job %s terminated, %s remaining', job_id, len(job_list))
+                yield py_job
+        finally:
+            drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
+
+    def __remove_job(self, ctypes_job_list, job_list, native_jobs, indices, i):
+        # Move the last job into the vacated slot, so that removal
+        # does not shift the remaining entries.
+        drmaa2_lib = self.get_drmaa2_library()
+        last = len(job_list) - 1
+        if i != last:
+            last_job = job_list[last]
+            self.exception_mapper.check_status_code(
+                drmaa2_lib.uge_drmaa2_list_set(ctypes_job_list, i, native_jobs[last]._struct))
+            job_list[i] = last_job
+            native_jobs[i] = native_jobs[last]
+            indices[last_job.id] = i
+        self.exception_mapper.check_status_code(drmaa2_lib.drmaa2_list_del(ctypes_job_list, last))
+        job_list.pop()
+        native_jobs.pop()
+
     def wait_all_started(self, job_list, timeout=Time.INFINITE_TIME):
         """ 
         Wait for start of all jobs from the given list . 
 
         :param job_list: Job list.
-        :type job_list: [Job]
+        :type job_list: [Job or JobRef]
 
         :param timeout: Wait timeout in seconds (default: infinite time).
         :type timeout: int
@@ -404,14 +638,15 @@ class JobSession(Drmaa2Object):
         >>> print(jl)
         [Job({'id': '542.1', 'session_name': 'js-01'}), Job({'id': '542.4', 'session_name': 'js-01'}), Job({'id': '542.7', 'session_name': 'js-01'}), Job({'id': '542.10', 'session_name': 'js-01'})]
         """
-        self.logger.debug('Waiting for all of {} jobs to start'.format(len(job_list)))
+        self.logger.debug('Waiting for all of %s jobs to start', len(job_list))
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_job_list = Job.to_ctypes_job_list(job_list)
+        native_jobs = []
+        ctypes_job_list = Job.to_ctypes_job_list(job_list, native_jobs)
         ctypes_job_list2 = drmaa2_lib.drmaa2_jsession_wait_all_started(self._struct, ctypes_job_list, int(timeout))
         if not ctypes_job_list2:
             self.exception_mapper.check_last_error_code()
         py_job_list = Job.to_py_job_list(ctypes_job_list2)
-        self.logger.debug('All {} jobs started'.format(len(job_list)))
+        self.logger.debug('All %s jobs started', len(job_list))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list2)))
         return py_job_list
@@ -421,7 +656,7 @@ class JobSession(Drmaa2Object):
         Wait for termination of all jobs from the given list . 
 
         :param job_list: Job list.
-        :type job_list: [Job]
+        :type job_list: [Job or JobRef]
 
         :param timeout: Wait timeout in seconds (default: infinite time).
         :type timeout: int
@@ -435,14 +670,15 @@ class JobSession(Drmaa2Object):
         >>> print(jl)
         [Job({'id': '542.1', 'session_name': 'js-01'}), Job({'id': '542.4', 'session_name': 'js-01'}), Job({'id': '542.7', 'session_name': 'js-01'}), Job({'id': '542.10', 'session_name': 'js-01'})]
         """
-        self.logger.debug('Waiting for all of {} jobs to terminate'.format(len(job_list)))
+        self.logger.debug('Waiting for all of %s jobs to terminate', len(job_list))
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_job_list = Job.to_ctypes_job_list(job_list)
+        native_jobs = []
+        ctypes_job_list = Job.to_ctypes_job_list(job_list, native_jobs)
         ctypes_job_list2 = drmaa2_lib.drmaa2_jsession_wait_all_terminated(self._struct, ctypes_job_list, int(timeout))
         if not ctypes_job_list2:
             self.exception_mapper.check_last_error_code()
         py_job_list = Job.to_py_job_list(ctypes_job_list2)
-        self.logger.debug('All {} jobs terminated'.format(len(job_list)))
+        self.logger.debug('All %s jobs terminated', len(job_list))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list2)))
         return py_job_list
@@ -458,13 +694,13 @@ class JobSession(Drmaa2Object):
 
         >>> ja = j_session.get_job_array(ja_id)
         """
-        self.logger.debug('Retrieving job array id {}'.format(id))
+        self.logger.debug('Retrieving job array id %s', id)
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_job_array = drmaa2_lib.drmaa2_jsession_get_job_array(self._struct, ByteString(id).encode())
+        ctypes_job_array = drmaa2_lib.drmaa2_jsession_get_job_array(self._struct, encode_string(id))
         if not ctypes_job_array:
             self.exception_mapper.check_last_error_code()
         py_job_array = JobArray(ctypes_job_array)
-        self.logger.debug('Got job array {}'.format(py_job_array))
+        self.logger.debug('Got job array %s', py_job_array)
         return py_job_array
 
     def get_job_categories(self):
@@ -480,19 +716,23 @@ class JobSession(Drmaa2Object):
         drmaa2_lib = self.get_drmaa2_library()
         return Drmaa2Object.to_py_string_list(drmaa2_lib.drmaa2_jsession_get_job_categories(self._struct))
 
-    def get_jobs(self, filter):
+    def get_jobs(self, filter, as_refs=False):
         """ 
         Get jobs matching the specified info.
 
         :param filter: Job info filter.
         :type filter: JobInfo
 
-        :returns: List of Job objects.
+        :param as_refs: If true, return compact JobRef handles instead of Job objects.
+        :type as_refs: bool
+
+        :returns: List of Job or JobRef objects.
 
         >>> j_info = JobInfo({'job_name' : 'a_job'})
         >>> j_list = j_session.get_all_jobs(j_info)
+        >>> j_refs = j_session.get_jobs(None, as_refs=True)
         """
-        self.logger.debug('Requesting list of jobs using filter: {}'.format(filter))
+        self.logger.debug('Requesting list of jobs using filter: %s', filter)
         drmaa2_lib = self.get_drmaa2_library()
         job_info = filter
         if type(filter) == PY_DICT_TYPE:
@@ -508,6 +748,10 @@ class JobSession(Drmaa2Object):
 
         py_job_list = []
         if ctypes_job_list:
-            py_job_list = Job.to_py_job_list(ctypes_job_list)
+            py_job_list = Job.to_py_job_list(ctypes_job_list, as_refs)
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
         return py_job_list
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=JobSession.reopen_after_fork)
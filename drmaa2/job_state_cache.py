@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import time
+import threading
+from collections import OrderedDict
+
+from .drmaa2_constants import Event
+from .drmaa2_constants import JobState
+from .notification import Notification
+from .log_manager import LogManager
+
+# Use monotonic clock where available, so that entry age is not
+# affected by system clock adjustments.
+get_time = getattr(time, 'monotonic', time.time)
+
+
+class JobStateCache(object):
+    """
+    Job state cache fed by DRMAA2 event notifications. NEW_STATE events
+    update cached job states, while MIGRATED and ATTRIBUTE_CHANGE events
+    invalidate them. Job states are queried from the library only
+    for jobs that are not cached, or whose entries are older than the
+    maximum age. Final states (DONE and FAILED) never become stale.
+    The number of entries is bounded; when the bound is exceeded, entries
+    that were least recently updated are evicted first.
+    """
+
+    FINAL_STATES = (JobState.DONE, JobState.FAILED)
+
+    logger = LogManager.get_instance().get_logger('JobStateCache')
+
+    def __init__(self, max_age=60.0, max_entries=100000):
+        """
+        Constructor.
+
+        :param max_age: Maximum age of cached states in seconds; if None, entries do not expire.
+        :type max_age: float
+
+        :param max_entries: Maximum number of cached states; if None, the number of entries is not bounded.
+        :type max_entries: int
+
+        >>> state_cache = JobStateCache(max_age=30, max_entries=10000)
+        >>> state_cache.register()
+        """
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # Entries are kept in order of their last update.
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'notifications': 0, 'evictions': 0}
+        self.__listeners = []
+
+    def register(self):
+        """
+        Register the cache for event notifications. Note that this replaces
+        any previously registered notification callback.
+
+        >>> state_cache.register()
+        """
+        Notification.register_event_notification(self.on_notification)
+
+    def unregister(self):
+        """
+        Unregister the cache from event notifications.
+
+        >>> state_cache.unregister()
+        """
+        Notification.unregister_event_notification()
+
+    def on_notification(self, notification):
+        """
+        Process event notification.
+
+        :param notification: Event notification.
+        :type notification: Notification
+        """
+        job_id = notification.job_id
+        event = notification.event
+        self.logger.debug('Got event %s for job id %s', event, job_id)
+        state = None
+        with self.__lock:
+            self.__stats['notifications'] += 1
+            if event == Event.NEW_STATE.name and notification.job_state is not None:
+                state = JobState[notification.job_state]
+                self.__set_entry(job_id, (state, None, get_time()))
+            elif event in (Event.MIGRATED.name, Event.ATTRIBUTE_CHANGE.name):
+                self.__entries.pop(job_id, None)
+            listeners = list(self.__listeners)
+        if state is not None:
+            for listener in listeners:
+                listener(job_id, state)
+
+    def add_listener(self, listener):
+        """
+        Add listener for job state changes received via notifications. Listeners
+        are called from the notification thread, and must not block.
+
+        :param listener: Function called with job id and new JobState.
+        :type listener: callable
+
+        >>> state_cache.add_listener(lambda job_id, state: print(job_id, state))
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Remove job state change listener.
+
+        :param listener: Previously added listener.
+        :type listener: callable
+        """
+        with self.__lock:
+            if listener in self.__listeners:
+                self.__listeners.remove(listener)
+
+    def get_state(self, job):
+        """
+        Get job state, from the cache if possible.
+
+        :param job: Job object.
+        :type job: Job
+
+        :returns: (JobState object, sub-state string) tuple; sub-state is None for states received via notifications.
+
+        >>> j = j_session.run_job({'remote_command' : '/bin/sleep', 'args' : ['100']})
+        >>> state,substate = state_cache.get_state(j)
+        """
+        job_id = job.id
+        with self.__lock:
+            entry = self.__entries.get(job_id)
+            if entry is not None and not self.__is_stale(entry):
+                self.__stats['hits'] += 1
+                return entry[:2]
+            self.__stats['misses'] += 1
+        (state, sub_state) = job.get_state()
+        with self.__lock:
+            # Do not overwrite state received meanwhile via notification.
+            if self.__entries.get(job_id) is entry:
+                self.__set_entry(job_id, (state, sub_state, get_time()))
+        return (state, sub_state)
+
+    def invalidate(self, job=None):
+        """
+        Remove cached state.
+
+        :param job: Job object; if not provided, all cached states are removed.
+        :type job: Job
+        """
+        with self.__lock:
+            if job is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(job.id, None)
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        :returns: Dictionary with the number of hits, misses, processed notifications, evicted and cached entries.
+
+        >>> print(state_cache.get_stats())
+        {'hits': 120, 'misses': 3, 'notifications': 9, 'evictions': 0, 'entries': 3}
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entries)
+        return stats
+
+    def __set_entry(self, job_id, entry):
+        # Must be called with the lock held.
+        self.__entries.pop(job_id, None)
+        self.__entries[job_id] = entry
+        if self.max_entries is not None:
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.__stats['evictions'] += 1
+
+    def __is_stale(self, entry):
+        (state, _, timestamp) = entry
+        if self.max_age is None or state in self.FINAL_STATES:
+            return False
+        return get_time() - timestamp > self.max_age
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    state_cache = JobStateCache()
+    print(state_cache.get_stats())
@@ -125,6 +125,22 @@ class JobTemplate(Drmaa2Object):
         else:
             raise InvalidArgument('Invalid argument: %s' % str(template))
 
+    def update(self, **changes):
+        """
+        Update template fields. Native fields are written only for values that
+        differ from the ones last written, and for list and dictionary fields
+        only the modified entries are written.
+
+        :param changes: Field values, keyed by field name.
+        :type changes: dict
+
+        >>> jt = JobTemplate({'remote_command' : '/bin/sleep', 'args' : ['100'], 'job_environment' : env})
+        >>> jt.update(args=['200'], job_name='sleep-200')
+        >>> print(jt.args)
+        ['200']
+        """
+        self.from_dict(changes)
+
     def __del__(self):
         setattr(self._struct.contents, 'remoteCommand', drmaa2_string())
         setattr(self._struct.contents, 'workingDirectory', drmaa2_string())
@@ -20,69 +20,304 @@
 
 import os
 import glob
+import json
+import time
 import platform
+import tempfile
+import threading
 import ctypes
-import ctypes.util
-from ctypes import c_char_p
-from ctypes import c_void_p
-from ctypes import c_long
-from ctypes import c_longlong
-from ctypes import POINTER
 from ctypes import pointer
 
-from .drmaa2_ctypes import drmaa2_error
-from .drmaa2_ctypes import drmaa2_bool
-from .drmaa2_ctypes import drmaa2_capability
-
-from .drmaa2_ctypes import drmaa2_string
-from .drmaa2_ctypes import drmaa2_string_list
-from .drmaa2_ctypes import drmaa2_list
-from .drmaa2_ctypes import drmaa2_listtype
-from .drmaa2_ctypes import drmaa2_list_entryfree
-from .drmaa2_ctypes import drmaa2_dict
-from .drmaa2_ctypes import drmaa2_dict_entryfree
-
-from .drmaa2_ctypes import drmaa2_j
-from .drmaa2_ctypes import drmaa2_j_list
-from .drmaa2_ctypes import drmaa2_jarray
-from .drmaa2_ctypes import drmaa2_jinfo
-from .drmaa2_ctypes import drmaa2_jtemplate
-from .drmaa2_ctypes import drmaa2_jstate
-
-from .drmaa2_ctypes import drmaa2_r
-from .drmaa2_ctypes import drmaa2_r_list
-from .drmaa2_ctypes import drmaa2_rinfo
-from .drmaa2_ctypes import drmaa2_rtemplate
-
-from .drmaa2_ctypes import drmaa2_slotinfo
-from .drmaa2_ctypes import drmaa2_queueinfo
-from .drmaa2_ctypes import drmaa2_queueinfo_list
-
-from .drmaa2_ctypes import drmaa2_machineinfo
-from .drmaa2_ctypes import drmaa2_machineinfo_list
-
-from .drmaa2_ctypes import drmaa2_jsession
-from .drmaa2_ctypes import drmaa2_rsession
-from .drmaa2_ctypes import drmaa2_msession
-
-from .drmaa2_ctypes import drmaa2_sudo
-from .drmaa2_ctypes import drmaa2_notification
-from .drmaa2_ctypes import drmaa2_version
-from .drmaa2_ctypes import drmaa2_time
-from .drmaa2_ctypes import drmaa2_callback
-
-from .byte_string import ByteString
+from .drmaa2_prototypes import DRMAA2_PROTOTYPES
+from .drmaa2_prototypes import DRMAA2_DRM_FUNCTIONS
+from .drmaa2_prototypes import DRMAA2_STATUS_FUNCTIONS
+from .drmaa2_prototypes import DRMAA2_WAIT_FUNCTIONS
+
+from .byte_string import decode_string
+from .call_stats import CallStats
 from .log_manager import LogManager
 from .singleton import Singleton
 from .drmaa2_exceptions import Drmaa2Exception
 
+get_time = getattr(time, 'perf_counter', time.time)
+# Atomic on all platforms where available; os.rename does not replace
+# an existing file on Windows.
+replace_file = getattr(os, 'replace', os.rename)
+
+
+class Drmaa2Library(object):
+    """
+    Proxy for the loaded DRMAA2 C library. Result and argument types
+    for a library function are assigned from the prototype table only
+    when that function is accessed for the first time; the typed function
+    is then cached on the proxy, so subsequent accesses bypass the lookup.
+
+    The proxy is safe to use from multiple threads. Functions that
+    communicate with the DRM are dispatched through a wrapper which, when
+    a call fails, immediately reads the library last error code and message
+    together under a per-library lock, and keeps them for the calling thread.
+    An error raised for a failed call is therefore never paired with the
+    error of a call made concurrently in another thread. If a retry policy
+    is set, such functions, except for the timed waits, are also retried when
+    they fail with a retryable error (see RetryPolicy). As with all ctypes.CDLL functions, the GIL is
+    released for the duration of each call.
+
+    With instrumentation enabled, every bound function is wrapped to record
+    its call count, latency and error codes (see CallStats). When it is
+    disabled, the typed library functions themselves are bound again.
+    """
+
+    # Value returned by drmaa2_j_get_state() on failure (JobState.UNSET_JSTATE).
+    UNSET_JSTATE = -1
+
+    def __init__(self, cdll, prototypes=DRMAA2_PROTOTYPES, drm_functions=DRMAA2_DRM_FUNCTIONS, retry_policy=None):
+        """
+        Constructor.
+
+        :param cdll: Loaded C library.
+        :type cdll: ctypes.CDLL
+
+        :param prototypes: Dictionary of function name to (restype, argtypes) tuple.
+        :type prototypes: dict
+
+        :param drm_functions: Names of functions whose failures are paired with the library last error.
+        :type drm_functions: set
+
+        :param retry_policy: Optional retry policy for functions that communicate with the DRM.
+        :type retry_policy: RetryPolicy
+        """
+        self._cdll = cdll
+        self._prototypes = prototypes
+        self._drm_functions = drm_functions
+        self._retry_policy = retry_policy
+        self._call_stats = None
+        self._error_lock = threading.Lock()
+        self._thread_errors = threading.local()
+
+    def __getattr__(self, name):
+        # Called only for functions that have not been bound yet.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self.bind(name)
+
+    def bind(self, name):
+        """
+        Look up library function, assign its prototype and cache it.
+
+        :param name: Function name.
+        :type name: str
+
+        :returns: Typed ctypes function.
+        """
+        function = getattr(self._cdll, name)
+        prototype = self._prototypes.get(name)
+        if prototype is not None:
+            (function.restype, function.argtypes) = prototype
+        if name in self._drm_functions:
+            function = self.__dispatch(name, function)
+        if self._call_stats is not None:
+            function = self.__instrument(name, function)
+        self.__dict__[name] = function
+        return function
+
+    def __instrument(self, name, function):
+        call_stats = self._call_stats.get(name)
+        if call_stats is None:
+            call_stats = self._call_stats.setdefault(name, CallStats(name))
+        record = call_stats.record
+        thread_errors = self._thread_errors
+        is_drm_function = name in self._drm_functions
+
+        def instrumented(*args):
+            start_time = get_time()
+            try:
+                return function(*args)
+            finally:
+                error_code = None
+                if is_drm_function:
+                    last_error = getattr(thread_errors, 'last_error', None)
+                    if last_error is not None:
+                        error_code = last_error[0]
+                record(get_time() - start_time, error_code)
+
+        instrumented.__name__ = name
+        instrumented.__wrapped__ = function
+        return instrumented
+
+    def __dispatch(self, name, function):
+        thread_errors = self._thread_errors
+        read_last_error = self.read_last_error
+        if name in DRMAA2_STATUS_FUNCTIONS:
+            failed = lambda result: result != 0
+        elif name == 'drmaa2_j_get_state':
+            failed = lambda result: result == self.UNSET_JSTATE
+        else:
+            failed = lambda result: not result
+
+        def dispatch(*args):
+            result = function(*args)
+            if failed(result):
+                thread_errors.last_error = read_last_error()
+            else:
+                thread_errors.last_error = None
+            return result
+
+        retry_policy = self._retry_policy
+        if retry_policy is not None and name not in DRMAA2_WAIT_FUNCTIONS:
+            is_status_function = name in DRMAA2_STATUS_FUNCTIONS
+
+            def get_code(result):
+                if not failed(result):
+                    thread_errors.last_error = None
+                    return 0
+                last_error = read_last_error()
+                thread_errors.last_error = last_error
+                if is_status_function:
+                    return result
+                return last_error[0]
+
+            def dispatch(*args):
+                return retry_policy.call(name, function, args, get_code)
+
+        dispatch.__name__ = name
+        dispatch.__wrapped__ = function
+        return dispatch
+
+    def read_last_error(self):
+        """
+        Read the library last error code and message together.
+
+        :returns: (error code, error message) tuple.
+        """
+        with self._error_lock:
+            code = self.drmaa2_lasterror()
+            string_ptr = self.drmaa2_lasterror_text()
+            message = ''
+            if string_ptr:
+                message = decode_string(string_ptr.value)
+                self.drmaa2_string_free(string_ptr)
+        return (code, message)
+
+    def get_last_error(self):
+        """
+        Get the last error for the calling thread. If the most recent DRM
+        function call made by this thread failed, this is the error read
+        right after that call (and it is returned only once); otherwise,
+        the library last error is read.
+
+        :returns: (error code, error message) tuple.
+        """
+        last_error = getattr(self._thread_errors, 'last_error', None)
+        if last_error is not None:
+            self._thread_errors.last_error = None
+            return last_error
+        return self.read_last_error()
+
+    def set_retry_policy(self, retry_policy):
+        """
+        Set retry policy for functions that communicate with the DRM.
+
+        :param retry_policy: Retry policy, or None to disable retries.
+        :type retry_policy: RetryPolicy
+
+        >>> drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
+        >>> drmaa2_lib.set_retry_policy(RetryPolicy(max_attempts=3))
+        """
+        self._retry_policy = retry_policy
+        self.reset()
+
+    def get_retry_policy(self):
+        """
+        Get retry policy.
+
+        :returns: Retry policy, or None if failed calls are not retried.
+        """
+        return self._retry_policy
+
+    def enable_instrumentation(self):
+        """
+        Start recording call statistics for library functions.
+
+        >>> drmaa2_lib.enable_instrumentation()
+        """
+        if self._call_stats is None:
+            self._call_stats = {}
+            self.reset()
+
+    def disable_instrumentation(self):
+        """
+        Stop recording call statistics; library functions are bound
+        again without instrumentation wrappers. Recorded statistics are dropped.
+
+        >>> drmaa2_lib.disable_instrumentation()
+        """
+        if self._call_stats is not None:
+            self._call_stats = None
+            self.reset()
+
+    def is_instrumentation_enabled(self):
+        """
+        Check whether call statistics are recorded.
+
+        :returns: True if instrumentation is enabled, false otherwise.
+        """
+        return self._call_stats is not None
+
+    def get_stats(self):
+        """
+        Get call statistics for library functions called since
+        instrumentation was enabled or statistics were reset.
+
+        :returns: Dictionary of function name to statistics dictionary (see CallStats.to_dict()); empty if instrumentation is disabled.
+
+        >>> print(drmaa2_lib.get_stats()['drmaa2_jsession_run_job']['count'])
+        100
+        """
+        call_stats = self._call_stats or {}
+        return dict([(name, stats.to_dict()) for (name, stats) in list(call_stats.items()) if stats.count])
+
+    def reset_stats(self):
+        """
+        Reset call statistics.
+
+        >>> drmaa2_lib.reset_stats()
+        """
+        if self._call_stats is not None:
+            self._call_stats = {}
+            self.reset()
+
+    def reset(self):
+        """
+        Drop functions bound so far, so that they are bound again,
+        with current settings, on next access.
+        """
+        for name in self.get_bound_names():
+            del self.__dict__[name]
+
+    def get_bound_names(self):
+        """
+        Get names of library functions bound so far.
+
+        :returns: List of function names.
+        """
+        return sorted([name for name in self.__dict__ if not name.startswith('_')])
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, self._cdll)
+
 
 class LibraryManager(Singleton):
     """ 
     Singleton class for loading and keeping reference to the
-    underlying C library.
+    underlying C library. The library location can be set explicitly
+    via the DRMAA2_LIBRARY_PATH environment variable; otherwise, it is
+    found under $SGE_ROOT (see find_drmaa2_library_path()).
     """
 
+    LIBRARY_PATH_ENV_VAR = 'DRMAA2_LIBRARY_PATH'
+    LIBRARY_PATH_CACHE_ENV_VAR = 'DRMAA2_LIBRARY_PATH_CACHE'
+    DEFAULT_LIBRARY_NAME = 'libdrmaa2.so'
+
     logger = LogManager.get_instance().get_logger('LibraryManager')
 
     __instance = None
@@ -98,6 +333,61 @@ class LibraryManager(Singleton):
         LibraryManager.__instance = self
         self.drmaa2_library = self.__load_drmaa2_library()
 
+    @classmethod
+    def reset(cls):
+        """
+        Drop the library manager instance and its library proxy, so that
+        the library is set up anew on next access. This is called automatically
+        in child processes created with os.fork(), as library locks and
+        per-thread error state inherited from the parent are not valid there.
+
+        >>> LibraryManager.reset()
+        """
+        cls.logger.debug('Resetting library manager')
+        LibraryManager.__instance = None
+        cls.reset_instance()
+
+    @classmethod
+    def enable_instrumentation(cls):
+        """
+        Start recording call statistics for DRMAA2 library functions.
+
+        >>> LibraryManager.enable_instrumentation()
+        """
+        LibraryManager.get_instance().get_drmaa2_library().enable_instrumentation()
+
+    @classmethod
+    def disable_instrumentation(cls):
+        """
+        Stop recording call statistics for DRMAA2 library functions.
+
+        >>> LibraryManager.disable_instrumentation()
+        """
+        LibraryManager.get_instance().get_drmaa2_library().disable_instrumentation()
+
+    @classmethod
+    def get_stats(cls):
+        """
+        Get call statistics for DRMAA2 library functions.
+
+        :returns: Dictionary of function name to statistics dictionary, with call count, total, mean, minimum and maximum latency, latency percentiles, error code counts and latency histogram.
+
+        >>> LibraryManager.enable_instrumentation()
+        >>> ...
+        >>> print(LibraryManager.get_stats()['drmaa2_jsession_run_job'])
+        {'count': 2, 'total_time': 0.0123, 'mean_time': 0.00615, 'min_time': 0.0052, 'max_time': 0.0071, 'error_codes': {}, 'histogram': [(0.008192, 2)], 'p50': 0.008192, 'p90': 0.008192, 'p99': 0.008192}
+        """
+        return LibraryManager.get_instance().get_drmaa2_library().get_stats()
+
+    @classmethod
+    def reset_stats(cls):
+        """
+        Reset call statistics for DRMAA2 library functions.
+
+        >>> LibraryManager.reset_stats()
+        """
+        LibraryManager.get_instance().get_drmaa2_library().reset_stats()
+
     def get_drmaa2_library(self):
         """
         Get reference to the DRMAA2 C library.
@@ -107,7 +397,7 @@ class LibraryManager(Singleton):
         return self.drmaa2_library
 
     def to_py_string(self, ctypes_string):
-        py_string = ByteString(ctypes_string.value).decode()
+        py_string = decode_string(ctypes_string.value)
         self.drmaa2_library.drmaa2_string_free(pointer(ctypes_string))
         return py_string
 
@@ -154,336 +444,135 @@ class LibraryManager(Singleton):
         return lm.get_drmaa2_library().drmaa2_supports(int(c)) > 0;
 
     @classmethod
-    def __load_drmaa2_library(cls):
-        cls.logger.debug('Loading DRMAA2 library')
-        libc_name = ctypes.util.find_library('c')
-        libc = ctypes.CDLL(libc_name)
-        libc.memcmp.argtypes = (ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)
-        lib_path = 'libdrmaa2.so'
-        drmaa2_lib = None
+    def find_drmaa2_library_path(cls):
+        """
+        Find the DRMAA2 library. The DRMAA2_LIBRARY_PATH environment variable,
+        if set, takes precedence. Otherwise the library is looked up under
+        $SGE_ROOT/drmaa/lib/<arch>; since determining the architecture requires
+        running $SGE_ROOT/util/arch, the result is cached per host in the file
+        given by the DRMAA2_LIBRARY_PATH_CACHE environment variable (default:
+        ~/.cache/drmaa2/library_path.json). Cache entries are invalidated when
+        the modification time of the arch script changes.
+
+        :returns: DRMAA2 library path.
+
+        >>> print(LibraryManager.find_drmaa2_library_path())
+        /opt/uge/drmaa/lib/lx-amd64/libdrmaa2.so
+        """
+        lib_path = os.environ.get(cls.LIBRARY_PATH_ENV_VAR)
+        if lib_path:
+            cls.logger.debug('Using DRMAA2 library path from %s', cls.LIBRARY_PATH_ENV_VAR)
+            return lib_path
+        SGE_ROOT = os.environ.get('SGE_ROOT')
+        if not SGE_ROOT:
+            cls.logger.debug('SGE_ROOT is not defined')
+            return cls.DEFAULT_LIBRARY_NAME
+
+        arch_script = SGE_ROOT + '/util/arch'
+        try:
+            arch_mtime = os.stat(arch_script).st_mtime
+        except OSError:
+            arch_mtime = None
+        cache = cls.__read_library_path_cache()
+        entry = cache.get(platform.node(), {}).get(SGE_ROOT)
+        if entry and arch_mtime is not None and entry.get('arch_mtime') == arch_mtime:
+            lib_path = entry.get('library_path')
+            if lib_path and os.path.exists(lib_path):
+                cls.logger.debug('Found cached DRMAA2 library path for %s', SGE_ROOT)
+                return lib_path
+
+        lib_path = cls.__probe_drmaa2_library_path(SGE_ROOT)
+        if lib_path and arch_mtime is not None:
+            cache.setdefault(platform.node(), {})[SGE_ROOT] = {'arch_mtime': arch_mtime, 'library_path': lib_path}
+            cls.__write_library_path_cache(cache)
+        return lib_path or cls.DEFAULT_LIBRARY_NAME
+
+    @classmethod
+    def clear_library_path_cache(cls):
+        """
+        Remove the DRMAA2 library path cache file.
+
+        >>> LibraryManager.clear_library_path_cache()
+        """
+        try:
+            os.remove(cls.__get_library_path_cache_file())
+        except OSError:
+            pass
+
+    @classmethod
+    def __probe_drmaa2_library_path(cls, SGE_ROOT):
+        p = os.popen(SGE_ROOT + '/util/arch')
         try:
-            SGE_ROOT = os.environ['SGE_ROOT']
-            p = os.popen(SGE_ROOT + '/util/arch')
+            SGE_ARCH = p.read().rstrip()
+        finally:
+            p.close()
+        lib_dir = SGE_ROOT + '/drmaa/lib/' + SGE_ARCH
+        cls.logger.debug('Looking for DRMAA2 library under %s', lib_dir)
+        lib_paths = glob.glob(lib_dir + '/libdrmaa2.so')
+        if not lib_paths:
+            lib_paths = glob.glob(lib_dir + '/libdrmaa2.dylib')
+        if len(lib_paths):
+            return lib_paths[0]
+        cls.logger.warn('Could not find DRMAA2 library under %s', lib_dir)
+        return None
+
+    @classmethod
+    def __get_library_path_cache_file(cls):
+        return os.environ.get(cls.LIBRARY_PATH_CACHE_ENV_VAR) or os.path.join(
+            os.path.expanduser('~'), '.cache', 'drmaa2', 'library_path.json')
+
+    @classmethod
+    def __read_library_path_cache(cls):
+        cache_file = cls.__get_library_path_cache_file()
+        try:
+            with open(cache_file) as f:
+                cache = json.load(f)
+            if isinstance(cache, dict):
+                return cache
+        except (IOError, OSError, ValueError) as ex:
+            cls.logger.debug('Could not read DRMAA2 library path cache %s: %s', cache_file, ex)
+        return {}
+
+    @classmethod
+    def __write_library_path_cache(cls, cache):
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written cache.
+        cache_file = cls.__get_library_path_cache_file()
+        try:
+            cache_dir = os.path.dirname(cache_file)
+            if cache_dir and not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            (fd, tmp_file) = tempfile.mkstemp(dir=cache_dir or None, prefix='.library_path')
             try:
-                SGE_ARCH = p.read().rstrip()
-            finally:
-                p.close()
-            lib_dir = SGE_ROOT + '/drmaa/lib/' + SGE_ARCH
-            cls.logger.debug('Looking for DRMAA2 library under %s' % lib_dir)
-            lib_paths = glob.glob(lib_dir + '/libdrmaa2.so')
-            if not lib_paths:
-                lib_paths = glob.glob(lib_dir + '/libdrmaa2.dylib')
-            if len(lib_paths):
-                lib_path = lib_paths[0]
-            else:
-                cls.logger.warn('Could not find DRMAA2 library under %s' % lib_dir)
-        except KeyError:
-            cls.logger.debug('SGE_ROOT is not defined')
-        cls.logger.debug('Library path: %s' % lib_path)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(cache, f)
+                replace_file(tmp_file, cache_file)
+            except Exception:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+                raise
+        except (IOError, OSError, TypeError, ValueError) as ex:
+            cls.logger.debug('Could not write DRMAA2 library path cache %s: %s', cache_file, ex)
+
+    @classmethod
+    def __load_drmaa2_library(cls):
+        cls.logger.debug('Loading DRMAA2 library')
+        lib_path = cls.find_drmaa2_library_path()
+        cls.logger.debug('Library path: %s', lib_path)
 
         try:
             drmaa2_lib = ctypes.cdll.LoadLibrary(str(lib_path))
         except OSError:
             raise Drmaa2Exception('Could not load DRMAA2 library.')
 
-        cls.logger.debug("Initializing DRMAA2 library")
-
-        drmaa2_lib.drmaa2_string_free.restype = None
-        drmaa2_lib.drmaa2_string_free.argtypes = [POINTER(drmaa2_string)]
-
-        drmaa2_lib.drmaa2_list_create.restype = drmaa2_list
-        drmaa2_lib.drmaa2_list_create.argtypes = [drmaa2_listtype, drmaa2_list_entryfree]
-        drmaa2_lib.drmaa2_list_free.restype = None
-        drmaa2_lib.drmaa2_list_free.argtypes = [POINTER(drmaa2_list)]
-        drmaa2_lib.drmaa2_list_get.restype = c_void_p
-        drmaa2_lib.drmaa2_list_get.argtypes = [drmaa2_list, c_long]
-        drmaa2_lib.drmaa2_list_add.restype = drmaa2_error
-        drmaa2_lib.drmaa2_list_add.argtypes = [drmaa2_list, c_void_p]
-        drmaa2_lib.drmaa2_list_del.restype = drmaa2_error
-        drmaa2_lib.drmaa2_list_del.argtypes = [drmaa2_list, c_long]
-        drmaa2_lib.drmaa2_list_size.restype = c_long
-        drmaa2_lib.drmaa2_list_size.argtypes = [drmaa2_list]
-
-        drmaa2_lib.drmaa2_lasterror.restype = drmaa2_error
-        drmaa2_lib.drmaa2_lasterror.argtypes = []
-        drmaa2_lib.drmaa2_lasterror_text.restype = drmaa2_string
-        drmaa2_lib.drmaa2_lasterror_text.argtypes = []
-
-        # UGE-specific
-        drmaa2_lib.uge_drmaa2_list_free_root.restype = None
-        drmaa2_lib.uge_drmaa2_list_free_root.argtypes = [POINTER(drmaa2_list)]
-        drmaa2_lib.uge_drmaa2_list_set.restype = drmaa2_error
-        drmaa2_lib.uge_drmaa2_list_set.argtypes = [drmaa2_list, c_long, c_void_p]
-
-        drmaa2_lib.uge_vi_impl_spec_get.restype = drmaa2_dict
-        drmaa2_lib.uge_vi_impl_spec_get.argtypes = [POINTER(drmaa2_version)]
-
-        drmaa2_lib.drmaa2_dict_create.restype = drmaa2_dict
-        drmaa2_lib.drmaa2_dict_create.argtypes = [drmaa2_dict_entryfree]
-        drmaa2_lib.drmaa2_dict_free.restype = None
-        drmaa2_lib.drmaa2_dict_free.argtypes = [POINTER(drmaa2_dict)]
-        drmaa2_lib.drmaa2_dict_list.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_dict_list.argtypes = [drmaa2_dict]
-        drmaa2_lib.drmaa2_dict_has.restype = drmaa2_bool
-        drmaa2_lib.drmaa2_dict_has.argtypes = [drmaa2_dict, c_char_p]
-        drmaa2_lib.drmaa2_dict_get.restype = c_char_p
-        drmaa2_lib.drmaa2_dict_get.argtypes = [drmaa2_dict, c_char_p]
-        drmaa2_lib.drmaa2_dict_del.restype = drmaa2_error
-        drmaa2_lib.drmaa2_dict_del.argtypes = [drmaa2_dict, c_char_p]
-        drmaa2_lib.drmaa2_dict_set.restype = drmaa2_error
-        drmaa2_lib.drmaa2_dict_set.argtypes = [drmaa2_dict, c_char_p]
-
-        drmaa2_lib.drmaa2_jinfo_create.restype = POINTER(drmaa2_jinfo)
-        drmaa2_lib.drmaa2_jinfo_create.argtypes = []
-        drmaa2_lib.drmaa2_jinfo_free.restype = None
-        drmaa2_lib.drmaa2_jinfo_free.argtypes = [POINTER(POINTER(drmaa2_jinfo))]
-
-        drmaa2_lib.drmaa2_slotinfo_free.restype = None
-        drmaa2_lib.drmaa2_slotinfo_free.argtypes = [POINTER(POINTER(drmaa2_slotinfo))]
-
-        drmaa2_lib.drmaa2_rinfo_create.restype = POINTER(drmaa2_rinfo)
-        drmaa2_lib.drmaa2_rinfo_create.argtypes = []
-        drmaa2_lib.drmaa2_rinfo_free.restype = None
-        drmaa2_lib.drmaa2_rinfo_free.argtypes = [POINTER(POINTER(drmaa2_rinfo))]
-
-        drmaa2_lib.drmaa2_jtemplate_create.restype = POINTER(drmaa2_jtemplate)
-        drmaa2_lib.drmaa2_jtemplate_create.argtypes = []
-        drmaa2_lib.drmaa2_jtemplate_free.restype = None
-        drmaa2_lib.drmaa2_jtemplate_free.argtypes = [POINTER(POINTER(drmaa2_jtemplate))]
-
-        drmaa2_lib.drmaa2_rtemplate_create.restype = POINTER(drmaa2_rtemplate)
-        drmaa2_lib.drmaa2_rtemplate_create.argtypes = []
-        drmaa2_lib.drmaa2_rtemplate_free.restype = None
-        drmaa2_lib.drmaa2_rtemplate_free.argtypes = [POINTER(POINTER(drmaa2_rtemplate))]
-
-        drmaa2_lib.drmaa2_queueinfo_free.restype = None
-        drmaa2_lib.drmaa2_queueinfo_free.argtypes = [POINTER(POINTER(drmaa2_queueinfo))]
-
-        drmaa2_lib.drmaa2_machineinfo_free.restype = None
-        drmaa2_lib.drmaa2_machineinfo_free.argtypes = [POINTER(POINTER(drmaa2_machineinfo))]
-
-        drmaa2_lib.drmaa2_notification_free.restype = None
-        drmaa2_lib.drmaa2_notification_free.argtypes = [POINTER(POINTER(drmaa2_notification))]
-
-        drmaa2_lib.drmaa2_version_free.restype = None
-        drmaa2_lib.drmaa2_version_free.argtypes = [POINTER(POINTER(drmaa2_version))]
-
-        drmaa2_lib.drmaa2_jtemplate_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_jtemplate_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_jinfo_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_jinfo_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_rtemplate_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_rtemplate_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_rinfo_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_rinfo_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_queueinfo_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_queueinfo_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_machineinfo_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_machineinfo_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_notification_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_notification_impl_spec.argtypes = []
-        drmaa2_lib.drmaa2_version_impl_spec.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_version_impl_spec.argtypes = []
-
-        drmaa2_lib.drmaa2_get_instance_value.restype = drmaa2_string
-        drmaa2_lib.drmaa2_get_instance_value.argtypes = [c_void_p, c_char_p]
-        drmaa2_lib.drmaa2_describe_attribute.restype = drmaa2_string
-        drmaa2_lib.drmaa2_describe_attribute.argtypes = [c_void_p, c_char_p]
-        drmaa2_lib.drmaa2_set_instance_value.restype = drmaa2_error
-        drmaa2_lib.drmaa2_set_instance_value.argtypes = [c_void_p, c_char_p, c_char_p]
-
-        drmaa2_lib.drmaa2_jsession_free.restype = None
-        drmaa2_lib.drmaa2_jsession_free.argtypes = [POINTER(POINTER(drmaa2_jsession))]
-        drmaa2_lib.drmaa2_rsession_free.restype = None
-        drmaa2_lib.drmaa2_rsession_free.argtypes = [POINTER(POINTER(drmaa2_rsession))]
-        drmaa2_lib.drmaa2_msession_free.restype = None
-        drmaa2_lib.drmaa2_msession_free.argtypes = [POINTER(POINTER(drmaa2_msession))]
-
-        drmaa2_lib.drmaa2_j_free.restype = None
-        drmaa2_lib.drmaa2_j_free.argtypes = [POINTER(POINTER(drmaa2_j))]
-        drmaa2_lib.drmaa2_jarray_free.restype = None
-        drmaa2_lib.drmaa2_jarray_free.argtypes = [POINTER(POINTER(drmaa2_jarray))]
-        drmaa2_lib.drmaa2_r_free.restype = None
-        drmaa2_lib.drmaa2_r_free.argtypes = [POINTER(POINTER(drmaa2_r))]
-
-        drmaa2_lib.drmaa2_rsession_get_contact.restype = drmaa2_string
-        drmaa2_lib.drmaa2_rsession_get_contact.argtypes = [drmaa2_rsession]
-        drmaa2_lib.drmaa2_rsession_get_session_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_rsession_get_session_name.argtypes = [drmaa2_rsession]
-        drmaa2_lib.drmaa2_rsession_get_reservation.restype = POINTER(drmaa2_r)
-        drmaa2_lib.drmaa2_rsession_get_reservation.argtypes = [POINTER(drmaa2_rsession), drmaa2_string]
-        drmaa2_lib.drmaa2_rsession_request_reservation.restype = POINTER(drmaa2_r)
-        drmaa2_lib.drmaa2_rsession_request_reservation.argtypes = [POINTER(drmaa2_rsession), POINTER(drmaa2_rtemplate)]
-        drmaa2_lib.drmaa2_rsession_request_reservation_as.restype = POINTER(drmaa2_r)
-        drmaa2_lib.drmaa2_rsession_request_reservation_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_rsession),
-                                                                      POINTER(drmaa2_rtemplate)]
-
-        drmaa2_lib.drmaa2_rsession_get_reservations.restype = drmaa2_r_list
-        drmaa2_lib.drmaa2_rsession_get_reservations.argtypes = [POINTER(drmaa2_rsession)]
-
-        drmaa2_lib.drmaa2_r_get_id.restype = drmaa2_string
-        drmaa2_lib.drmaa2_r_get_id.argtypes = [drmaa2_r]
-        drmaa2_lib.drmaa2_r_get_session_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_r_get_session_name.argtypes = [drmaa2_r]
-        # drmaa2_lib.drmaa2_r_get_reservation_template.restype = POINTER(drmaa2_rtemplate)
-        # drmaa2_lib.drmaa2_r_get_reservation_template.argtypes = [POINTER(drmaa2_r)]
-        drmaa2_lib.drmaa2_r_get_rtemplate.restype = POINTER(drmaa2_rtemplate)
-        drmaa2_lib.drmaa2_r_get_rtemplate.argtypes = [POINTER(drmaa2_r)]
-        drmaa2_lib.drmaa2_r_get_info.restype = POINTER(drmaa2_rinfo)
-        drmaa2_lib.drmaa2_r_get_info.argtypes = [POINTER(drmaa2_r)]
-        drmaa2_lib.drmaa2_r_terminate.restype = drmaa2_error
-        drmaa2_lib.drmaa2_r_terminate.argtypes = [POINTER(drmaa2_r)]
-        drmaa2_lib.drmaa2_r_terminate_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_r_terminate_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_r)]
-
-        drmaa2_lib.drmaa2_jarray_get_id.restype = drmaa2_string
-        drmaa2_lib.drmaa2_jarray_get_id.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_get_jobs.restype = drmaa2_j_list
-        drmaa2_lib.drmaa2_jarray_get_jobs.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_get_session_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_jarray_get_session_name.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_get_jtemplate.restype = POINTER(drmaa2_jtemplate)
-        drmaa2_lib.drmaa2_jarray_get_jtemplate.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_suspend.restype = drmaa2_error
-        drmaa2_lib.drmaa2_jarray_suspend.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_resume.restype = drmaa2_error
-        drmaa2_lib.drmaa2_jarray_resume.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_hold.restype = drmaa2_error
-        drmaa2_lib.drmaa2_jarray_hold.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_release.restype = drmaa2_error
-        drmaa2_lib.drmaa2_jarray_release.argtypes = [POINTER(drmaa2_jarray)]
-        drmaa2_lib.drmaa2_jarray_terminate.restype = drmaa2_error
-        drmaa2_lib.drmaa2_jarray_terminate.argtypes = [POINTER(drmaa2_jarray)]
-
-        drmaa2_lib.drmaa2_jsession_get_contact.restype = drmaa2_string
-        drmaa2_lib.drmaa2_jsession_get_contact.argtypes = [POINTER(drmaa2_jsession)]
-        drmaa2_lib.drmaa2_jsession_get_session_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_jsession_get_session_name.argtypes = [POINTER(drmaa2_jsession)]
-        drmaa2_lib.drmaa2_jsession_get_job_categories.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_jsession_get_job_categories.argtypes = [POINTER(drmaa2_jsession)]
-        drmaa2_lib.drmaa2_jsession_get_jobs.restype = drmaa2_j_list
-        drmaa2_lib.drmaa2_jsession_get_jobs.argtypes = [POINTER(drmaa2_jsession), POINTER(drmaa2_jinfo)]
-        drmaa2_lib.drmaa2_jsession_get_job_array.restype = POINTER(drmaa2_jarray)
-        drmaa2_lib.drmaa2_jsession_get_job_array.argtypes = [POINTER(drmaa2_jsession), drmaa2_string]
-        drmaa2_lib.drmaa2_jsession_run_job.restype = POINTER(drmaa2_j)
-        drmaa2_lib.drmaa2_jsession_run_job.argtypes = [POINTER(drmaa2_jsession), POINTER(drmaa2_jtemplate)]
-        drmaa2_lib.drmaa2_jsession_run_job_as.restype = POINTER(drmaa2_j)
-        drmaa2_lib.drmaa2_jsession_run_job_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_jsession),
-                                                          POINTER(drmaa2_jtemplate)]
-        drmaa2_lib.drmaa2_jsession_run_bulk_jobs.restype = POINTER(drmaa2_jarray)
-        drmaa2_lib.drmaa2_jsession_run_bulk_jobs.argtypes = [POINTER(drmaa2_jsession), POINTER(drmaa2_jtemplate),
-                                                             c_longlong, c_longlong, c_longlong, c_longlong]
-        drmaa2_lib.drmaa2_jsession_run_bulk_jobs_as.restype = POINTER(drmaa2_jarray)
-        drmaa2_lib.drmaa2_jsession_run_bulk_jobs_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_jsession),
-                                                                POINTER(drmaa2_jtemplate), c_longlong, c_longlong,
-                                                                c_longlong, c_longlong]
-        drmaa2_lib.drmaa2_jsession_wait_any_started.restype = POINTER(drmaa2_j)
-        drmaa2_lib.drmaa2_jsession_wait_any_started.argtypes = [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]
-        drmaa2_lib.drmaa2_jsession_wait_any_terminated.restype = POINTER(drmaa2_j)
-        drmaa2_lib.drmaa2_jsession_wait_any_terminated.argtypes = [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]
-        drmaa2_lib.drmaa2_jsession_wait_all_started.restype = drmaa2_j_list
-        drmaa2_lib.drmaa2_jsession_wait_all_started.argtypes = [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]
-        drmaa2_lib.drmaa2_jsession_wait_all_terminated.restype = drmaa2_j_list
-        drmaa2_lib.drmaa2_jsession_wait_all_terminated.argtypes = [POINTER(drmaa2_jsession), drmaa2_j_list, drmaa2_time]
-        drmaa2_lib.drmaa2_j_suspend.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_suspend.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_suspend_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_suspend_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_resume.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_resume.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_resume_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_resume_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_hold.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_hold.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_hold_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_hold_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_release.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_release.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_release_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_release_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_terminate.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_terminate_forced.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate_forced.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_terminate_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j), drmaa2_bool]
-        drmaa2_lib.drmaa2_j_terminate_all.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate_all.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_terminate_forced_all.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate_forced_all.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_terminate_all_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_terminate_all_as.argtypes = [POINTER(drmaa2_sudo), POINTER(drmaa2_j), drmaa2_bool]
-        drmaa2_lib.drmaa2_j_reap.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_reap.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_get_id.restype = drmaa2_string
-        drmaa2_lib.drmaa2_j_get_id.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_get_jtemplate.restype = POINTER(drmaa2_jtemplate)
-        drmaa2_lib.drmaa2_j_get_jtemplate.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_get_state.restype = drmaa2_jstate
-        drmaa2_lib.drmaa2_j_get_state.argtypes = [POINTER(drmaa2_j), POINTER(drmaa2_string)]
-        drmaa2_lib.drmaa2_j_get_info.restype = POINTER(drmaa2_jinfo)
-        drmaa2_lib.drmaa2_j_get_info.argtypes = [POINTER(drmaa2_j)]
-        drmaa2_lib.drmaa2_j_wait_started.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_wait_started.argtypes = [POINTER(drmaa2_j), drmaa2_time]
-        drmaa2_lib.drmaa2_j_wait_terminated.restype = drmaa2_error
-        drmaa2_lib.drmaa2_j_wait_terminated.argtypes = [POINTER(drmaa2_j)]
-
-        drmaa2_lib.drmaa2_msession_get_all_reservations.restype = drmaa2_r_list
-        drmaa2_lib.drmaa2_msession_get_all_reservations.argtypes = [POINTER(drmaa2_msession)]
-
-        drmaa2_lib.drmaa2_msession_get_all_jobs.restype = drmaa2_j_list
-        drmaa2_lib.drmaa2_msession_get_all_jobs.argtypes = [POINTER(drmaa2_msession), POINTER(drmaa2_jinfo)]
-        drmaa2_lib.drmaa2_msession_get_all_queues.restype = drmaa2_queueinfo_list
-        drmaa2_lib.drmaa2_msession_get_all_queues.argtypes = [POINTER(drmaa2_msession), drmaa2_string_list]
-        drmaa2_lib.drmaa2_msession_get_all_machines.restype = drmaa2_machineinfo_list
-        drmaa2_lib.drmaa2_msession_get_all_machines.argtypes = [POINTER(drmaa2_msession), drmaa2_string_list]
-
-        drmaa2_lib.drmaa2_get_drms_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_get_drms_name.argtypes = []
-        drmaa2_lib.drmaa2_get_drms_version.restype = POINTER(drmaa2_version)
-        drmaa2_lib.drmaa2_get_drms_version.argtypes = []
-        drmaa2_lib.drmaa2_get_drmaa_name.restype = drmaa2_string
-        drmaa2_lib.drmaa2_get_drmaa_name.argtypes = []
-        drmaa2_lib.drmaa2_get_drmaa_version.restype = POINTER(drmaa2_version)
-        drmaa2_lib.drmaa2_get_drmaa_version.argtypes = []
-        drmaa2_lib.drmaa2_supports.restype = drmaa2_bool
-        drmaa2_lib.drmaa2_supports.argtypes = [drmaa2_capability]
-        drmaa2_lib.drmaa2_create_jsession.restype = POINTER(drmaa2_jsession)
-        drmaa2_lib.drmaa2_create_jsession.argtypes = [c_char_p, c_char_p]
-        drmaa2_lib.drmaa2_create_jsession_as.restype = POINTER(drmaa2_jsession)
-        drmaa2_lib.drmaa2_create_jsession_as.argtypes = [POINTER(drmaa2_sudo), c_char_p, c_char_p]
-        drmaa2_lib.drmaa2_create_rsession.restype = POINTER(drmaa2_rsession)
-        drmaa2_lib.drmaa2_create_rsession.argtypes = [c_char_p, c_char_p]
-        drmaa2_lib.drmaa2_create_rsession_as.restype = POINTER(drmaa2_rsession)
-        drmaa2_lib.drmaa2_create_rsession_as.argtypes = [POINTER(drmaa2_sudo), c_char_p, c_char_p]
-        drmaa2_lib.drmaa2_open_jsession.restype = POINTER(drmaa2_jsession)
-        drmaa2_lib.drmaa2_open_jsession.argtypes = [c_char_p]
-        drmaa2_lib.drmaa2_open_rsession.restype = POINTER(drmaa2_rsession)
-        drmaa2_lib.drmaa2_open_rsession.argtypes = [c_char_p]
-        drmaa2_lib.drmaa2_open_msession.restype = POINTER(drmaa2_msession)
-        drmaa2_lib.drmaa2_open_msession.argtypes = [c_char_p]
-        drmaa2_lib.drmaa2_close_jsession.restype = drmaa2_error
-        drmaa2_lib.drmaa2_close_jsession.argtypes = [POINTER(drmaa2_jsession)]
-        drmaa2_lib.drmaa2_close_rsession.restype = drmaa2_error
-        drmaa2_lib.drmaa2_close_rsession.argtypes = [POINTER(drmaa2_rsession)]
-        drmaa2_lib.drmaa2_close_msession.restype = drmaa2_error
-        drmaa2_lib.drmaa2_close_msession.argtypes = [POINTER(drmaa2_msession)]
-        drmaa2_lib.drmaa2_destroy_jsession.restype = drmaa2_error
-        drmaa2_lib.drmaa2_destroy_jsession.argtypes = [c_char_p]
-        drmaa2_lib.drmaa2_destroy_jsession_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_destroy_jsession_as.argtypes = [POINTER(drmaa2_sudo), c_char_p]
-        drmaa2_lib.drmaa2_destroy_rsession.restype = drmaa2_error
-        drmaa2_lib.drmaa2_destroy_rsession.argtypes = [c_char_p]
-        drmaa2_lib.drmaa2_destroy_rsession_as.restype = drmaa2_error
-        drmaa2_lib.drmaa2_destroy_rsession_as.argtypes = [POINTER(drmaa2_sudo), c_char_p]
-        drmaa2_lib.drmaa2_get_jsession_names.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_get_jsession_names.argtypes = []
-        drmaa2_lib.drmaa2_get_rsession_names.restype = drmaa2_string_list
-        drmaa2_lib.drmaa2_get_rsession_names.argtypes = []
-        drmaa2_lib.drmaa2_register_event_notification.restype = drmaa2_error
-        drmaa2_lib.drmaa2_register_event_notification.argtypes = [POINTER(drmaa2_callback)]
-        cls.logger.debug("Done initializing DRMAA2 library")
-        return drmaa2_lib
+        # Function prototypes are assigned on first use.
+        return Drmaa2Library(drmaa2_lib)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=LibraryManager.reset)
 
 
 #######################################################################
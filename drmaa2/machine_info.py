@@ -21,12 +21,16 @@
 from ctypes import POINTER
 from ctypes import cast
 
-from .byte_string import ByteString
+from .byte_string import decode_string
+from .drmaa2_constants import Bool
 from .drmaa2_constants import Cpu
 from .drmaa2_constants import Os
+from .drmaa2_constants import UNSET_ENUM
 from .drmaa2_ctypes import drmaa2_machineinfo
 from .drmaa2_object import Drmaa2Object
 from .drmaa2_exceptions import InvalidArgument
+from .exception_mapper import ExceptionMapper
+from .columns import Columns
 
 from .drmaa2_version_descriptor import Drmaa2VersionDescriptor
 
@@ -59,6 +63,18 @@ class MachineInfo(Drmaa2Object):
     implementation_specific = Drmaa2Object.ImplSpecDescriptor('implementationSpecific')
     """ Implementation specific dictionary ({str:str}). """
 
+    # Column name, struct field name and column typecode for columnar conversion.
+    COLUMNS = [('name', 'name', None),
+               ('available', 'available', '?'),
+               ('sockets', 'sockets', 'q'),
+               ('cores_per_socket', 'coresPerSocket', 'q'),
+               ('threads_per_core', 'threadsPerCore', 'q'),
+               ('load', 'load', 'd'),
+               ('phys_memory', 'physMemory', 'q'),
+               ('virt_memory', 'virtMemory', 'q'),
+               ('machine_arch', 'machineArch', None),
+               ('machine_os', 'machineOS', None)]
+
     def __init__(self, machine_info):
         """ 
         Constructor. 
@@ -70,7 +86,7 @@ class MachineInfo(Drmaa2Object):
         if isinstance(machine_info, POINTER(drmaa2_machineinfo)):
             self._struct = POINTER(drmaa2_machineinfo)()
             self._struct.contents = drmaa2_machineinfo()
-            self.name = ByteString(getattr(machine_info.contents, 'name').value).decode()
+            self.name = decode_string(getattr(machine_info.contents, 'name').value)
             self.available = getattr(machine_info.contents, 'available')
             self.sockets = getattr(machine_info.contents, 'sockets')
             self.cores_per_socket = getattr(machine_info.contents, 'coresPerSocket')
@@ -110,7 +126,7 @@ class MachineInfo(Drmaa2Object):
         py_machine_info_list = []
         if ctypes_list:
             count = drmaa2_lib.drmaa2_list_size(ctypes_list)
-            cls.logger.debug('Converting ctypes machine info list of size {}'.format(count))
+            cls.logger.debug('Converting ctypes machine info list of size %s', count)
             for i in range(count):
                 void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
                 if void_ptr:
@@ -121,3 +137,39 @@ class MachineInfo(Drmaa2Object):
                     ExceptionMapper.check_last_error_code()
                     # py_machine_info_list.append(None)
         return py_machine_info_list
+
+    @classmethod
+    def to_py_machine_info_columns(cls, ctypes_list):
+        """
+        Convert machine info list to column-oriented dictionary, reading all
+        fields directly from the underlying structs in a single pass over the
+        list. Numeric columns are NumPy arrays if NumPy is available, and
+        array.array objects otherwise; unset numeric values are -1. The name
+        and enum columns are lists of strings. Operating system version and
+        implementation specific values are not included.
+
+        :param ctypes_list: DRMAA2 machine info list.
+
+        :returns: Dictionary of columns, keyed by column name (see COLUMNS).
+        """
+        value_lists = {name: [] for (name, _, _) in cls.COLUMNS}
+        if ctypes_list:
+            drmaa2_lib = cls.get_drmaa2_library()
+            count = drmaa2_lib.drmaa2_list_size(ctypes_list)
+            cls.logger.debug('Converting ctypes machine info list of size %s to columns', count)
+            list_get = drmaa2_lib.drmaa2_list_get
+            from_address = drmaa2_machineinfo.from_address
+            columns = [(value_lists[name], field) for (name, field, _) in cls.COLUMNS]
+            for i in range(count):
+                void_ptr = list_get(ctypes_list, i)
+                if not void_ptr:
+                    ExceptionMapper.check_last_error_code()
+                    continue
+                mi = from_address(void_ptr)
+                for (values, field) in columns:
+                    values.append(getattr(mi, field))
+            value_lists['name'] = [decode_string(v.value) for v in value_lists['name']]
+            value_lists['available'] = [v == Bool.TRUE for v in value_lists['available']]
+            value_lists['machine_arch'] = [Cpu(v).name if v != UNSET_ENUM else None for v in value_lists['machine_arch']]
+            value_lists['machine_os'] = [Os(v).name if v != UNSET_ENUM else None for v in value_lists['machine_os']]
+        return Columns.to_columns(value_lists, {name: typecode for (name, _, typecode) in cls.COLUMNS})
@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import os
+import tempfile
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from http.server import HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from BaseHTTPServer import HTTPServer
+
+from .call_stats import CallStats
+from .library_manager import LibraryManager
+from .job_session import JobSession
+from .log_manager import LogManager
+
+
+class MetricsExporter(object):
+    """
+    Renders client metrics in OpenMetrics text format: library call
+    latencies and errors (requires instrumentation, see
+    LibraryManager.enable_instrumentation()), job submissions and waits,
+    retries (if a retry policy is set), hits and misses for registered
+    caches, and the number of open job sessions. Metrics can be served over
+    HTTP from a background thread, or written to a file for the node
+    exporter textfile collector.
+    """
+
+    CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+    # Library functions counted as submissions and waits.
+    SUBMISSION_FUNCTIONS = ('drmaa2_jsession_run_job', 'drmaa2_jsession_run_job_as', 'drmaa2_jsession_run_bulk_jobs',
+                            'drmaa2_jsession_run_bulk_jobs_as', 'drmaa2_rsession_request_reservation',
+                            'drmaa2_rsession_request_reservation_as')
+    WAIT_FUNCTIONS = ('drmaa2_jsession_wait_any_started', 'drmaa2_jsession_wait_any_terminated',
+                      'drmaa2_jsession_wait_all_started', 'drmaa2_jsession_wait_all_terminated',
+                      'drmaa2_j_wait_started', 'drmaa2_j_wait_terminated')
+
+    logger = LogManager.get_instance().get_logger('MetricsExporter')
+
+    def __init__(self, drmaa2_lib=None):
+        """
+        Constructor.
+
+        :param drmaa2_lib: Library proxy to read call statistics from; by default, the one from the library manager is used.
+        :type drmaa2_lib: Drmaa2Library
+
+        >>> LibraryManager.enable_instrumentation()
+        >>> exporter = MetricsExporter()
+        """
+        self.drmaa2_lib = drmaa2_lib
+        self.__caches = {}
+        self.__server = None
+
+    def add_cache(self, name, cache):
+        """
+        Register cache whose statistics are exported.
+
+        :param name: Cache name, used as the value of the 'cache' label.
+        :type name: str
+
+        :param cache: Query cache, job state cache, or monitoring session with caching enabled.
+        :type cache: QueryCache or JobStateCache or MonitoringSession
+
+        >>> m_session.enable_cache(ttl=5)
+        >>> exporter.add_cache('monitoring', m_session)
+        """
+        self.__caches[name] = cache
+
+    def remove_cache(self, name):
+        """
+        Unregister cache.
+
+        :param name: Cache name.
+        :type name: str
+        """
+        self.__caches.pop(name, None)
+
+    def render(self):
+        """
+        Render metrics.
+
+        :returns: Metrics in OpenMetrics text format.
+
+        >>> print(exporter.render())
+        # TYPE drmaa2_submissions counter
+        drmaa2_submissions_total{function="drmaa2_jsession_run_job"} 12
+        ...
+        # EOF
+        """
+        lines = []
+        call_stats = self.__get_drmaa2_library().get_stats()
+        self.__render_call_counts(lines, 'drmaa2_submissions', 'Job and reservation submissions.', call_stats,
+                                  self.SUBMISSION_FUNCTIONS)
+        self.__render_call_counts(lines, 'drmaa2_waits', 'Job state waits.', call_stats, self.WAIT_FUNCTIONS)
+        self.__render_call_stats(lines, call_stats)
+        self.__render_retry_stats(lines)
+        self.__render_cache_stats(lines)
+        self.__add_metric(lines, 'drmaa2_open_job_sessions', 'gauge', 'Open job sessions.',
+                          [('', {}, JobSession.get_open_session_count())])
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """
+        Write metrics to file. The file is replaced atomically, so that
+        collectors never read a partially written file.
+
+        :param path: File path; for the node exporter textfile collector, it should end with '.prom'.
+        :type path: str
+
+        >>> exporter.write_textfile('/var/lib/node_exporter/drmaa2.prom')
+        """
+        text = self.render()
+        (fd, tmp_path) = tempfile.mkstemp(dir=os.path.dirname(path) or None, prefix='.drmaa2_metrics')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(text)
+            os.chmod(tmp_path, 0o644)
+            os.rename(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def start_http_server(self, port, address=''):
+        """
+        Serve metrics over HTTP from a background daemon thread.
+
+        :param port: Port number; if 0, a free port is chosen.
+        :type port: int
+
+        :param address: Address to bind to; by default, all interfaces.
+        :type address: str
+
+        :returns: Port number the server listens on.
+
+        >>> exporter.start_http_server(9100)
+        9100
+        """
+        if self.__server is not None:
+            return self.__server.server_port
+        exporter = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                try:
+                    body = exporter.render().encode('utf-8')
+                except Exception as ex:
+                    exporter.logger.warn('Could not render metrics: %s', ex)
+                    self.send_error(500)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', exporter.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                exporter.logger.debug(format, *args)
+
+        self.__server = HTTPServer((address, port), MetricsRequestHandler)
+        thread = threading.Thread(target=self.__server.serve_forever, name='drmaa2-metrics')
+        thread.daemon = True
+        thread.start()
+        self.logger.debug('Serving metrics on port %s', self.__server.server_port)
+        return self.__server.server_port
+
+    def stop_http_server(self):
+        """
+        Stop serving metrics over HTTP.
+
+        >>> exporter.stop_http_server()
+        """
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+    def __get_drmaa2_library(self):
+        if self.drmaa2_lib is None:
+            self.drmaa2_lib = LibraryManager.get_instance().get_drmaa2_library()
+        return self.drmaa2_lib
+
+    def __render_call_counts(self, lines, name, help, call_stats, functions):
+        samples = [('_total', {'function': f}, call_stats[f]['count']) for f in functions if f in call_stats]
+        self.__add_metric(lines, name, 'counter', help, samples)
+
+    def __render_call_stats(self, lines, call_stats):
+        samples = []
+        error_samples = []
+        for function in sorted(call_stats):
+            stats = call_stats[function]
+            # All buckets are exported, so that the set of series does not change over time.
+            bucket_counts = dict(stats['histogram'])
+            count = 0
+            for bucket in range(CallStats.N_BUCKETS - 1):
+                upper_bound = CallStats.get_bucket_upper_bound(bucket)
+                count += bucket_counts.get(upper_bound, 0)
+                samples.append(('_bucket', {'function': function, 'le': repr(upper_bound)}, count))
+            samples.append(('_bucket', {'function': function, 'le': '+Inf'}, stats['count']))
+            samples.append(('_count', {'function': function}, stats['count']))
+            samples.append(('_sum', {'function': function}, stats['total_time']))
+            for (code, n) in sorted(stats['error_codes'].items()):
+                error_samples.append(('_total', {'function': function, 'code': str(code)}, n))
+        self.__add_metric(lines, 'drmaa2_call_duration_seconds', 'histogram', 'DRMAA2 library call latency.',
+                          samples, unit='seconds')
+        self.__add_metric(lines, 'drmaa2_call_errors', 'counter', 'Failed DRMAA2 library calls by error code.',
+                          error_samples)
+
+    def __render_retry_stats(self, lines):
+        retry_policy = self.__get_drmaa2_library().get_retry_policy()
+        if retry_policy is None:
+            return
+        stats = retry_policy.get_stats()
+        self.__add_metric(lines, 'drmaa2_retries', 'counter', 'Retried DRMAA2 library calls.',
+                          [('_total', {'function': f}, n) for (f, n) in sorted(stats['retries_by_function'].items())])
+        self.__add_metric(lines, 'drmaa2_retry_outcomes', 'counter', 'Retried calls by final outcome.',
+                          [('_total', {'outcome': 'recovered'}, stats['recovered']),
+                           ('_total', {'outcome': 'exhausted'}, stats['exhausted'])])
+
+    def __render_cache_stats(self, lines):
+        (hit_samples, miss_samples, entry_samples) = ([], [], [])
+        for (name, cache) in sorted(self.__caches.items()):
+            get_stats = getattr(cache, 'get_cache_stats', None) or cache.get_stats
+            stats = get_stats()
+            if stats is None:
+                continue
+            labels = {'cache': name}
+            hit_samples.append(('_total', labels, stats['hits']))
+            miss_samples.append(('_total', labels, stats['misses']))
+            entry_samples.append(('', labels, stats['entries']))
+        self.__add_metric(lines, 'drmaa2_cache_hits', 'counter', 'Cache hits.', hit_samples)
+        self.__add_metric(lines, 'drmaa2_cache_misses', 'counter', 'Cache misses.', miss_samples)
+        self.__add_metric(lines, 'drmaa2_cache_entries', 'gauge', 'Cached entries.', entry_samples)
+
+    @classmethod
+    def __add_metric(cls, lines, name, type, help, samples, unit=None):
+        if not samples:
+            return
+        lines.append('# TYPE %s %s' % (name, type))
+        if unit:
+            lines.append('# UNIT %s %s' % (name, unit))
+        lines.append('# HELP %s %s' % (name, help))
+        for (suffix, labels, value) in samples:
+            label_string = ','.join(['%s="%s"' % (k, cls.escape_label_value(v)) for (k, v) in sorted(labels.items())])
+            if label_string:
+                label_string = '{%s}' % label_string
+            lines.append('%s%s%s %s' % (name, suffix, label_string, repr(value) if isinstance(value, float) else value))
+
+    @classmethod
+    def escape_label_value(cls, value):
+        """
+        Escape label value for OpenMetrics text format.
+
+        :param value: Label value.
+        :type value: str
+
+        :returns: Escaped value.
+        """
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    LibraryManager.enable_instrumentation()
+    exporter = MetricsExporter()
+    print(exporter.render())
@@ -25,6 +25,7 @@ from ctypes import c_void_p
 from .drmaa2_constants import PY_DICT_TYPE
 
 from .byte_string import ByteString
+from .byte_string import encode_string
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_ctypes import drmaa2_machineinfo_list
 from .drmaa2_object import Drmaa2Object
@@ -35,6 +36,7 @@ from .reservation_info import ReservationInfo
 from .reservation import Reservation
 from .job_info import JobInfo
 from .job import Job
+from .query_cache import QueryCache
 from .log_manager import LogManager
 from .exception_mapper import ExceptionMapper
 
@@ -64,6 +66,7 @@ class MonitoringSession(Drmaa2Object):
         b6db641c6bf34ffaafaac15d31554778
         """
         Drmaa2Object.__init__(self)
+        self._cache = None
         name = name or session_dict.get('name')
         if not name:
             name = uuid4().hex
@@ -73,8 +76,8 @@ class MonitoringSession(Drmaa2Object):
         self._read_only = True
 
     def __open(self, name):
-        self.logger.debug('Opening monitoring session {}'.format(name))
-        struct = self.get_drmaa2_library().drmaa2_open_msession(ByteString(name).encode())
+        self.logger.debug('Opening monitoring session %s', name)
+        struct = self.get_drmaa2_library().drmaa2_open_msession(encode_string(name))
         if not struct:
             self.exception_mapper.check_last_error_code()
         return struct
@@ -90,7 +93,7 @@ class MonitoringSession(Drmaa2Object):
         >>> mi_list = m_session.get_all_machines(['univa.example.com'])
         """
         if self._struct:
-            self.logger.debug('Monitoring session {} is already open'.format(self._name_bs.decode()))
+            self.logger.debug('Monitoring session %s is already open', self._name_bs.decode())
         else:
             self._struct = self.__open(self._name_bs)
             self._struct_p = pointer(self._struct)
@@ -104,7 +107,7 @@ class MonitoringSession(Drmaa2Object):
         >>> m_session.close()
         """
         if self._struct:
-            self.logger.debug('Closing monitoring session {}'.format(self._name_bs.decode()))
+            self.logger.debug('Closing monitoring session %s', self._name_bs.decode())
             drmaa2_lib = self.get_drmaa2_library()
             self.exception_mapper.check_status_code(drmaa2_lib.drmaa2_close_msession(self._struct))
             drmaa2_lib.drmaa2_msession_free(self._struct_p)
@@ -114,56 +117,123 @@ class MonitoringSession(Drmaa2Object):
         """ Destructor. """
         self.close()
 
-    def get_all_machines(self, filter):
+    def enable_cache(self, ttl=5.0, ttls=None):
+        """ 
+        Enable caching of machine, queue and reservation query results. 
+        Results are cached per query and normalized filter, and concurrent
+        identical queries are coalesced into a single request.
+
+        :param ttl: Default time to live for cached results, in seconds.
+        :type ttl: float
+
+        :param ttls: Optional time to live values, keyed by method name (get_all_machines, get_all_queues, get_all_reservations).
+        :type ttls: dict
+
+        >>> m_session.enable_cache(ttl=10, ttls={'get_all_queues' : 60})
+        >>> qi_list = m_session.get_all_queues(['all.q'])
+        """
+        self.logger.debug('Enabling query cache with default TTL %s', ttl)
+        self._cache = QueryCache(ttl, ttls)
+
+    def disable_cache(self):
+        """ 
+        Disable caching of query results, and remove cached results.
+
+        >>> m_session.disable_cache()
+        """
+        self._cache = None
+
+    def get_cache_stats(self):
+        """ 
+        Get query cache statistics.
+
+        :returns: Dictionary with the number of cache hits, misses, coalesced requests and cached entries, or None if caching is disabled.
+
+        >>> print(m_session.get_cache_stats())
+        {'hits': 10, 'misses': 2, 'coalesced': 1, 'entries': 2}
+        """
+        if self._cache is None:
+            return None
+        return self._cache.get_stats()
+
+    def __run_query(self, query_name, key, query):
+        if self._cache is None:
+            return query()
+        return self._cache.get(query_name, key, query)
+
+    def get_all_machines(self, filter, as_columns=False):
         """ 
         Get information about specified machines.
 
         :param filter: List of machine names to retrieve information for.
         :type filter: [str]
 
-        :returns: List of MachineInfo objects.
+        :param as_columns: If True, return column-oriented dictionary instead of list of objects (see MachineInfo.to_py_machine_info_columns()).
+        :type as_columns: bool
+
+        :returns: List of MachineInfo objects, or dictionary of columns.
 
         >>> mi_list = m_session.get_all_machines(['univa.example.com'])
         >>> print(mi_list)
          [MachineInfo({'available': 'TRUE', 'cores_per_socket': 1, 'implementation_specific': {}, 'load': 0.07999999821186066, 'machine_arch': 'X64', 'machine_os': 'OTHER_OS', 'machine_os_version': Version({'implementation_specific': {}}), 'name': 'univ.example.com', 'phys_memory': 4047372, 'sockets': 1, 'threads_per_core': 1, 'virt_memory': 8110599})]
+        >>> columns = m_session.get_all_machines(['univa.example.com'], as_columns=True)
+        >>> print(columns['phys_memory'])
+        [4047372]
         """
-        self.logger.debug('Requesting list of machines using filter: {}'.format(filter))
+        return self.__run_query('get_all_machines', (QueryCache.normalize_filter(filter), as_columns),
+                                lambda: self.__get_all_machines(filter, as_columns))
+
+    def __get_all_machines(self, filter, as_columns):
+        self.logger.debug('Requesting list of machines using filter: %s', filter)
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_filter = self.to_ctypes_string_list_or_none(filter)
+        filter_values = []
+        ctypes_filter = self.to_ctypes_string_list_or_none(filter, filter_values)
         ctypes_machine_info_list = drmaa2_lib.drmaa2_msession_get_all_machines(self._struct, ctypes_filter)
         if not ctypes_machine_info_list:
             self.exception_mapper.check_last_error_code()
 
-        py_machine_info_list = []
-        if ctypes_machine_info_list:
+        if as_columns:
+            py_machine_info_list = MachineInfo.to_py_machine_info_columns(ctypes_machine_info_list)
+        else:
             py_machine_info_list = MachineInfo.to_py_machine_info_list(ctypes_machine_info_list)
+        if ctypes_machine_info_list:
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_machine_info_list)))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_filter)))
         return py_machine_info_list
 
-    def get_all_queues(self, filter):
+    def get_all_queues(self, filter, as_columns=False):
         """ 
         Get information about specified queues.
 
         :param filter: List of queue names to retrieve information for.
         :type filter: [str]
 
-        :returns: List of QueueInfo objects.
+        :param as_columns: If True, return column-oriented dictionary instead of list of objects (see QueueInfo.to_py_queue_info_columns()).
+        :type as_columns: bool
+
+        :returns: List of QueueInfo objects, or dictionary of columns.
 
         >>> qi_list = m_session.get_all_queues(['all.q'])
         >>> print(qi_list)
         [QueueInfo({'implementation_specific': {}, 'name': 'all.q'})]
         """
-        self.logger.debug('Requesting list of queues using filter: {}'.format(filter))
+        return self.__run_query('get_all_queues', (QueryCache.normalize_filter(filter), as_columns),
+                                lambda: self.__get_all_queues(filter, as_columns))
+
+    def __get_all_queues(self, filter, as_columns):
+        self.logger.debug('Requesting list of queues using filter: %s', filter)
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_filter = self.to_ctypes_string_list_or_none(filter)
+        filter_values = []
+        ctypes_filter = self.to_ctypes_string_list_or_none(filter, filter_values)
         ctypes_queue_info_list = drmaa2_lib.drmaa2_msession_get_all_queues(self._struct, ctypes_filter)
         if not ctypes_queue_info_list:
             self.exception_mapper.check_last_error_code()
 
-        py_queue_info_list = []
-        if ctypes_queue_info_list:
+        if as_columns:
+            py_queue_info_list = QueueInfo.to_py_queue_info_columns(ctypes_queue_info_list)
+        else:
             py_queue_info_list = QueueInfo.to_py_queue_info_list(ctypes_queue_info_list)
+        if ctypes_queue_info_list:
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_queue_info_list)))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_filter)))
         return py_queue_info_list
@@ -182,7 +252,11 @@ class MonitoringSession(Drmaa2Object):
         >>> print(r_list)
         [Reservation({'id': '49'})]
         """
-        self.logger.debug('Requesting list of reservations using filter: {}'.format(filter))
+        return self.__run_query('get_all_reservations', QueryCache.normalize_filter(filter),
+                                lambda: self.__get_all_reservations(filter))
+
+    def __get_all_reservations(self, filter):
+        self.logger.debug('Requesting list of reservations using filter: %s', filter)
         drmaa2_lib = self.get_drmaa2_library()
         reservation_info = filter
         if type(filter) == PY_DICT_TYPE:
@@ -202,19 +276,58 @@ class MonitoringSession(Drmaa2Object):
             drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_reservation_list)))
         return py_reservation_list
 
-    def get_all_jobs(self, filter):
+    def get_all_jobs(self, filter, as_refs=False):
         """ 
         Get jobs matching the specified info.
 
         :param filter: Job info filter.
         :type filter: JobInfo
 
-        :returns: List of Job objects.
+        :param as_refs: If true, return compact JobRef handles instead of Job objects.
+        :type as_refs: bool
+
+        :returns: List of Job or JobRef objects.
 
         >>> j_info = JobInfo({'job_name' : 'a_job'})
         >>> j_list = m_session.get_all_jobs(j_info)
         """
-        self.logger.debug('Requesting list of jobs using filter: {}'.format(filter))
+        ctypes_job_list = self.__get_all_jobs(filter)
+        py_job_list = []
+        if ctypes_job_list:
+            py_job_list = Job.to_py_job_list(ctypes_job_list, as_refs)
+            self.get_drmaa2_library().drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
+        return py_job_list
+
+    def iter_all_jobs(self, filter, as_refs=False):
+        """ 
+        Iterate over jobs matching the specified info. Job objects are created
+        lazily as the returned generator is consumed, and the underlying job
+        list is released when the generator is exhausted or closed.
+
+        :param filter: Job info filter.
+        :type filter: JobInfo
+
+        :param as_refs: If true, yield compact JobRef handles instead of Job objects.
+        :type as_refs: bool
+
+        :returns: Generator of Job or JobRef objects.
+
+        >>> j_info = JobInfo({'job_name' : 'a_job'})
+        >>> for j in m_session.iter_all_jobs(j_info):
+        ...     print(j.id)
+        """
+        ctypes_job_list = self.__get_all_jobs(filter)
+        if not ctypes_job_list:
+            return
+        try:
+            for j in Job.iter_py_job_list(ctypes_job_list, as_refs):
+                yield j
+        finally:
+            self.logger.debug('Releasing job list')
+            self.get_drmaa2_library().drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
+
+    def __get_all_jobs(self, filter):
+        self.logger.debug('Requesting list of jobs using filter: %s', filter)
         drmaa2_lib = self.get_drmaa2_library()
         job_info = filter
         if type(filter) == PY_DICT_TYPE:
@@ -227,9 +340,4 @@ class MonitoringSession(Drmaa2Object):
         ctypes_job_list = drmaa2_lib.drmaa2_msession_get_all_jobs(self._struct, ctypes_filter)
         if not ctypes_job_list:
             self.exception_mapper.check_last_error_code()
-
-        py_job_list = []
-        if ctypes_job_list:
-            py_job_list = Job.to_py_job_list(ctypes_job_list)
-            drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_job_list)))
-        return py_job_list
+        return ctypes_job_list
@@ -22,7 +22,8 @@ import atexit
 from ctypes import POINTER
 
 from .drmaa2_ctypes import drmaa2_callback
-from .byte_string import ByteString
+from .drmaa2_ctypes import drmaa2_notification
+from .byte_string import decode_string
 from .drmaa2_constants import Event
 from .drmaa2_constants import JobState
 from .drmaa2_object import Drmaa2Object
@@ -48,6 +49,11 @@ class Notification(Drmaa2Object):
 
     logger = LogManager.get_instance().get_logger('Notification')
 
+    # Reference to the registered C callback, which must stay alive
+    # for as long as the library may call it.
+    __callback_p = None
+    __unregister_at_exit = False
+
     def __init__(self, notification):
         """ 
         Constructor. 
@@ -57,8 +63,8 @@ class Notification(Drmaa2Object):
             self._struct = POINTER(drmaa2_notification)()
             self._struct.contents = drmaa2_notification()
             self.event = getattr(notification.contents, 'event')
-            self.job_id = ByteString(getattr(notification.contents, 'jobId').value).decode()
-            self.session_name = ByteString(getattr(notification.contents, 'sessionName').value).decode()
+            self.job_id = decode_string(getattr(notification.contents, 'jobId').value)
+            self.session_name = decode_string(getattr(notification.contents, 'sessionName').value)
             self.job_state = getattr(notification.contents, 'jobState')
             self.implementation_specific = getattr(notification.contents, 'implementationSpecific')
         else:
@@ -88,9 +94,14 @@ class Notification(Drmaa2Object):
         """ Wrap actual python callback. """
 
         def wrapper(notification_ptr):
-            notification = Notification(notification_ptr.contents)
-            callback(notification)
-            cls.get_drmaa2_library().drmaa2_notification_free(notification_ptr)
+            try:
+                notification = Notification(notification_ptr)
+                callback(notification)
+            except Exception as ex:
+                # Exceptions cannot propagate into the C library.
+                cls.logger.error('Error processing event notification: %s', ex)
+            finally:
+                cls.get_drmaa2_library().drmaa2_notification_free(notification_ptr)
 
         return wrapper
 
@@ -107,9 +118,12 @@ class Notification(Drmaa2Object):
         >>> Notification.register_event_notification(event_callback)
         """
         callback_p = drmaa2_callback(cls.event_callback(callback))
-        cls.logger.debug("Registering notification callback {}".format(callback_p))
+        cls.logger.debug('Registering notification callback %s', callback_p)
         ExceptionMapper.check_status_code(cls.get_drmaa2_library().drmaa2_register_event_notification(callback_p))
-        atexit.register(unregister_event_notification)
+        Notification.__callback_p = callback_p
+        if not Notification.__unregister_at_exit:
+            atexit.register(cls.unregister_event_notification)
+            Notification.__unregister_at_exit = True
 
     @classmethod
     def unregister_event_notification(cls):
@@ -119,5 +133,6 @@ class Notification(Drmaa2Object):
         >>> Notification.unregister_event_notification()
         """
         callback_p = drmaa2_callback()
-        cls.logger.debug("Unregistering notification callback {}".format(callback_p))
+        cls.logger.debug('Unregistering notification callback %s', callback_p)
         ExceptionMapper.check_status_code(cls.get_drmaa2_library().drmaa2_register_event_notification(callback_p))
+        Notification.__callback_p = None
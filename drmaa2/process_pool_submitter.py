@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import multiprocessing
+
+from .byte_string import encode_string
+from .job import Job
+from .job_session import JobSession
+from .job_template import JobTemplate
+from .log_manager import LogManager
+
+# Job session opened by the initializer of each worker process.
+_worker_job_session = None
+
+
+def _init_worker(session_name, contact):
+    global _worker_job_session
+    _worker_job_session = JobSession(session_name, contact=contact, destroy_on_exit=False)
+
+
+def _run_jobs_in_worker(templates):
+    jobs = _worker_job_session.run_jobs(templates)
+    return [(encode_string(j.id), encode_string(j.session_name), encode_string(j.job_name))
+            for j in jobs]
+
+
+class ProcessPoolSubmitter(object):
+    """
+    Submits jobs from a pool of worker processes. Each worker opens
+    its own handle for the given job session, so that submission is not
+    serialized on a single library instance. Only job template dictionaries
+    are sent to workers, and only job ids and names are sent back.
+    """
+
+    DEFAULT_CHUNK_SIZE = 16
+
+    logger = LogManager.get_instance().get_logger('ProcessPoolSubmitter')
+
+    def __init__(self, session_name, processes=None, contact=None):
+        """
+        Constructor. The job session must already exist; it is not
+        destroyed when the submitter is closed.
+
+        :param session_name: Job session name.
+        :type session_name: str
+
+        :param processes: Number of worker processes; if not provided, the number of CPUs is used.
+        :type processes: int
+
+        :param contact: Session contact.
+        :type contact: str
+
+        >>> j_session = JobSession('js-01')
+        >>> submitter = ProcessPoolSubmitter('js-01', processes=4)
+        """
+        self.session_name = session_name
+        self.logger.debug('Starting %s worker processes for job session %s', processes, session_name)
+        self.__pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(session_name, contact))
+
+    def run_jobs(self, templates, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Run multiple jobs. Templates are distributed to worker processes
+        in chunks, and Job objects are yielded in the order of the input templates.
+
+        :param templates: Iterable of job templates; each can be specified either as a dictionary, or directly as a JobTemplate object.
+        :type templates: iterable
+
+        :param chunk_size: Number of templates submitted by a worker in one task.
+        :type chunk_size: int
+
+        :returns: Generator of Job objects.
+
+        >>> templates = [{'remote_command' : '/bin/sleep', 'args' : [str(i)]} for i in range(3)]
+        >>> for j in submitter.run_jobs(templates):
+        ...     print(j.id)
+        531
+        532
+        533
+        """
+        for job_fields_list in self.__pool.imap(_run_jobs_in_worker, self.__iter_chunks(templates, chunk_size)):
+            for (id, session_name, job_name) in job_fields_list:
+                yield Job.create_from_fields(id, session_name, job_name)
+
+    @classmethod
+    def __iter_chunks(cls, templates, chunk_size):
+        chunk = []
+        for t in templates:
+            if isinstance(t, JobTemplate):
+                t = t.to_dict()
+            chunk.append(t)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def close(self):
+        """
+        Stop worker processes after pending submissions complete.
+
+        >>> submitter.close()
+        """
+        self.__pool.close()
+        self.__pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    submitter = ProcessPoolSubmitter('js-01', processes=2)
+    print(list(submitter.run_jobs([{'remote_command': '/bin/sleep', 'args': ['10']}])))
+    submitter.close()
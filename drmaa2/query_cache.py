@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import copy
+import json
+import time
+import threading
+
+from .log_manager import LogManager
+
+# Use monotonic clock where available, so that expiry is not
+# affected by system clock adjustments.
+get_time = getattr(time, 'monotonic', time.time)
+
+
+class QueryCacheEntry(object):
+    """ Cached query result, or query in flight. """
+
+    def __init__(self):
+        """ Constructor. """
+        self.value = None
+        self.exception = None
+        self.expiry_time = None
+        self.ready = threading.Event()
+
+
+class QueryCache(object):
+    """
+    Thread-safe cache of query results with a per-query time to live.
+    Concurrent requests for the same query and key that is not cached are
+    coalesced: the first request runs the query, and the others wait
+    for its result. Expired results are removed whenever a query is run. Each caller gets its own copy of the result list, or
+    of the columns of a column-oriented result; objects in result lists
+    (for example MachineInfo or Reservation objects) are shared between
+    callers, and must be treated as read-only.
+    """
+
+    logger = LogManager.get_instance().get_logger('QueryCache')
+
+    def __init__(self, ttl=5.0, ttls=None):
+        """
+        Constructor.
+
+        :param ttl: Default time to live for cached results, in seconds.
+        :type ttl: float
+
+        :param ttls: Optional time to live values, keyed by query name; these override the default value.
+        :type ttls: dict
+
+        >>> cache = QueryCache(ttl=5.0, ttls={'get_all_queues': 60.0})
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.__stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    @classmethod
+    def normalize_filter(cls, filter):
+        """
+        Convert query filter to hashable key. Filter lists are sorted and
+        stripped of duplicates; objects and dictionaries are converted to
+        a canonical string.
+
+        :param filter: Query filter: None, list of names, dictionary, or DRMAA2 object.
+
+        :returns: Hashable key.
+
+        >>> print(QueryCache.normalize_filter(['b', 'a', 'b']))
+        ('a', 'b')
+        """
+        if filter is None:
+            return None
+        if isinstance(filter, (list, tuple, set)):
+            return tuple(sorted(set(filter)))
+        if hasattr(filter, 'to_dict'):
+            filter = filter.to_dict()
+        return json.dumps(filter, sort_keys=True, default=str)
+
+    def get_ttl(self, query_name):
+        """
+        Get time to live for a given query.
+
+        :param query_name: Query name.
+        :type query_name: str
+
+        :returns: Time to live in seconds.
+        """
+        return self.ttls.get(query_name, self.ttl)
+
+    def get(self, query_name, key, query):
+        """
+        Get query result from cache, or run the query if the result
+        is not cached or has expired. Exceptions raised by the query are
+        propagated to all requests waiting on it, and are not cached.
+
+        :param query_name: Query name.
+        :type query_name: str
+
+        :param key: Hashable query key, for example normalized filter.
+
+        :param query: Function without arguments that runs the query.
+        :type query: callable
+
+        :returns: Copy of the query result (see copy_result()).
+        """
+        cache_key = (query_name, key)
+        with self.__lock:
+            now = get_time()
+            entry = self.__entries.get(cache_key)
+            if entry is not None and entry.ready.is_set() and entry.expiry_time <= now:
+                entry = None
+            if entry is None:
+                self.__remove_expired(now)
+                entry = QueryCacheEntry()
+                self.__entries[cache_key] = entry
+                self.__stats['misses'] += 1
+                owner = True
+            else:
+                self.__stats['hits' if entry.ready.is_set() else 'coalesced'] += 1
+                owner = False
+
+        if owner:
+            self.logger.debug('Running query %s for key %s', query_name, key)
+            try:
+                entry.value = query()
+                entry.expiry_time = get_time() + self.get_ttl(query_name)
+            except Exception as ex:
+                entry.exception = ex
+                with self.__lock:
+                    if self.__entries.get(cache_key) is entry:
+                        del self.__entries[cache_key]
+                raise
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+            if entry.exception is not None:
+                raise entry.exception
+        return self.copy_result(entry.value)
+
+    def __remove_expired(self, now):
+        # Must be called with the lock held. Removing expired results on
+        # each miss keeps results for keys that are not requested again
+        # from accumulating.
+        for cache_key in [k for (k, e) in self.__entries.items() if e.ready.is_set() and e.expiry_time <= now]:
+            del self.__entries[cache_key]
+
+    @classmethod
+    def copy_result(cls, value):
+        """
+        Copy cached query result for a caller. Lists are copied shallowly,
+        so that objects in them are shared; for dictionaries, such as
+        column-oriented results, each value (column) is copied.
+
+        :param value: Query result.
+
+        :returns: Copy of the query result.
+
+        >>> columns = {'load': array.array('d', [0.5, 1.0])}
+        >>> QueryCache.copy_result(columns)['load'] is columns['load']
+        False
+        """
+        if isinstance(value, dict):
+            return {k: copy.copy(v) for (k, v) in value.items()}
+        return copy.copy(value)
+
+    def invalidate(self, query_name=None):
+        """
+        Remove cached results.
+
+        :param query_name: Query name; if not provided, all results are removed.
+        :type query_name: str
+        """
+        with self.__lock:
+            if query_name is None:
+                self.__entries.clear()
+            else:
+                for cache_key in [k for k in self.__entries if k[0] == query_name]:
+                    del self.__entries[cache_key]
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        :returns: Dictionary with the number of hits, misses, coalesced requests and cached entries.
+
+        >>> print(cache.get_stats())
+        {'hits': 10, 'misses': 2, 'coalesced': 1, 'entries': 2}
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['entries'] = len(self.__entries)
+        return stats
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    cache = QueryCache(ttl=1.0)
+    print(cache.get('query', None, lambda: [1, 2, 3]))
+    print(cache.get('query', None, lambda: [1, 2, 3]))
+    print(cache.get_stats())
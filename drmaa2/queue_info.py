@@ -21,12 +21,14 @@
 from ctypes import POINTER
 from ctypes import cast
 
-from .byte_string import ByteString
+from .byte_string import decode_string
 from .drmaa2_constants import Cpu
 from .drmaa2_constants import Os
 from .drmaa2_ctypes import drmaa2_queueinfo
 from .drmaa2_object import Drmaa2Object
 from .drmaa2_exceptions import InvalidArgument
+from .exception_mapper import ExceptionMapper
+from .columns import Columns
 
 from .drmaa2_version_descriptor import Drmaa2VersionDescriptor
 
@@ -50,7 +52,7 @@ class QueueInfo(Drmaa2Object):
         if isinstance(queue_info, POINTER(drmaa2_queueinfo)):
             self._struct = POINTER(drmaa2_queueinfo)()
             self._struct.contents = drmaa2_queueinfo()
-            self.name = ByteString(getattr(queue_info.contents, 'name').value).decode()
+            self.name = decode_string(getattr(queue_info.contents, 'name').value)
             self.implementation_specific = getattr(queue_info.contents, 'implementationSpecific')
         else:
             raise InvalidArgument('Invalid argument: %s' % str(queue_info))
@@ -80,7 +82,7 @@ class QueueInfo(Drmaa2Object):
         py_queue_info_list = []
         if ctypes_list:
             count = drmaa2_lib.drmaa2_list_size(ctypes_list)
-            cls.logger.debug('Converting ctypes queue info list of size {}'.format(count))
+            cls.logger.debug('Converting ctypes queue info list of size %s', count)
             for i in range(count):
                 void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
                 if void_ptr:
@@ -91,3 +93,29 @@ class QueueInfo(Drmaa2Object):
                     ExceptionMapper.check_last_error_code()
                     py_queue_info_list.append(None)
         return py_queue_info_list
+
+    @classmethod
+    def to_py_queue_info_columns(cls, ctypes_list):
+        """
+        Convert queue info list to column-oriented dictionary, reading queue
+        names directly from the underlying structs in a single pass over the list.
+        Implementation specific values are not included.
+
+        :param ctypes_list: DRMAA2 queue info list.
+
+        :returns: Dictionary with the 'name' column (list of str).
+        """
+        names = []
+        if ctypes_list:
+            drmaa2_lib = cls.get_drmaa2_library()
+            count = drmaa2_lib.drmaa2_list_size(ctypes_list)
+            cls.logger.debug('Converting ctypes queue info list of size %s to columns', count)
+            list_get = drmaa2_lib.drmaa2_list_get
+            from_address = drmaa2_queueinfo.from_address
+            for i in range(count):
+                void_ptr = list_get(ctypes_list, i)
+                if not void_ptr:
+                    ExceptionMapper.check_last_error_code()
+                    continue
+                names.append(decode_string(from_address(void_ptr).name.value))
+        return Columns.to_columns({'name': names}, {})
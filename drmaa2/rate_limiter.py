@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import time
+import threading
+
+from .drmaa2_exceptions import InvalidArgument
+from .drmaa2_exceptions import TryLaterError
+from .log_manager import LogManager
+
+get_time = getattr(time, 'monotonic', time.time)
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting the rate of submissions. The bucket holds up to
+    burst tokens and is refilled with rate tokens per second; each submission
+    takes one token. When the bucket is empty, a submission either waits
+    for the next token or fails with TryLaterError, depending on the
+    block flag. A single limiter can be shared by any number of sessions
+    and threads in a process.
+    """
+
+    logger = LogManager.get_instance().get_logger('RateLimiter')
+
+    def __init__(self, rate, burst=None, block=True, timeout=None):
+        """
+        Constructor.
+
+        :param rate: Sustained number of submissions per second.
+        :type rate: float
+
+        :param burst: Maximum number of submissions made without waiting; defaults to max(1, rate).
+        :type burst: int
+
+        :param block: If true, wait for a token when the bucket is empty; otherwise, raise TryLaterError.
+        :type block: bool
+
+        :param timeout: Maximum time to wait for a token, in seconds; TryLaterError is raised if the wait would be longer. None means no limit.
+        :type timeout: float
+
+        >>> limiter = RateLimiter(rate=20, burst=50)
+        >>> j_session = JobSession('js-01', rate_limiter=limiter)
+        >>> r_session = ReservationSession('rs-01', rate_limiter=limiter)
+        """
+        if rate <= 0:
+            raise InvalidArgument('Rate must be positive: %s' % rate)
+        self.rate = float(rate)
+        self.burst = burst or max(1, int(rate))
+        self.block = block
+        self.timeout = timeout
+        self.__tokens = float(self.burst)
+        self.__last_time = get_time()
+        self.__lock = threading.Lock()
+        self.__stats = {'acquired': 0, 'waited': 0, 'rejected': 0, 'wait_time': 0.0}
+
+    def acquire(self):
+        """
+        Take a token, waiting or raising TryLaterError if none is available.
+
+        :returns: Time spent waiting, in seconds.
+
+        :raises TryLaterError: if the bucket is empty and the limiter does not block, or the wait would exceed timeout.
+
+        >>> limiter.acquire()
+        0.0
+        """
+        with self.__lock:
+            now = get_time()
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__last_time) * self.rate)
+            self.__last_time = now
+            # A token is reserved right away, so that concurrent callers
+            # are served in order; the balance may become negative.
+            delay = (1 - self.__tokens) / self.rate
+            if delay > 0 and (not self.block or (self.timeout is not None and delay > self.timeout)):
+                self.__stats['rejected'] += 1
+                raise TryLaterError('Submission rate limit of %s per second exceeded' % self.rate)
+            self.__tokens -= 1
+            self.__stats['acquired'] += 1
+            if delay > 0:
+                self.__stats['waited'] += 1
+                self.__stats['wait_time'] += delay
+        if delay > 0:
+            self.logger.debug('Waiting %.3f seconds for submission token', delay)
+            time.sleep(delay)
+            return delay
+        return 0.0
+
+    def get_stats(self):
+        """
+        Get limiter statistics.
+
+        :returns: Dictionary with numbers of acquired tokens, acquisitions that had to wait, rejected acquisitions, and total wait time.
+
+        >>> print(limiter.get_stats())
+        {'acquired': 120, 'waited': 70, 'rejected': 0, 'wait_time': 2.5}
+        """
+        with self.__lock:
+            return dict(self.__stats)
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    limiter = RateLimiter(rate=10, burst=2)
+    print([round(limiter.acquire(), 3) for i in range(5)])
+    print(limiter.get_stats())
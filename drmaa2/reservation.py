@@ -31,7 +31,7 @@ from .sudo import Sudo
 from .reservation_template import ReservationTemplate
 from .reservation_info import ReservationInfo
 
-from .byte_string import ByteString
+from .byte_string import decode_string
 from .drmaa2_object import Drmaa2Object
 from .log_manager import LogManager
 from .exception_mapper import ExceptionMapper
@@ -53,8 +53,8 @@ class Reservation(Drmaa2Object):
         if isinstance(reservation, POINTER(drmaa2_r)):
             self._struct = POINTER(drmaa2_r)()
             self._struct.contents = drmaa2_r()
-            self.id = ByteString(getattr(reservation.contents, 'id').value).decode()
-            self.session_name = ByteString(getattr(reservation.contents, 'session_name').value).decode()
+            self.id = decode_string(getattr(reservation.contents, 'id').value)
+            self.session_name = decode_string(getattr(reservation.contents, 'session_name').value)
         else:
             raise InvalidArgument('Invalid argument: %s' % str(reservation))
 
@@ -69,13 +69,13 @@ class Reservation(Drmaa2Object):
         >>> ...
         >>> r.terminate()
         """
-        self.logger.debug('Terminating reservation id {}'.format(self.id))
+        self.logger.debug('Terminating reservation id %s', self.id)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
-            ExceptionMapper.check_status_code(self.drmaa2_lib.drmaa2_r_terminate_as(auth._struct, self._struct))
+            self.logger.debug('Using sudo object: %s', auth)
+            ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_r_terminate_as(auth._struct, self._struct))
         else:
-            ExceptionMapper.check_status_code(self.drmaa2_lib.drmaa2_r_terminate(self._struct))
+            ExceptionMapper.check_status_code(self.get_drmaa2_library().drmaa2_r_terminate(self._struct))
 
     def get_template(self):
         """ 
@@ -89,9 +89,9 @@ class Reservation(Drmaa2Object):
         >>> print(rt.users_acl)
         []
         """
-        self.logger.debug('Retrieving template for reservation id {}'.format(self.id))
-        # ctypes_reservation_template = self.drmaa2_lib.drmaa2_r_get_reservation_template(self._struct)
-        ctypes_reservation_template = self.drmaa2_lib.drmaa2_r_get_rtemplate(self._struct)
+        self.logger.debug('Retrieving template for reservation id %s', self.id)
+        # ctypes_reservation_template = self.get_drmaa2_library().drmaa2_r_get_reservation_template(self._struct)
+        ctypes_reservation_template = self.get_drmaa2_library().drmaa2_r_get_rtemplate(self._struct)
         if not ctypes_reservation_template:
             ExceptionMapper.check_last_error_code()
 
@@ -109,8 +109,8 @@ class Reservation(Drmaa2Object):
         >>> print(ri.users_acl)
         []
         """
-        self.logger.debug('Retrieving info for reservation id {}'.format(self.id))
-        ctypes_reservation_info = self.drmaa2_lib.drmaa2_r_get_info(self._struct)
+        self.logger.debug('Retrieving info for reservation id %s', self.id)
+        ctypes_reservation_info = self.get_drmaa2_library().drmaa2_r_get_info(self._struct)
         if not ctypes_reservation_info:
             ExceptionMapper.check_last_error_code()
         return ReservationInfo(ctypes_reservation_info)
@@ -124,7 +124,7 @@ class Reservation(Drmaa2Object):
         if ctypes_list:
             drmaa2_lib = cls.get_drmaa2_library()
             count = drmaa2_lib.drmaa2_list_size(ctypes_list)
-            cls.logger.debug('Converting ctypes reservation list of size {}'.format(count))
+            cls.logger.debug('Converting ctypes reservation list of size %s', count)
             for i in range(count):
                 void_ptr = drmaa2_lib.drmaa2_list_get(ctypes_list, i)
                 if void_ptr:
@@ -138,9 +138,9 @@ class Reservation(Drmaa2Object):
 
     @classmethod
     def to_ctypes_reservation_list(cls, py_reservation_list):
-        cls.logger.debug('Converting py reservation list of size {}'.format(len(py_reservation_list)))
-        ctypes_reservation_list = cls.drmaa2_lib.drmaa2_list_create(int(ListType.RESERVATIONLIST),
+        cls.logger.debug('Converting py reservation list of size %s', len(py_reservation_list))
+        ctypes_reservation_list = cls.get_drmaa2_library().drmaa2_list_create(int(ListType.RESERVATIONLIST),
                                                                     drmaa2_list_entryfree())
         for r in py_reservation_list:
-            ExceptionMapper.check_status_code(cls.drmaa2_lib.drmaa2_list_add(ctypes_reservation_list, r._struct))
+            ExceptionMapper.check_status_code(cls.get_drmaa2_library().drmaa2_list_add(ctypes_reservation_list, r._struct))
         return ctypes_reservation_list
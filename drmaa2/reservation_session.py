@@ -24,6 +24,7 @@ from ctypes import pointer
 from ctypes import c_void_p
 
 from .byte_string import ByteString
+from .byte_string import encode_string
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_object import Drmaa2Object
 
@@ -46,7 +47,7 @@ class ReservationSession(Drmaa2Object):
     logger = LogManager.get_instance().get_logger('ReservationSession')
     exception_mapper = ExceptionMapper()
 
-    def __init__(self, name=None, contact=None, destroy_on_exit=True, check_for_existing_session=True, session_dict={}, auth=None):
+    def __init__(self, name=None, contact=None, destroy_on_exit=True, check_for_existing_session=True, session_dict={}, auth=None, rate_limiter=None):
         """ 
         Constructor. If the session with a given name does not already exist, 
         it will create a new one; otherwise, it will open the existing session.
@@ -69,12 +70,16 @@ class ReservationSession(Drmaa2Object):
         :param auth: Optional sudo object for creating the session; it can be specified either as a dictionary, or as a Sudo object directly.
         :type auth: Sudo or dict
 
+        :param rate_limiter: Optional rate limiter for reservation requests; it can be shared with other sessions.
+        :type rate_limiter: RateLimiter
+
         >>> r_session = ReservationSession()
         >>> print(r_session.name)
         def678952a654dfda75ffabae6890be
         """
         Drmaa2Object.__init__(self)
         self._destroy_on_exit = destroy_on_exit
+        self.rate_limiter = rate_limiter
         name = name or session_dict.get('name')
         if not name:
             name = uuid4().hex
@@ -91,7 +96,7 @@ class ReservationSession(Drmaa2Object):
             for n in session_names_to_check:
                 if n in existing_session_names:
                     name = n
-                    self.logger.debug('Discovered existing job session with name {}'.format(n))
+                    self.logger.debug('Discovered existing job session with name %s', n)
                     create_new_session = False
                     break
 
@@ -119,20 +124,20 @@ class ReservationSession(Drmaa2Object):
         return Drmaa2Object.to_py_string_list(cls.get_drmaa2_library().drmaa2_get_rsession_names())
 
     def __create(self, name, contact, auth):
-        self.logger.debug('Creating reservation session with name {} (contact: {})'.format(name, contact))
+        self.logger.debug('Creating reservation session with name %s (contact: %s)', name, contact)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
-            struct = self.get_drmaa2_library().drmaa2_create_rsession_as(auth._struct, ByteString(name).encode(), ByteString(contact).encode())
+            self.logger.debug('Using sudo object: %s', auth)
+            struct = self.get_drmaa2_library().drmaa2_create_rsession_as(auth._struct, encode_string(name), encode_string(contact))
         else:
-            struct = self.get_drmaa2_library().drmaa2_create_rsession(ByteString(name).encode(), ByteString(contact).encode())
+            struct = self.get_drmaa2_library().drmaa2_create_rsession(encode_string(name), encode_string(contact))
         if not struct:
             self.exception_mapper.check_last_error_code()
         return struct
 
     def __open(self, name):
-        self.logger.debug('Opening reservation session {}'.format(name))
-        struct = self.get_drmaa2_library().drmaa2_open_rsession(ByteString(name).encode())
+        self.logger.debug('Opening reservation session %s', name)
+        struct = self.get_drmaa2_library().drmaa2_open_rsession(encode_string(name))
         if not struct:
             self.exception_mapper.check_last_error_code()
         return struct
@@ -147,7 +152,7 @@ class ReservationSession(Drmaa2Object):
         >>> r_session.open()
         """
         if self._struct:
-            self.logger.debug('Reservation session {} is already open'.format(self._name_bs.decode()))
+            self.logger.debug('Reservation session %s is already open', self._name_bs.decode())
         else:
             self._struct = self.__open(self._name_bs)
             self._struct_p = pointer(self._struct)
@@ -161,7 +166,7 @@ class ReservationSession(Drmaa2Object):
         >>> r_session.close()
         """
         if self._struct:
-            self.logger.debug('Closing reservation session {}'.format(self._name_bs.decode()))
+            self.logger.debug('Closing reservation session %s', self._name_bs.decode())
             drmaa2_lib = self.get_drmaa2_library()
             self.exception_mapper.check_status_code(drmaa2_lib.drmaa2_close_rsession(self._struct))
             drmaa2_lib.drmaa2_rsession_free(self._struct_p)
@@ -178,11 +183,11 @@ class ReservationSession(Drmaa2Object):
         >>> ...
         >>> r_session.destroy()
         """
-        self.logger.debug('Destroying reservation session {}'.format(self._name_bs.decode()))
+        self.logger.debug('Destroying reservation session %s', self._name_bs.decode())
         auth = auth or self._auth
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             self.exception_mapper.check_status_code(self.get_drmaa2_library().drmaa2_destroy_rsession_as(auth._struct, self._name_bs.encode()))
         else:
             self.exception_mapper.check_status_code(self.get_drmaa2_library().drmaa2_destroy_rsession(self._name_bs.encode()))
@@ -200,13 +205,13 @@ class ReservationSession(Drmaa2Object):
 
         >>> ReservationSession.destroy_by_name('rs-01')
         """
-        cls.logger.debug('Destroying reservation session {}'.format(name))
+        cls.logger.debug('Destroying reservation session %s', name)
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
-            cls.exception_mapper.check_status_code(cls.get_drmaa2_library().drmaa2_destroy_rsession_as(auth._struct, ByteString(name).encode()))
+            self.logger.debug('Using sudo object: %s', auth)
+            cls.exception_mapper.check_status_code(cls.get_drmaa2_library().drmaa2_destroy_rsession_as(auth._struct, encode_string(name)))
         else:
-            cls.exception_mapper.check_status_code(cls.get_drmaa2_library().drmaa2_destroy_rsession(ByteString(name).encode()))
+            cls.exception_mapper.check_status_code(cls.get_drmaa2_library().drmaa2_destroy_rsession(encode_string(name)))
 
     def __del__(self):
         """ Destructor. """
@@ -215,9 +220,9 @@ class ReservationSession(Drmaa2Object):
             try:
                 self.destroy()
             except Drmaa2Exception as ex:
-                self.logger.warn('Could not destroy reservation session: {}'.format(str(ex)))
+                self.logger.warn('Could not destroy reservation session: %s', ex)
         else:
-            self.logger.debug('Will not destroy reservation session {}'.format(self._name_bs.decode()))
+            self.logger.debug('Will not destroy reservation session %s', self._name_bs.decode())
         if self._struct:
             self.get_drmaa2_library().drmaa2_rsession_free(self._struct_p)
 
@@ -237,19 +242,21 @@ class ReservationSession(Drmaa2Object):
         >>> print(r.id)
         623
         """
-        self.logger.debug('Requesting a reservation using template: {}'.format(template))
+        self.logger.debug('Requesting a reservation using template: %s', template)
         drmaa2_lib = self.get_drmaa2_library()
         template = ReservationTemplate.create_from_dict(template)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
         if auth:
             auth = Sudo.create_from_dict(auth)
-            self.logger.debug('Using sudo object: {}'.format(auth))
+            self.logger.debug('Using sudo object: %s', auth)
             ctypes_reservation = drmaa2_lib.drmaa2_rsession_request_reservation_as(auth._struct, self._struct, template._struct)
         else:
             ctypes_reservation = drmaa2_lib.drmaa2_rsession_request_reservation(self._struct, template._struct)
         if not ctypes_reservation:
             self.exception_mapper.check_last_error_code()
         py_reservation = Reservation(ctypes_reservation)
-        self.logger.debug('Got reservation {}'.format(py_reservation))
+        self.logger.debug('Got reservation %s', py_reservation)
         drmaa2_lib.drmaa2_r_free(pointer(ctypes_reservation))
         return py_reservation
 
@@ -266,13 +273,13 @@ class ReservationSession(Drmaa2Object):
         >>> print(r.id)
         623
         """
-        self.logger.debug('Requesting reservation id: {}'.format(id))
+        self.logger.debug('Requesting reservation id: %s', id)
         drmaa2_lib = self.get_drmaa2_library()
-        ctypes_reservation = drmaa2_lib.drmaa2_rsession_get_reservation(self._struct, ByteString(id).encode())
+        ctypes_reservation = drmaa2_lib.drmaa2_rsession_get_reservation(self._struct, encode_string(id))
         if not ctypes_reservation:
             self.exception_mapper.check_last_error_code()
         py_reservation = Reservation(ctypes_reservation)
-        self.logger.debug('Got reservation {}'.format(py_reservation))
+        self.logger.debug('Got reservation %s', py_reservation)
         drmaa2_lib.drmaa2_r_free(pointer(ctypes_reservation))
         return py_reservation
 
@@ -290,6 +297,6 @@ class ReservationSession(Drmaa2Object):
         if not ctypes_reservation_list:
             self.exception_mapper.check_last_error_code()
         py_reservation_list = Reservation.to_py_reservation_list(ctypes_reservation_list)
-        self.logger.debug('Retrieved {} reservations'.format(len(py_reservation_list)))
+        self.logger.debug('Retrieved %s reservations', len(py_reservation_list))
         drmaa2_lib.drmaa2_list_free(pointer(c_void_p(ctypes_reservation_list)))
         return py_reservation_list
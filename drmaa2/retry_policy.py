@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import time
+import random
+import threading
+
+from .drmaa2_constants import StatusCode
+from .log_manager import LogManager
+
+
+class RetryPolicy(object):
+    """
+    Retry policy for library functions that communicate with the DRM.
+    A failed call is repeated if its error code is retryable, waiting
+    base_delay*multiplier**(n-1) seconds (at most max_delay) before the
+    n-th retry; with jitter j, each delay is reduced by a random fraction
+    of up to j, so that clients failing together do not retry together.
+
+    Note that with DRM_COMMUNICATION errors the DRM may have performed
+    the failed operation, so retrying submissions can create duplicate jobs.
+    Timed wait functions are never retried, so that a wait does not block
+    for longer than its timeout.
+    """
+
+    DEFAULT_RETRYABLE_CODES = (StatusCode.TRY_LATER, StatusCode.DRM_COMMUNICATION)
+
+    logger = LogManager.get_instance().get_logger('RetryPolicy')
+
+    def __init__(self, max_attempts=5, base_delay=0.1, max_delay=10.0, multiplier=2.0, jitter=0.5,
+                 retryable_codes=DEFAULT_RETRYABLE_CODES):
+        """
+        Constructor.
+
+        :param max_attempts: Maximum number of attempts per call, including the first one.
+        :type max_attempts: int
+
+        :param base_delay: Delay before the first retry, in seconds.
+        :type base_delay: float
+
+        :param max_delay: Maximum delay between attempts, in seconds.
+        :type max_delay: float
+
+        :param multiplier: Delay growth factor per retry.
+        :type multiplier: float
+
+        :param jitter: Maximum fraction (between 0 and 1) by which a delay is randomly reduced.
+        :type jitter: float
+
+        :param retryable_codes: Status codes for which failed calls are retried.
+        :type retryable_codes: iterable
+
+        >>> policy = RetryPolicy(max_attempts=3, base_delay=0.5)
+        >>> LibraryManager.get_instance().get_drmaa2_library().set_retry_policy(policy)
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retryable_codes = frozenset([int(c) for c in retryable_codes])
+        self.__random = random.Random()
+        self.__lock = threading.Lock()
+        self.reset_stats()
+
+    def is_retryable(self, code):
+        """
+        Check whether a failed call with given status code should be retried.
+
+        :param code: Status code.
+        :type code: int
+
+        :returns: True if code is retryable, false otherwise.
+        """
+        return code in self.retryable_codes
+
+    def get_delay(self, retry):
+        """
+        Get delay before a retry.
+
+        :param retry: Retry number, starting with 1.
+        :type retry: int
+
+        :returns: Delay in seconds.
+        """
+        delay = min(self.base_delay * self.multiplier ** (retry - 1), self.max_delay)
+        return delay * (1 - self.jitter * self.__random.random())
+
+    def call(self, name, function, args, get_code):
+        """
+        Call function, retrying it while it fails with a retryable code.
+
+        :param name: Function name.
+        :type name: str
+
+        :param function: Function to call.
+
+        :param args: Function arguments.
+        :type args: tuple
+
+        :param get_code: Callable which returns status code for a function result, or 0 for success.
+
+        :returns: Result of the last attempt.
+        """
+        result = function(*args)
+        attempt = 1
+        code = get_code(result)
+        while code and attempt < self.max_attempts and self.is_retryable(code):
+            delay = self.get_delay(attempt)
+            self.logger.debug('Retrying %s after error %s in %.3f seconds', name, code, delay)
+            self.__record_retry(name, code)
+            time.sleep(delay)
+            result = function(*args)
+            attempt += 1
+            code = get_code(result)
+        if attempt > 1:
+            with self.__lock:
+                if code and self.is_retryable(code):
+                    self.__stats['exhausted'] += 1
+                elif not code:
+                    self.__stats['recovered'] += 1
+        return result
+
+    def __record_retry(self, name, code):
+        with self.__lock:
+            self.__stats['retries'] += 1
+            function_retries = self.__stats['retries_by_function']
+            function_retries[name] = function_retries.get(name, 0) + 1
+            code_retries = self.__stats['retries_by_code']
+            code_retries[code] = code_retries.get(code, 0) + 1
+
+    def get_stats(self):
+        """
+        Get retry statistics.
+
+        :returns: Dictionary with total number of retries, retries by function name and by status code, and numbers of calls which succeeded after retrying ('recovered') or ran out of attempts ('exhausted').
+
+        >>> print(policy.get_stats())
+        {'retries': 3, 'retries_by_function': {'drmaa2_jsession_run_job': 3}, 'retries_by_code': {3: 3}, 'recovered': 1, 'exhausted': 0}
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats['retries_by_function'] = dict(stats['retries_by_function'])
+            stats['retries_by_code'] = dict(stats['retries_by_code'])
+        return stats
+
+    def reset_stats(self):
+        """
+        Reset retry statistics.
+
+        >>> policy.reset_stats()
+        """
+        with self.__lock:
+            self.__stats = {'retries': 0, 'retries_by_function': {}, 'retries_by_code': {}, 'recovered': 0,
+                            'exhausted': 0}
+
+
+#######################################################################
+# Test.
+if __name__ == '__main__':
+    policy = RetryPolicy()
+    print([policy.get_delay(i) for i in range(1, policy.max_attempts)])
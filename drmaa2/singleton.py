@@ -18,17 +18,42 @@
 #######################################################################################
 # ___INFO__MARK_END__
 
+import os
+import threading
+
+
 class Singleton(object):
     """ Base class for singleton objects. """
 
     __instance = None
+    # Reentrant, since singleton constructors may get other singletons.
+    __lock = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
-        if cls.__instance is None or cls != type(cls.__instance):
-            instance = object.__new__(cls, *args, **kwargs)
-            instance.__init__()
-            cls.__instance = instance
-        return cls.__instance
+        instance = cls.__instance
+        if instance is None or cls != type(instance):
+            with Singleton.__lock:
+                if cls.__instance is None or cls != type(cls.__instance):
+                    instance = object.__new__(cls, *args, **kwargs)
+                    instance.__init__()
+                    cls.__instance = instance
+                instance = cls.__instance
+        return instance
+
+    @classmethod
+    def reset_instance(cls):
+        """ 
+        Drop singleton instance; a new one is created on next access.
+
+        >>> Singleton.reset_instance()
+        """
+        with Singleton.__lock:
+            cls.__instance = None
+
+    @classmethod
+    def reinit_lock_after_fork(cls):
+        """ Replace the instance lock in a forked child, as it may have been held by another parent thread. """
+        Singleton.__lock = threading.RLock()
 
     @classmethod
     def get_instance(cls, *args, **kwargs):
@@ -44,6 +69,10 @@ class Singleton(object):
             return
 
 
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Singleton.reinit_lock_after_fork)
+
+
 #######################################################################
 # Test.
 if __name__ == '__main__':
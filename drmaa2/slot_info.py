@@ -21,7 +21,7 @@
 from ctypes import cast
 from ctypes import POINTER
 
-from .byte_string import ByteString
+from .byte_string import decode_string
 from .drmaa2_ctypes import drmaa2_slotinfo
 from .drmaa2_ctypes import drmaa2_string
 from .drmaa2_object import Drmaa2Object
@@ -43,8 +43,8 @@ class SlotInfo(Drmaa2Object):
         if struct is not None:
             self._struct = POINTER(drmaa2_slotinfo)()
             self._struct.contents = drmaa2_slotinfo()
-            machine_name = ByteString(getattr(struct.contents, 'machineName').value).decode()
-            # self.machine_name = ByteString(getattr(struct.contents, 'machineName').value).decode()
+            machine_name = decode_string(getattr(struct.contents, 'machineName').value)
+            # self.machine_name = decode_string(getattr(struct.contents, 'machineName').value)
             self.machine_name = machine_name
             self.slots = getattr(struct.contents, 'slots')
 
@@ -67,10 +67,10 @@ class SlotInfo(Drmaa2Object):
     def to_py_job_list(cls, ctypes_list):
         py_job_list = []
         if ctypes_list:
-            count = cls.drmaa2_lib.drmaa2_list_size(ctypes_list)
-            cls.logger.debug('Converting ctypes job list of size {}'.format(count))
+            count = cls.get_drmaa2_library().drmaa2_list_size(ctypes_list)
+            cls.logger.debug('Converting ctypes job list of size %s', count)
             for i in range(count):
-                void_ptr = cls.drmaa2_lib.drmaa2_list_get(ctypes_list, i)
+                void_ptr = cls.get_drmaa2_library().drmaa2_list_get(ctypes_list, i)
                 if void_ptr:
                     si = cast(void_ptr, POINTER(drmaa2_slotinfo))
                     si = SlotInfo(si)
@@ -82,8 +82,8 @@ class SlotInfo(Drmaa2Object):
 
     @classmethod
     def to_ctypes_job_list(cls, py_job_list):
-        cls.logger.debug('Converting py job list of size {}'.format(len(py_job_list)))
-        ctypes_job_list = cls.drmaa2_lib.drmaa2_list_create(int(ListType.SLOTINFOLIST), drmaa2_list_entryfree())
+        cls.logger.debug('Converting py job list of size %s', len(py_job_list))
+        ctypes_job_list = cls.get_drmaa2_library().drmaa2_list_create(int(ListType.SLOTINFOLIST), drmaa2_list_entryfree())
         for si in py_job_list:
-            ExceptionMapper.check_status_code(cls.drmaa2_lib.drmaa2_list_add(ctypes_job_list, si._struct))
+            ExceptionMapper.check_status_code(cls.get_drmaa2_library().drmaa2_list_add(ctypes_job_list, si._struct))
         return ctypes_job_list
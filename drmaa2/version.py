@@ -23,7 +23,7 @@ from ctypes import cast
 from ctypes import c_void_p
 from ctypes import pointer
 
-from .byte_string import ByteString
+from .byte_string import decode_string
 from .drmaa2_ctypes import drmaa2_version
 from .drmaa2_ctypes import drmaa2_dict
 from .drmaa2_object import Drmaa2Object
@@ -51,8 +51,8 @@ class Version(Drmaa2Object):
             self._struct = POINTER(drmaa2_version)()
             self._struct.contents = drmaa2_version()
             if version:
-                self.major = ByteString(getattr(version.contents, 'major').value).decode()
-                self.minor = ByteString(getattr(version.contents, 'minor').value).decode()
+                self.major = decode_string(getattr(version.contents, 'major').value)
+                self.minor = decode_string(getattr(version.contents, 'minor').value)
                 self.implementation_specific = self.get_implementation_specific_attrs()
             else:
                 self.major = "-NA-"
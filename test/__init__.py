@@ -16,3 +16,7 @@
 # limitations under the License.
 #######################################################################################
 # ___INFO__MARK_END__
+
+from .utils import setup_drmaa2_stub
+
+setup_drmaa2_stub()
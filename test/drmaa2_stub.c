@@ -0,0 +1,2644 @@
+/*___INFO__MARK_BEGIN__*/
+/*************************************************************************************
+ * Copyright 2008-2022 Altair Engineering Inc.
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may not
+ * use this file except in compliance with the License.
+ *
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ *
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *************************************************************************************/
+/*___INFO__MARK_END__*/
+
+/*
+ * Stub DRMAA2 library for running the test and benchmark suites without
+ * a cluster. It implements the subset of the DRMAA2 C API (including the
+ * UGE extensions) used by the drmaa2 package: lists, dictionaries,
+ * templates, job, reservation and monitoring sessions, and a simulated
+ * job lifecycle. All state is kept in process memory; a forked child
+ * starts with a copy of the parent's state.
+ *
+ * Jobs are dispatched DRMAA2_STUB_DISPATCH_DELAY seconds after submission
+ * (default 0.01). Jobs running "sleep N" finish N*DRMAA2_STUB_TIME_SCALE
+ * seconds after dispatch (default scale 1); other jobs finish right away.
+ * Machines and queues are given as comma-separated names by
+ * DRMAA2_STUB_MACHINES and DRMAA2_STUB_QUEUES.
+ *
+ * Build with:  cc -shared -fPIC -O2 -pthread -o libdrmaa2.so drmaa2_stub.c
+ */
+
+#define _GNU_SOURCE
+#include <errno.h>
+#include <pthread.h>
+#include <stdarg.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+
+/* Basic types and constants. */
+
+typedef char *drmaa2_string;
+typedef long long drmaa2_time;
+typedef int drmaa2_bool;
+typedef int drmaa2_error;
+typedef int drmaa2_jstate;
+typedef int drmaa2_listtype;
+typedef int drmaa2_capability;
+typedef int drmaa2_os;
+typedef int drmaa2_cpu;
+typedef int drmaa2_event;
+
+#define DRMAA2_UNSET_NUM -1
+#define DRMAA2_UNSET_ENUM -1
+#define DRMAA2_UNSET_PRIORITY -99999
+#define DRMAA2_UNSET_TIME -3
+#define DRMAA2_ZERO_TIME 0
+#define DRMAA2_INFINITE_TIME -1
+#define DRMAA2_NOW -2
+
+enum {
+    DRMAA2_SUCCESS = 0, DRMAA2_DENIED_BY_DRMS = 1, DRMAA2_DRM_COMMUNICATION = 2, DRMAA2_TRY_LATER = 3,
+    DRMAA2_SESSION_MANAGEMENT = 4, DRMAA2_TIMEOUT = 5, DRMAA2_INTERNAL = 6, DRMAA2_INVALID_ARGUMENT = 7,
+    DRMAA2_INVALID_SESSION = 8, DRMAA2_INVALID_STATE = 9, DRMAA2_OUT_OF_RESOURCE = 10,
+    DRMAA2_UNSUPPORTED_ATTRIBUTE = 11, DRMAA2_UNSUPPORTED_OPERATION = 12
+};
+
+enum {
+    DRMAA2_UNSET_JSTATE = -1, DRMAA2_UNDETERMINED = 0, DRMAA2_QUEUED = 1, DRMAA2_QUEUED_HELD = 2,
+    DRMAA2_RUNNING = 3, DRMAA2_SUSPENDED = 4, DRMAA2_REQUEUED = 5, DRMAA2_REQUEUED_HELD = 6, DRMAA2_DONE = 7,
+    DRMAA2_FAILED = 8, DRMAA2_RUNNING_HELD = 9
+};
+
+enum {
+    DRMAA2_STRINGLIST = 0, DRMAA2_JOBLIST = 1, DRMAA2_QUEUEINFOLIST = 2, DRMAA2_MACHINEINFOLIST = 3,
+    DRMAA2_SLOTINFOLIST = 4, DRMAA2_RESERVATIONLIST = 5
+};
+
+#define DRMAA2_TRUE 1
+#define DRMAA2_FALSE 0
+#define DRMAA2_X64 8
+#define DRMAA2_LINUX 3
+
+/* Lists and dictionaries. */
+
+typedef void (*drmaa2_list_entryfree)(void **value);
+
+typedef struct {
+    drmaa2_listtype type;
+    long size;
+    long capacity;
+    void **items;
+    drmaa2_list_entryfree free_entry;
+} drmaa2_list_s;
+
+typedef drmaa2_list_s *drmaa2_list;
+typedef drmaa2_list drmaa2_string_list;
+typedef drmaa2_list drmaa2_j_list;
+typedef drmaa2_list drmaa2_r_list;
+
+typedef void (*drmaa2_dict_entryfree)(char **key, char **value);
+
+typedef struct {
+    long size;
+    long capacity;
+    char **keys;
+    char **values;
+    drmaa2_dict_entryfree free_entry;
+} drmaa2_dict_s;
+
+typedef drmaa2_dict_s *drmaa2_dict;
+
+/* Structs; the layouts must match drmaa2/drmaa2_ctypes.py. */
+
+#define DRMAA2_CHAR_BUFFER_SIZE 128
+
+typedef struct {
+    char username[DRMAA2_CHAR_BUFFER_SIZE];
+    char groupname[DRMAA2_CHAR_BUFFER_SIZE];
+    long uid;
+    long gid;
+} drmaa2_sudo;
+
+typedef struct {
+    drmaa2_string jobId;
+    drmaa2_string jobName;
+    int exitStatus;
+    drmaa2_string terminatingSignal;
+    drmaa2_string annotation;
+    drmaa2_jstate jobState;
+    drmaa2_string jobSubState;
+    drmaa2_list allocatedMachines;
+    drmaa2_string submissionMachine;
+    drmaa2_string jobOwner;
+    long long slots;
+    drmaa2_string queueName;
+    drmaa2_time wallclockTime;
+    long long cpuTime;
+    drmaa2_time submissionTime;
+    drmaa2_time dispatchTime;
+    drmaa2_time finishTime;
+    void *implementationSpecific;
+} drmaa2_jinfo;
+
+typedef struct {
+    drmaa2_string machineName;
+    long long slots;
+    void *implementationSpecific;
+} drmaa2_slotinfo;
+
+typedef struct {
+    drmaa2_string reservationId;
+    drmaa2_string reservationName;
+    drmaa2_time reservedStartTime;
+    drmaa2_time reservedEndTime;
+    drmaa2_string_list usersACL;
+    long long reservedSlots;
+    drmaa2_list reservedMachines;
+    void *implementationSpecific;
+} drmaa2_rinfo;
+
+typedef struct {
+    drmaa2_string remoteCommand;
+    drmaa2_string_list args;
+    drmaa2_bool submitAsHold;
+    drmaa2_bool rerunnable;
+    drmaa2_dict jobEnvironment;
+    drmaa2_string workingDirectory;
+    drmaa2_string jobCategory;
+    drmaa2_string_list email;
+    drmaa2_bool emailOnStarted;
+    drmaa2_bool emailOnTerminated;
+    drmaa2_string jobName;
+    drmaa2_string inputPath;
+    drmaa2_string outputPath;
+    drmaa2_string errorPath;
+    drmaa2_bool joinFiles;
+    drmaa2_string reservationId;
+    drmaa2_string queueName;
+    long long minSlots;
+    long long maxSlots;
+    long long priority;
+    drmaa2_string_list candidateMachines;
+    long long minPhysMemory;
+    drmaa2_os machineOS;
+    drmaa2_cpu machineArch;
+    drmaa2_time startTime;
+    drmaa2_time deadlineTime;
+    drmaa2_dict stageInFiles;
+    drmaa2_dict stageOutFiles;
+    drmaa2_dict resourceLimits;
+    drmaa2_string accountingId;
+    void *implementationSpecific;
+} drmaa2_jtemplate;
+
+typedef struct {
+    drmaa2_string reservationName;
+    drmaa2_time startTime;
+    drmaa2_time endTime;
+    drmaa2_time duration;
+    long long minSlots;
+    long long maxSlots;
+    drmaa2_string jobCategory;
+    drmaa2_string_list usersACL;
+    drmaa2_string_list candidateMachines;
+    long long minPhysMemory;
+    drmaa2_os machineOS;
+    drmaa2_cpu machineArch;
+    void *implementationSpecific;
+} drmaa2_rtemplate;
+
+typedef struct {
+    drmaa2_event event;
+    drmaa2_string jobId;
+    drmaa2_string sessionName;
+    drmaa2_jstate jobState;
+    void *implementationSpecific;
+} drmaa2_notification;
+
+typedef struct {
+    drmaa2_string name;
+    void *implementationSpecific;
+} drmaa2_queueinfo;
+
+typedef struct {
+    drmaa2_string major;
+    drmaa2_string minor;
+    void *implementationSpecific;
+} drmaa2_version;
+
+typedef struct {
+    drmaa2_string name;
+    drmaa2_bool available;
+    long long sockets;
+    long long coresPerSocket;
+    long long threadsPerCore;
+    float load;
+    long long physMemory;
+    long long virtMemory;
+    drmaa2_cpu machineArch;
+    drmaa2_version *machineOSVersion;
+    drmaa2_os machineOS;
+    void *implementationSpecific;
+} drmaa2_machineinfo;
+
+typedef struct {
+    drmaa2_string id;
+    drmaa2_string session_name;
+    drmaa2_string job_name;
+} drmaa2_j;
+
+typedef struct {
+    drmaa2_string id;
+    drmaa2_j_list job_list;
+    drmaa2_string session_name;
+} drmaa2_jarray;
+
+typedef struct {
+    drmaa2_string contact;
+    drmaa2_string name;
+} drmaa2_jsession;
+
+typedef struct {
+    drmaa2_string name;
+} drmaa2_msession;
+
+typedef struct {
+    drmaa2_string id;
+    drmaa2_string session_name;
+} drmaa2_r;
+
+typedef struct {
+    drmaa2_string contact;
+    drmaa2_string name;
+} drmaa2_rsession;
+
+typedef void (*drmaa2_callback)(drmaa2_notification *notification);
+
+/* Error handling. */
+
+static __thread drmaa2_error last_error = DRMAA2_SUCCESS;
+static __thread char last_error_text[512];
+
+static void set_error(drmaa2_error code, const char *format, ...)
+{
+    va_list ap;
+    last_error = code;
+    va_start(ap, format);
+    vsnprintf(last_error_text, sizeof(last_error_text), format, ap);
+    va_end(ap);
+}
+
+drmaa2_error drmaa2_lasterror(void)
+{
+    return last_error;
+}
+
+drmaa2_string drmaa2_lasterror_text(void)
+{
+    return last_error_text[0] ? strdup(last_error_text) : NULL;
+}
+
+void drmaa2_string_free(drmaa2_string *string)
+{
+    if (string != NULL) {
+        free(*string);
+        *string = NULL;
+    }
+}
+
+static char *copy_string(const char *s)
+{
+    return s != NULL ? strdup(s) : NULL;
+}
+
+static void free_entry(void **value)
+{
+    free(*value);
+    *value = NULL;
+}
+
+static void free_dict_entry(char **key, char **value)
+{
+    free(*key);
+    free(*value);
+    *key = NULL;
+    *value = NULL;
+}
+
+/* Lists. */
+
+drmaa2_list drmaa2_list_create(const drmaa2_listtype type, const drmaa2_list_entryfree callback)
+{
+    drmaa2_list l = calloc(1, sizeof(drmaa2_list_s));
+    l->type = type;
+    l->free_entry = callback;
+    return l;
+}
+
+void drmaa2_list_free(drmaa2_list *l)
+{
+    long i;
+    if (l == NULL || *l == NULL) {
+        return;
+    }
+    if ((*l)->free_entry != NULL) {
+        for (i = 0; i < (*l)->size; i++) {
+            (*l)->free_entry(&(*l)->items[i]);
+        }
+    }
+    free((*l)->items);
+    free(*l);
+    *l = NULL;
+}
+
+void uge_drmaa2_list_free_root(drmaa2_list *l)
+{
+    if (l == NULL || *l == NULL) {
+        return;
+    }
+    free((*l)->items);
+    free(*l);
+    *l = NULL;
+}
+
+const void *drmaa2_list_get(const drmaa2_list l, long pos)
+{
+    if (l == NULL || pos < 0 || pos >= l->size) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Invalid list position: %ld", pos);
+        return NULL;
+    }
+    return l->items[pos];
+}
+
+drmaa2_error drmaa2_list_add(drmaa2_list l, const void *value)
+{
+    if (l == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "List is NULL");
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    if (l->size == l->capacity) {
+        l->capacity = l->capacity ? 2 * l->capacity : 8;
+        l->items = realloc(l->items, l->capacity * sizeof(void *));
+    }
+    l->items[l->size++] = (void *) value;
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_list_del(drmaa2_list l, long pos)
+{
+    if (l == NULL || pos < 0 || pos >= l->size) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Invalid list position: %ld", pos);
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    if (l->free_entry != NULL) {
+        l->free_entry(&l->items[pos]);
+    }
+    memmove(&l->items[pos], &l->items[pos + 1], (l->size - pos - 1) * sizeof(void *));
+    l->size--;
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error uge_drmaa2_list_set(drmaa2_list l, long pos, const void *value)
+{
+    if (l == NULL || pos < 0 || pos >= l->size) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Invalid list position: %ld", pos);
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    l->items[pos] = (void *) value;
+    return DRMAA2_SUCCESS;
+}
+
+long drmaa2_list_size(const drmaa2_list l)
+{
+    if (l == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "List is NULL");
+        return -1;
+    }
+    return l->size;
+}
+
+static drmaa2_string_list copy_string_list(const drmaa2_string_list l, drmaa2_list_entryfree callback)
+{
+    long i;
+    drmaa2_string_list copy;
+    if (l == NULL) {
+        return NULL;
+    }
+    copy = drmaa2_list_create(DRMAA2_STRINGLIST, callback);
+    for (i = 0; i < l->size; i++) {
+        drmaa2_list_add(copy, copy_string(l->items[i]));
+    }
+    return copy;
+}
+
+static drmaa2_string_list create_string_list(const char *value)
+{
+    drmaa2_string_list l = drmaa2_list_create(DRMAA2_STRINGLIST, free_entry);
+    if (value != NULL) {
+        drmaa2_list_add(l, strdup(value));
+    }
+    return l;
+}
+
+/* Dictionaries. */
+
+drmaa2_dict drmaa2_dict_create(const drmaa2_dict_entryfree callback)
+{
+    drmaa2_dict d = calloc(1, sizeof(drmaa2_dict_s));
+    d->free_entry = callback;
+    return d;
+}
+
+void drmaa2_dict_free(drmaa2_dict *d)
+{
+    long i;
+    if (d == NULL || *d == NULL) {
+        return;
+    }
+    if ((*d)->free_entry != NULL) {
+        for (i = 0; i < (*d)->size; i++) {
+            (*d)->free_entry(&(*d)->keys[i], &(*d)->values[i]);
+        }
+    }
+    free((*d)->keys);
+    free((*d)->values);
+    free(*d);
+    *d = NULL;
+}
+
+static long dict_find(const drmaa2_dict d, const char *key)
+{
+    long i;
+    for (i = 0; i < d->size; i++) {
+        if (strcmp(d->keys[i], key) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+drmaa2_string_list drmaa2_dict_list(const drmaa2_dict d)
+{
+    long i;
+    drmaa2_string_list l;
+    if (d == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Dictionary is NULL");
+        return NULL;
+    }
+    l = drmaa2_list_create(DRMAA2_STRINGLIST, free_entry);
+    for (i = 0; i < d->size; i++) {
+        drmaa2_list_add(l, strdup(d->keys[i]));
+    }
+    return l;
+}
+
+drmaa2_bool drmaa2_dict_has(const drmaa2_dict d, const char *key)
+{
+    return d != NULL && key != NULL && dict_find(d, key) >= 0;
+}
+
+const char *drmaa2_dict_get(const drmaa2_dict d, const char *key)
+{
+    long i;
+    if (d == NULL || key == NULL || (i = dict_find(d, key)) < 0) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Key not found: %s", key ? key : "(null)");
+        return NULL;
+    }
+    return d->values[i];
+}
+
+drmaa2_error drmaa2_dict_del(drmaa2_dict d, const char *key)
+{
+    long i;
+    if (d == NULL || key == NULL || (i = dict_find(d, key)) < 0) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Key not found: %s", key ? key : "(null)");
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    if (d->free_entry != NULL) {
+        d->free_entry(&d->keys[i], &d->values[i]);
+    }
+    d->size--;
+    d->keys[i] = d->keys[d->size];
+    d->values[i] = d->values[d->size];
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_dict_set(drmaa2_dict d, const char *key, const char *value)
+{
+    long i;
+    if (d == NULL || key == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Dictionary or key is NULL");
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    if ((i = dict_find(d, key)) >= 0) {
+        if (d->free_entry != NULL) {
+            d->free_entry(&d->keys[i], &d->values[i]);
+        }
+    } else {
+        if (d->size == d->capacity) {
+            d->capacity = d->capacity ? 2 * d->capacity : 8;
+            d->keys = realloc(d->keys, d->capacity * sizeof(char *));
+            d->values = realloc(d->values, d->capacity * sizeof(char *));
+        }
+        i = d->size++;
+    }
+    d->keys[i] = (char *) key;
+    d->values[i] = (char *) value;
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_dict copy_dict(const drmaa2_dict d, drmaa2_dict_entryfree callback)
+{
+    long i;
+    drmaa2_dict copy;
+    if (d == NULL) {
+        return NULL;
+    }
+    copy = drmaa2_dict_create(callback);
+    for (i = 0; i < d->size; i++) {
+        drmaa2_dict_set(copy, strdup(d->keys[i]), copy_string(d->values[i]));
+    }
+    return copy;
+}
+
+/* Implementation-specific values, keyed by struct address. */
+
+#define IMPL_SPEC_BUCKETS 4096
+
+typedef struct impl_spec_entry {
+    const void *instance;
+    char *key;
+    char *value;
+    struct impl_spec_entry *next;
+} impl_spec_entry;
+
+static impl_spec_entry *impl_spec_table[IMPL_SPEC_BUCKETS];
+static pthread_mutex_t impl_spec_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static unsigned long hash_pointer(const void *p)
+{
+    return (((unsigned long) p) >> 4) % IMPL_SPEC_BUCKETS;
+}
+
+static void impl_spec_remove(const void *instance)
+{
+    impl_spec_entry **e;
+    impl_spec_entry *next;
+    pthread_mutex_lock(&impl_spec_lock);
+    e = &impl_spec_table[hash_pointer(instance)];
+    while (*e != NULL) {
+        if ((*e)->instance == instance) {
+            next = (*e)->next;
+            free((*e)->key);
+            free((*e)->value);
+            free(*e);
+            *e = next;
+        } else {
+            e = &(*e)->next;
+        }
+    }
+    pthread_mutex_unlock(&impl_spec_lock);
+}
+
+static void impl_spec_copy(const void *from, const void *to)
+{
+    impl_spec_entry *e;
+    impl_spec_entry *copy;
+    unsigned long to_bucket = hash_pointer(to);
+    pthread_mutex_lock(&impl_spec_lock);
+    for (e = impl_spec_table[hash_pointer(from)]; e != NULL; e = e->next) {
+        if (e->instance == from) {
+            copy = malloc(sizeof(impl_spec_entry));
+            copy->instance = to;
+            copy->key = strdup(e->key);
+            copy->value = copy_string(e->value);
+            copy->next = impl_spec_table[to_bucket];
+            impl_spec_table[to_bucket] = copy;
+        }
+    }
+    pthread_mutex_unlock(&impl_spec_lock);
+}
+
+drmaa2_string drmaa2_get_instance_value(const void *instance, const char *name)
+{
+    impl_spec_entry *e;
+    char *value = NULL;
+    if (instance == NULL || name == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Instance or name is NULL");
+        return NULL;
+    }
+    pthread_mutex_lock(&impl_spec_lock);
+    for (e = impl_spec_table[hash_pointer(instance)]; e != NULL; e = e->next) {
+        if (e->instance == instance && strcmp(e->key, name) == 0) {
+            value = copy_string(e->value);
+            break;
+        }
+    }
+    pthread_mutex_unlock(&impl_spec_lock);
+    if (e == NULL) {
+        set_error(DRMAA2_UNSUPPORTED_ATTRIBUTE, "Attribute %s is not set", name);
+    }
+    return value;
+}
+
+drmaa2_string drmaa2_describe_attribute(const void *instance, const char *name)
+{
+    if (instance == NULL || name == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Instance or name is NULL");
+        return NULL;
+    }
+    return strdup("Implementation specific attribute of the stub library");
+}
+
+drmaa2_error drmaa2_set_instance_value(void *instance, const char *name, const char *value)
+{
+    impl_spec_entry *e;
+    unsigned long bucket;
+    if (instance == NULL || name == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Instance or name is NULL");
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    bucket = hash_pointer(instance);
+    pthread_mutex_lock(&impl_spec_lock);
+    for (e = impl_spec_table[bucket]; e != NULL; e = e->next) {
+        if (e->instance == instance && strcmp(e->key, name) == 0) {
+            break;
+        }
+    }
+    if (e == NULL) {
+        e = malloc(sizeof(impl_spec_entry));
+        e->instance = instance;
+        e->key = strdup(name);
+        e->value = NULL;
+        e->next = impl_spec_table[bucket];
+        impl_spec_table[bucket] = e;
+    }
+    free(e->value);
+    e->value = copy_string(value);
+    pthread_mutex_unlock(&impl_spec_lock);
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_string_list create_key_list(const char **keys)
+{
+    drmaa2_string_list l = drmaa2_list_create(DRMAA2_STRINGLIST, free_entry);
+    for (; *keys != NULL; keys++) {
+        drmaa2_list_add(l, strdup(*keys));
+    }
+    return l;
+}
+
+static const char *jtemplate_keys[] = {"uge_jt_pe", "uge_jt_native", NULL};
+static const char *jinfo_keys[] = {"uge_ji_failed", "uge_ji_priority", NULL};
+static const char *rtemplate_keys[] = {"uge_rt_native", NULL};
+static const char *rinfo_keys[] = {"uge_ri_state", NULL};
+static const char *version_keys[] = {"uge_version_json", NULL};
+static const char *no_keys[] = {NULL};
+
+drmaa2_string_list drmaa2_jtemplate_impl_spec(void) { return create_key_list(jtemplate_keys); }
+drmaa2_string_list drmaa2_jinfo_impl_spec(void) { return create_key_list(jinfo_keys); }
+drmaa2_string_list drmaa2_rtemplate_impl_spec(void) { return create_key_list(rtemplate_keys); }
+drmaa2_string_list drmaa2_rinfo_impl_spec(void) { return create_key_list(rinfo_keys); }
+drmaa2_string_list drmaa2_queueinfo_impl_spec(void) { return create_key_list(no_keys); }
+drmaa2_string_list drmaa2_machineinfo_impl_spec(void) { return create_key_list(no_keys); }
+drmaa2_string_list drmaa2_slotinfo_impl_spec(void) { return create_key_list(no_keys); }
+drmaa2_string_list drmaa2_notification_impl_spec(void) { return create_key_list(no_keys); }
+drmaa2_string_list drmaa2_version_impl_spec(void) { return create_key_list(version_keys); }
+
+/* Struct creation and release. */
+
+drmaa2_jinfo *drmaa2_jinfo_create(void)
+{
+    drmaa2_jinfo *ji = calloc(1, sizeof(drmaa2_jinfo));
+    ji->exitStatus = DRMAA2_UNSET_NUM;
+    ji->jobState = DRMAA2_UNSET_JSTATE;
+    ji->slots = DRMAA2_UNSET_NUM;
+    ji->wallclockTime = DRMAA2_UNSET_TIME;
+    ji->cpuTime = DRMAA2_UNSET_NUM;
+    ji->submissionTime = DRMAA2_UNSET_TIME;
+    ji->dispatchTime = DRMAA2_UNSET_TIME;
+    ji->finishTime = DRMAA2_UNSET_TIME;
+    return ji;
+}
+
+void drmaa2_jinfo_free(drmaa2_jinfo **ji)
+{
+    if (ji == NULL || *ji == NULL) {
+        return;
+    }
+    free((*ji)->jobId);
+    free((*ji)->jobName);
+    free((*ji)->terminatingSignal);
+    free((*ji)->annotation);
+    free((*ji)->jobSubState);
+    drmaa2_list_free(&(*ji)->allocatedMachines);
+    free((*ji)->submissionMachine);
+    free((*ji)->jobOwner);
+    free((*ji)->queueName);
+    impl_spec_remove(*ji);
+    free(*ji);
+    *ji = NULL;
+}
+
+void drmaa2_slotinfo_free(drmaa2_slotinfo **si)
+{
+    if (si == NULL || *si == NULL) {
+        return;
+    }
+    free((*si)->machineName);
+    free(*si);
+    *si = NULL;
+}
+
+drmaa2_rinfo *drmaa2_rinfo_create(void)
+{
+    drmaa2_rinfo *ri = calloc(1, sizeof(drmaa2_rinfo));
+    ri->reservedStartTime = DRMAA2_UNSET_TIME;
+    ri->reservedEndTime = DRMAA2_UNSET_TIME;
+    ri->reservedSlots = DRMAA2_UNSET_NUM;
+    return ri;
+}
+
+void drmaa2_rinfo_free(drmaa2_rinfo **ri)
+{
+    if (ri == NULL || *ri == NULL) {
+        return;
+    }
+    free((*ri)->reservationId);
+    free((*ri)->reservationName);
+    drmaa2_list_free(&(*ri)->usersACL);
+    drmaa2_list_free(&(*ri)->reservedMachines);
+    impl_spec_remove(*ri);
+    free(*ri);
+    *ri = NULL;
+}
+
+drmaa2_jtemplate *drmaa2_jtemplate_create(void)
+{
+    drmaa2_jtemplate *jt = calloc(1, sizeof(drmaa2_jtemplate));
+    jt->minSlots = DRMAA2_UNSET_NUM;
+    jt->maxSlots = DRMAA2_UNSET_NUM;
+    jt->priority = DRMAA2_UNSET_PRIORITY;
+    jt->minPhysMemory = DRMAA2_UNSET_NUM;
+    jt->machineOS = DRMAA2_UNSET_ENUM;
+    jt->machineArch = DRMAA2_UNSET_ENUM;
+    jt->startTime = DRMAA2_UNSET_TIME;
+    jt->deadlineTime = DRMAA2_UNSET_TIME;
+    return jt;
+}
+
+void drmaa2_jtemplate_free(drmaa2_jtemplate **jt)
+{
+    if (jt == NULL || *jt == NULL) {
+        return;
+    }
+    free((*jt)->remoteCommand);
+    drmaa2_list_free(&(*jt)->args);
+    drmaa2_dict_free(&(*jt)->jobEnvironment);
+    free((*jt)->workingDirectory);
+    free((*jt)->jobCategory);
+    drmaa2_list_free(&(*jt)->email);
+    free((*jt)->jobName);
+    free((*jt)->inputPath);
+    free((*jt)->outputPath);
+    free((*jt)->errorPath);
+    free((*jt)->reservationId);
+    free((*jt)->queueName);
+    drmaa2_list_free(&(*jt)->candidateMachines);
+    drmaa2_dict_free(&(*jt)->stageInFiles);
+    drmaa2_dict_free(&(*jt)->stageOutFiles);
+    drmaa2_dict_free(&(*jt)->resourceLimits);
+    free((*jt)->accountingId);
+    impl_spec_remove(*jt);
+    free(*jt);
+    *jt = NULL;
+}
+
+/*
+ * Templates returned to the caller use lists and dictionaries without
+ * entry callbacks, since the caller may replace their entries with
+ * strings it owns; the copied entries are not released.
+ */
+static drmaa2_jtemplate *copy_jtemplate(const drmaa2_jtemplate *jt, int owned)
+{
+    drmaa2_list_entryfree list_callback = owned ? free_entry : NULL;
+    drmaa2_dict_entryfree dict_callback = owned ? free_dict_entry : NULL;
+    drmaa2_jtemplate *copy = malloc(sizeof(drmaa2_jtemplate));
+    *copy = *jt;
+    copy->remoteCommand = copy_string(jt->remoteCommand);
+    copy->args = copy_string_list(jt->args, list_callback);
+    copy->jobEnvironment = copy_dict(jt->jobEnvironment, dict_callback);
+    copy->workingDirectory = copy_string(jt->workingDirectory);
+    copy->jobCategory = copy_string(jt->jobCategory);
+    copy->email = copy_string_list(jt->email, list_callback);
+    copy->jobName = copy_string(jt->jobName);
+    copy->inputPath = copy_string(jt->inputPath);
+    copy->outputPath = copy_string(jt->outputPath);
+    copy->errorPath = copy_string(jt->errorPath);
+    copy->reservationId = copy_string(jt->reservationId);
+    copy->queueName = copy_string(jt->queueName);
+    copy->candidateMachines = copy_string_list(jt->candidateMachines, list_callback);
+    copy->stageInFiles = copy_dict(jt->stageInFiles, dict_callback);
+    copy->stageOutFiles = copy_dict(jt->stageOutFiles, dict_callback);
+    copy->resourceLimits = copy_dict(jt->resourceLimits, dict_callback);
+    copy->accountingId = copy_string(jt->accountingId);
+    impl_spec_copy(jt, copy);
+    return copy;
+}
+
+drmaa2_rtemplate *drmaa2_rtemplate_create(void)
+{
+    drmaa2_rtemplate *rt = calloc(1, sizeof(drmaa2_rtemplate));
+    rt->startTime = DRMAA2_UNSET_TIME;
+    rt->endTime = DRMAA2_UNSET_TIME;
+    rt->duration = DRMAA2_UNSET_TIME;
+    rt->minSlots = DRMAA2_UNSET_NUM;
+    rt->maxSlots = DRMAA2_UNSET_NUM;
+    rt->minPhysMemory = DRMAA2_UNSET_NUM;
+    rt->machineOS = DRMAA2_UNSET_ENUM;
+    rt->machineArch = DRMAA2_UNSET_ENUM;
+    return rt;
+}
+
+void drmaa2_rtemplate_free(drmaa2_rtemplate **rt)
+{
+    if (rt == NULL || *rt == NULL) {
+        return;
+    }
+    free((*rt)->reservationName);
+    free((*rt)->jobCategory);
+    drmaa2_list_free(&(*rt)->usersACL);
+    drmaa2_list_free(&(*rt)->candidateMachines);
+    impl_spec_remove(*rt);
+    free(*rt);
+    *rt = NULL;
+}
+
+static drmaa2_rtemplate *copy_rtemplate(const drmaa2_rtemplate *rt, int owned)
+{
+    drmaa2_list_entryfree list_callback = owned ? free_entry : NULL;
+    drmaa2_rtemplate *copy = malloc(sizeof(drmaa2_rtemplate));
+    *copy = *rt;
+    copy->reservationName = copy_string(rt->reservationName);
+    copy->jobCategory = copy_string(rt->jobCategory);
+    copy->usersACL = copy_string_list(rt->usersACL, list_callback);
+    copy->candidateMachines = copy_string_list(rt->candidateMachines, list_callback);
+    impl_spec_copy(rt, copy);
+    return copy;
+}
+
+void drmaa2_queueinfo_free(drmaa2_queueinfo **qi)
+{
+    if (qi == NULL || *qi == NULL) {
+        return;
+    }
+    free((*qi)->name);
+    impl_spec_remove(*qi);
+    free(*qi);
+    *qi = NULL;
+}
+
+void drmaa2_version_free(drmaa2_version **v)
+{
+    if (v == NULL || *v == NULL) {
+        return;
+    }
+    free((*v)->major);
+    free((*v)->minor);
+    impl_spec_remove(*v);
+    free(*v);
+    *v = NULL;
+}
+
+void drmaa2_machineinfo_free(drmaa2_machineinfo **mi)
+{
+    if (mi == NULL || *mi == NULL) {
+        return;
+    }
+    free((*mi)->name);
+    drmaa2_version_free(&(*mi)->machineOSVersion);
+    impl_spec_remove(*mi);
+    free(*mi);
+    *mi = NULL;
+}
+
+void drmaa2_notification_free(drmaa2_notification **n)
+{
+    if (n == NULL || *n == NULL) {
+        return;
+    }
+    free((*n)->jobId);
+    free((*n)->sessionName);
+    free(*n);
+    *n = NULL;
+}
+
+void drmaa2_jsession_free(drmaa2_jsession **js)
+{
+    if (js == NULL || *js == NULL) {
+        return;
+    }
+    free((*js)->contact);
+    free((*js)->name);
+    free(*js);
+    *js = NULL;
+}
+
+void drmaa2_rsession_free(drmaa2_rsession **rs)
+{
+    if (rs == NULL || *rs == NULL) {
+        return;
+    }
+    free((*rs)->contact);
+    free((*rs)->name);
+    free(*rs);
+    *rs = NULL;
+}
+
+void drmaa2_msession_free(drmaa2_msession **ms)
+{
+    if (ms == NULL || *ms == NULL) {
+        return;
+    }
+    free((*ms)->name);
+    free(*ms);
+    *ms = NULL;
+}
+
+void drmaa2_j_free(drmaa2_j **j)
+{
+    if (j == NULL || *j == NULL) {
+        return;
+    }
+    free((*j)->id);
+    free((*j)->session_name);
+    free((*j)->job_name);
+    free(*j);
+    *j = NULL;
+}
+
+void drmaa2_jarray_free(drmaa2_jarray **ja)
+{
+    if (ja == NULL || *ja == NULL) {
+        return;
+    }
+    free((*ja)->id);
+    drmaa2_list_free(&(*ja)->job_list);
+    free((*ja)->session_name);
+    free(*ja);
+    *ja = NULL;
+}
+
+void drmaa2_r_free(drmaa2_r **r)
+{
+    if (r == NULL || *r == NULL) {
+        return;
+    }
+    free((*r)->id);
+    free((*r)->session_name);
+    free(*r);
+    *r = NULL;
+}
+
+static void free_j_entry(void **value)
+{
+    drmaa2_j_free((drmaa2_j **) value);
+}
+
+static void free_r_entry(void **value)
+{
+    drmaa2_r_free((drmaa2_r **) value);
+}
+
+static void free_queueinfo_entry(void **value)
+{
+    drmaa2_queueinfo_free((drmaa2_queueinfo **) value);
+}
+
+static void free_machineinfo_entry(void **value)
+{
+    drmaa2_machineinfo_free((drmaa2_machineinfo **) value);
+}
+
+/* Simulated DRM state; all of it is protected by state_lock. */
+
+typedef struct job_array_rec job_array_rec;
+
+typedef struct {
+    char *id;
+    char *session_name;
+    char *job_name;
+    char *host;
+    drmaa2_jtemplate *jt;
+    job_array_rec *array;
+    double submission_time;
+    double queued_until;
+    double start_time;
+    double finish_time;
+    double duration;
+    double suspend_time;
+    double suspended_total;
+    int held;
+    int suspended;
+    int terminated;
+    int reaped;
+    drmaa2_jstate state;
+} job_rec;
+
+struct job_array_rec {
+    char *id;
+    char *session_name;
+    drmaa2_jtemplate *jt;
+    long long max_parallel;
+    long n_tasks;
+    job_rec **tasks;
+};
+
+typedef struct {
+    char *id;
+    char *session_name;
+    drmaa2_rtemplate *rt;
+    char *host;
+    drmaa2_time start_time;
+    drmaa2_time end_time;
+    long long slots;
+    int terminated;
+} reservation_rec;
+
+typedef struct {
+    long size;
+    long capacity;
+    void **items;
+} vector;
+
+static pthread_mutex_t state_lock = PTHREAD_MUTEX_INITIALIZER;
+static vector jsessions;
+static vector rsessions;
+static vector jobs;
+static vector job_arrays;
+static vector reservations;
+static job_rec **job_table;
+static unsigned long job_table_size;
+static long long next_id = 1;
+
+static double time_scale = 1.0;
+static double dispatch_delay = 0.01;
+static char *machine_names[64];
+static int n_machines;
+static char *queue_names[64];
+static int n_queues;
+static char host_name[256];
+static char user_name[256];
+
+static void vector_add(vector *v, void *item)
+{
+    if (v->size == v->capacity) {
+        v->capacity = v->capacity ? 2 * v->capacity : 16;
+        v->items = realloc(v->items, v->capacity * sizeof(void *));
+    }
+    v->items[v->size++] = item;
+}
+
+static long vector_find_string(const vector *v, const char *s)
+{
+    long i;
+    for (i = 0; i < v->size; i++) {
+        if (strcmp(v->items[i], s) == 0) {
+            return i;
+        }
+    }
+    return -1;
+}
+
+static double get_time(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+static int split_names(const char *value, char **names, int max_names)
+{
+    int n = 0;
+    char *copy = strdup(value);
+    char *saveptr = NULL;
+    char *name = strtok_r(copy, ", ", &saveptr);
+    while (name != NULL && n < max_names) {
+        names[n++] = strdup(name);
+        name = strtok_r(NULL, ", ", &saveptr);
+    }
+    free(copy);
+    return n;
+}
+
+static void lock_state(void)
+{
+    pthread_mutex_lock(&state_lock);
+}
+
+static void unlock_state(void)
+{
+    pthread_mutex_unlock(&state_lock);
+}
+
+static void before_fork(void)
+{
+    pthread_mutex_lock(&impl_spec_lock);
+    pthread_mutex_lock(&state_lock);
+}
+
+static void after_fork_in_parent(void)
+{
+    pthread_mutex_unlock(&state_lock);
+    pthread_mutex_unlock(&impl_spec_lock);
+}
+
+static void after_fork_in_child(void)
+{
+    pthread_mutex_unlock(&state_lock);
+    pthread_mutex_unlock(&impl_spec_lock);
+    /* Ids of jobs submitted by the child must not clash with the parent's. */
+    next_id = (long long) getpid() * 100000;
+}
+
+__attribute__((constructor))
+static void initialize(void)
+{
+    const char *value;
+    if ((value = getenv("DRMAA2_STUB_TIME_SCALE")) != NULL) {
+        time_scale = atof(value);
+    }
+    if ((value = getenv("DRMAA2_STUB_DISPATCH_DELAY")) != NULL) {
+        dispatch_delay = atof(value);
+    }
+    value = getenv("DRMAA2_STUB_MACHINES");
+    n_machines = split_names(value ? value : "node01,node02,node03,node04", machine_names, 64);
+    value = getenv("DRMAA2_STUB_QUEUES");
+    n_queues = split_names(value ? value : "all.q,short.q", queue_names, 64);
+    if (gethostname(host_name, sizeof(host_name)) != 0) {
+        strcpy(host_name, "localhost");
+    }
+    value = getenv("USER");
+    snprintf(user_name, sizeof(user_name), "%s", value ? value : "nobody");
+    pthread_atfork(before_fork, after_fork_in_parent, after_fork_in_child);
+}
+
+/* Job table: open addressing hash map from job id to job record. */
+
+static unsigned long hash_string(const char *s)
+{
+    unsigned long h = 5381;
+    while (*s) {
+        h = h * 33 + (unsigned char) *s++;
+    }
+    return h;
+}
+
+static void job_table_insert(job_rec *job)
+{
+    unsigned long i;
+    job_rec **old_table = job_table;
+    unsigned long old_size = job_table_size;
+    if (2 * (jobs.size + 1) > (long) job_table_size) {
+        job_table_size = job_table_size ? 2 * job_table_size : 1024;
+        job_table = calloc(job_table_size, sizeof(job_rec *));
+        for (i = 0; i < old_size; i++) {
+            if (old_table[i] != NULL) {
+                unsigned long j = hash_string(old_table[i]->id) % job_table_size;
+                while (job_table[j] != NULL) {
+                    j = (j + 1) % job_table_size;
+                }
+                job_table[j] = old_table[i];
+            }
+        }
+        free(old_table);
+    }
+    i = hash_string(job->id) % job_table_size;
+    while (job_table[i] != NULL) {
+        i = (i + 1) % job_table_size;
+    }
+    job_table[i] = job;
+    vector_add(&jobs, job);
+}
+
+static job_rec *find_job(const char *id)
+{
+    unsigned long i;
+    if (id == NULL || job_table_size == 0) {
+        return NULL;
+    }
+    i = hash_string(id) % job_table_size;
+    while (job_table[i] != NULL) {
+        if (strcmp(job_table[i]->id, id) == 0) {
+            return job_table[i];
+        }
+        i = (i + 1) % job_table_size;
+    }
+    return NULL;
+}
+
+static job_rec *find_job_checked(const drmaa2_j *j)
+{
+    job_rec *job;
+    if (j == NULL || j->id == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job is NULL");
+        return NULL;
+    }
+    if ((job = find_job(j->id)) == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job %s does not exist", j->id);
+    }
+    return job;
+}
+
+/* Job lifecycle. */
+
+static int is_final(drmaa2_jstate state)
+{
+    return state == DRMAA2_DONE || state == DRMAA2_FAILED;
+}
+
+static int is_started(drmaa2_jstate state)
+{
+    return state == DRMAA2_RUNNING || state == DRMAA2_SUSPENDED || state == DRMAA2_RUNNING_HELD || is_final(state);
+}
+
+static int is_running_at(const job_rec *job, double now)
+{
+    return job->start_time >= 0 && !job->terminated &&
+           (job->suspended || now - job->start_time - job->suspended_total < job->duration);
+}
+
+static int can_start(const job_rec *job, double now)
+{
+    long i;
+    long running = 0;
+    job_array_rec *array = job->array;
+    if (array == NULL || array->max_parallel <= 0) {
+        return 1;
+    }
+    for (i = 0; i < array->n_tasks; i++) {
+        if (array->tasks[i] != job && is_running_at(array->tasks[i], now)) {
+            running++;
+        }
+    }
+    return running < array->max_parallel;
+}
+
+static void update_job(job_rec *job, double now)
+{
+    if (is_final(job->state)) {
+        return;
+    }
+    if (job->start_time < 0) {
+        if (job->held) {
+            job->state = DRMAA2_QUEUED_HELD;
+            return;
+        }
+        if (now < job->queued_until || !can_start(job, now)) {
+            job->state = DRMAA2_QUEUED;
+            return;
+        }
+        job->start_time = job->array != NULL && job->array->max_parallel > 0 ? now : job->queued_until;
+    }
+    if (job->suspended) {
+        job->state = DRMAA2_SUSPENDED;
+        return;
+    }
+    if (now - job->start_time - job->suspended_total >= job->duration) {
+        job->finish_time = job->start_time + job->suspended_total + job->duration;
+        job->held = 0;
+        job->state = DRMAA2_DONE;
+        return;
+    }
+    job->state = job->held ? DRMAA2_RUNNING_HELD : DRMAA2_RUNNING;
+}
+
+static double get_duration(const drmaa2_jtemplate *jt)
+{
+    const char *command = jt->remoteCommand;
+    const char *base = strrchr(command, '/');
+    base = base != NULL ? base + 1 : command;
+    if (strcmp(base, "sleep") == 0 && jt->args != NULL && jt->args->size > 0 && jt->args->items[0] != NULL) {
+        return atof(jt->args->items[0]) * time_scale;
+    }
+    return 0;
+}
+
+static job_rec *create_job(const char *id, const char *session_name, const drmaa2_jtemplate *jt, double now)
+{
+    const char *base;
+    job_rec *job = calloc(1, sizeof(job_rec));
+    job->id = strdup(id);
+    job->session_name = strdup(session_name);
+    if (jt->jobName != NULL) {
+        job->job_name = strdup(jt->jobName);
+    } else {
+        base = strrchr(jt->remoteCommand, '/');
+        job->job_name = strdup(base != NULL ? base + 1 : jt->remoteCommand);
+    }
+    job->host = machine_names[(jobs.size) % (n_machines > 0 ? n_machines : 1)];
+    job->jt = copy_jtemplate(jt, 1);
+    job->submission_time = now;
+    job->queued_until = now + dispatch_delay;
+    job->start_time = -1;
+    job->finish_time = -1;
+    job->duration = get_duration(jt);
+    job->held = jt->submitAsHold == DRMAA2_TRUE;
+    job->state = job->held ? DRMAA2_QUEUED_HELD : DRMAA2_QUEUED;
+    job_table_insert(job);
+    return job;
+}
+
+static drmaa2_j *create_j(const job_rec *job)
+{
+    drmaa2_j *j = malloc(sizeof(drmaa2_j));
+    j->id = strdup(job->id);
+    j->session_name = strdup(job->session_name);
+    j->job_name = strdup(job->job_name);
+    return j;
+}
+
+static drmaa2_error hold_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (is_final(job->state)) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s has finished", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    job->held = 1;
+    update_job(job, now);
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_error release_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (is_final(job->state)) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s has finished", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    if (job->held) {
+        job->held = 0;
+        if (job->start_time < 0) {
+            job->queued_until = now + dispatch_delay;
+        }
+    }
+    update_job(job, now);
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_error suspend_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (job->state != DRMAA2_RUNNING && job->state != DRMAA2_RUNNING_HELD) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s is not running", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    job->suspended = 1;
+    job->suspend_time = now;
+    job->state = DRMAA2_SUSPENDED;
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_error resume_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (job->state != DRMAA2_SUSPENDED) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s is not suspended", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    job->suspended = 0;
+    job->suspended_total += now - job->suspend_time;
+    update_job(job, now);
+    return DRMAA2_SUCCESS;
+}
+
+static drmaa2_error terminate_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (is_final(job->state)) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s has finished", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    if (job->suspended) {
+        job->suspended = 0;
+        job->suspended_total += now - job->suspend_time;
+    }
+    job->terminated = 1;
+    job->finish_time = now;
+    job->state = DRMAA2_FAILED;
+    return DRMAA2_SUCCESS;
+}
+
+typedef drmaa2_error (*job_operation)(job_rec *job, double now);
+
+static drmaa2_error apply_to_job(const drmaa2_j *j, job_operation operation)
+{
+    job_rec *job;
+    drmaa2_error rc = DRMAA2_INVALID_ARGUMENT;
+    lock_state();
+    if ((job = find_job_checked(j)) != NULL) {
+        rc = operation(job, get_time());
+    }
+    unlock_state();
+    return rc;
+}
+
+/* Sessions. */
+
+static int check_name(const char *name)
+{
+    if (name == NULL || name[0] == '\0') {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Session name is empty");
+        return 0;
+    }
+    return 1;
+}
+
+static drmaa2_error create_session(vector *sessions, const char *name)
+{
+    drmaa2_error rc = DRMAA2_SUCCESS;
+    if (!check_name(name)) {
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    lock_state();
+    if (vector_find_string(sessions, name) >= 0) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Session %s already exists", name);
+        rc = DRMAA2_INVALID_ARGUMENT;
+    } else {
+        vector_add(sessions, strdup(name));
+    }
+    unlock_state();
+    return rc;
+}
+
+static drmaa2_error open_session(vector *sessions, const char *name)
+{
+    drmaa2_error rc = DRMAA2_SUCCESS;
+    if (!check_name(name)) {
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    lock_state();
+    if (vector_find_string(sessions, name) < 0) {
+        set_error(DRMAA2_INVALID_SESSION, "Session %s does not exist", name);
+        rc = DRMAA2_INVALID_SESSION;
+    }
+    unlock_state();
+    return rc;
+}
+
+static drmaa2_error destroy_session(vector *sessions, const char *name)
+{
+    long i;
+    drmaa2_error rc = DRMAA2_SUCCESS;
+    if (!check_name(name)) {
+        return DRMAA2_INVALID_ARGUMENT;
+    }
+    lock_state();
+    if ((i = vector_find_string(sessions, name)) < 0) {
+        set_error(DRMAA2_INVALID_SESSION, "Session %s does not exist", name);
+        rc = DRMAA2_INVALID_SESSION;
+    } else {
+        free(sessions->items[i]);
+        sessions->items[i] = sessions->items[--sessions->size];
+    }
+    unlock_state();
+    return rc;
+}
+
+static drmaa2_string_list get_session_names(const vector *sessions)
+{
+    long i;
+    drmaa2_string_list l = drmaa2_list_create(DRMAA2_STRINGLIST, free_entry);
+    lock_state();
+    for (i = 0; i < sessions->size; i++) {
+        drmaa2_list_add(l, strdup(sessions->items[i]));
+    }
+    unlock_state();
+    return l;
+}
+
+/* Caller must hold the state lock. */
+static int check_session(const vector *sessions, const char *name)
+{
+    if (name == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is closed");
+        return 0;
+    }
+    if (vector_find_string(sessions, name) < 0) {
+        set_error(DRMAA2_INVALID_SESSION, "Session %s does not exist", name);
+        return 0;
+    }
+    return 1;
+}
+
+drmaa2_jsession *drmaa2_create_jsession(const char *session_name, const char *contact)
+{
+    drmaa2_jsession *js;
+    if (create_session(&jsessions, session_name) != DRMAA2_SUCCESS) {
+        return NULL;
+    }
+    js = malloc(sizeof(drmaa2_jsession));
+    js->contact = copy_string(contact);
+    js->name = strdup(session_name);
+    return js;
+}
+
+drmaa2_jsession *drmaa2_create_jsession_as(const drmaa2_sudo *sudo, const char *session_name, const char *contact)
+{
+    return drmaa2_create_jsession(session_name, contact);
+}
+
+drmaa2_rsession *drmaa2_create_rsession(const char *session_name, const char *contact)
+{
+    drmaa2_rsession *rs;
+    if (create_session(&rsessions, session_name) != DRMAA2_SUCCESS) {
+        return NULL;
+    }
+    rs = malloc(sizeof(drmaa2_rsession));
+    rs->contact = copy_string(contact);
+    rs->name = strdup(session_name);
+    return rs;
+}
+
+drmaa2_rsession *drmaa2_create_rsession_as(const drmaa2_sudo *sudo, const char *session_name, const char *contact)
+{
+    return drmaa2_create_rsession(session_name, contact);
+}
+
+drmaa2_jsession *drmaa2_open_jsession(const char *session_name)
+{
+    drmaa2_jsession *js;
+    if (open_session(&jsessions, session_name) != DRMAA2_SUCCESS) {
+        return NULL;
+    }
+    js = malloc(sizeof(drmaa2_jsession));
+    js->contact = NULL;
+    js->name = strdup(session_name);
+    return js;
+}
+
+drmaa2_rsession *drmaa2_open_rsession(const char *session_name)
+{
+    drmaa2_rsession *rs;
+    if (open_session(&rsessions, session_name) != DRMAA2_SUCCESS) {
+        return NULL;
+    }
+    rs = malloc(sizeof(drmaa2_rsession));
+    rs->contact = NULL;
+    rs->name = strdup(session_name);
+    return rs;
+}
+
+drmaa2_msession *drmaa2_open_msession(const char *session_name)
+{
+    drmaa2_msession *ms = malloc(sizeof(drmaa2_msession));
+    ms->name = copy_string(session_name);
+    return ms;
+}
+
+drmaa2_error drmaa2_close_jsession(drmaa2_jsession *js)
+{
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return DRMAA2_INVALID_SESSION;
+    }
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_close_rsession(drmaa2_rsession *rs)
+{
+    if (rs == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return DRMAA2_INVALID_SESSION;
+    }
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_close_msession(drmaa2_msession *ms)
+{
+    if (ms == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return DRMAA2_INVALID_SESSION;
+    }
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_destroy_jsession(const char *session_name)
+{
+    return destroy_session(&jsessions, session_name);
+}
+
+drmaa2_error drmaa2_destroy_jsession_as(const drmaa2_sudo *sudo, const char *session_name)
+{
+    return destroy_session(&jsessions, session_name);
+}
+
+drmaa2_error drmaa2_destroy_rsession(const char *session_name)
+{
+    return destroy_session(&rsessions, session_name);
+}
+
+drmaa2_error drmaa2_destroy_rsession_as(const drmaa2_sudo *sudo, const char *session_name)
+{
+    return destroy_session(&rsessions, session_name);
+}
+
+drmaa2_string_list drmaa2_get_jsession_names(void)
+{
+    return get_session_names(&jsessions);
+}
+
+drmaa2_string_list drmaa2_get_rsession_names(void)
+{
+    return get_session_names(&rsessions);
+}
+
+drmaa2_string drmaa2_jsession_get_contact(const drmaa2_jsession *js)
+{
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return copy_string(js->contact);
+}
+
+drmaa2_string drmaa2_jsession_get_session_name(const drmaa2_jsession *js)
+{
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return copy_string(js->name);
+}
+
+drmaa2_string drmaa2_rsession_get_contact(const drmaa2_rsession *rs)
+{
+    if (rs == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return copy_string(rs->contact);
+}
+
+drmaa2_string drmaa2_rsession_get_session_name(const drmaa2_rsession *rs)
+{
+    if (rs == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return copy_string(rs->name);
+}
+
+/* Job sessions. */
+
+drmaa2_string_list drmaa2_jsession_get_job_categories(const drmaa2_jsession *js)
+{
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return drmaa2_list_create(DRMAA2_STRINGLIST, free_entry);
+}
+
+static int match_string(const char *filter, const char *value)
+{
+    return filter == NULL || (value != NULL && strcmp(filter, value) == 0);
+}
+
+/* Caller must hold the state lock. */
+static int match_job(job_rec *job, const drmaa2_jinfo *filter, double now)
+{
+    if (filter == NULL) {
+        return 1;
+    }
+    update_job(job, now);
+    return match_string(filter->jobId, job->id) && match_string(filter->jobName, job->job_name) &&
+           match_string(filter->jobOwner, user_name) &&
+           match_string(filter->queueName, job->start_time >= 0 ? queue_names[0] : NULL) &&
+           (filter->jobState < 0 || filter->jobState == job->state);
+}
+
+static drmaa2_j_list get_jobs(const char *session_name, const drmaa2_jinfo *filter)
+{
+    long i;
+    job_rec *job;
+    double now = get_time();
+    drmaa2_j_list l = drmaa2_list_create(DRMAA2_JOBLIST, free_j_entry);
+    lock_state();
+    for (i = 0; i < jobs.size; i++) {
+        job = jobs.items[i];
+        if (!job->reaped && (session_name == NULL || strcmp(job->session_name, session_name) == 0) &&
+            match_job(job, filter, now)) {
+            drmaa2_list_add(l, create_j(job));
+        }
+    }
+    unlock_state();
+    return l;
+}
+
+drmaa2_j_list drmaa2_jsession_get_jobs(const drmaa2_jsession *js, const drmaa2_jinfo *filter)
+{
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return get_jobs(js->name, filter);
+}
+
+static int check_template(const drmaa2_jtemplate *jt)
+{
+    if (jt == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job template is NULL");
+        return 0;
+    }
+    if (jt->remoteCommand == NULL || jt->remoteCommand[0] == '\0') {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job template has no remote command");
+        return 0;
+    }
+    return 1;
+}
+
+drmaa2_j *drmaa2_jsession_run_job(const drmaa2_jsession *js, const drmaa2_jtemplate *jt)
+{
+    char id[32];
+    drmaa2_j *j = NULL;
+    if (!check_template(jt)) {
+        return NULL;
+    }
+    lock_state();
+    if (check_session(&jsessions, js ? js->name : NULL)) {
+        snprintf(id, sizeof(id), "%lld", next_id++);
+        j = create_j(create_job(id, js->name, jt, get_time()));
+    }
+    unlock_state();
+    return j;
+}
+
+drmaa2_j *drmaa2_jsession_run_job_as(const drmaa2_sudo *sudo, const drmaa2_jsession *js, const drmaa2_jtemplate *jt)
+{
+    return drmaa2_jsession_run_job(js, jt);
+}
+
+/* Caller must hold the state lock. */
+static drmaa2_jarray *create_jarray(const job_array_rec *array)
+{
+    long i;
+    drmaa2_jarray *ja = malloc(sizeof(drmaa2_jarray));
+    ja->id = strdup(array->id);
+    ja->session_name = strdup(array->session_name);
+    ja->job_list = drmaa2_list_create(DRMAA2_JOBLIST, free_j_entry);
+    for (i = 0; i < array->n_tasks; i++) {
+        drmaa2_list_add(ja->job_list, create_j(array->tasks[i]));
+    }
+    return ja;
+}
+
+drmaa2_jarray *drmaa2_jsession_run_bulk_jobs(const drmaa2_jsession *js, const drmaa2_jtemplate *jt,
+                                             long long begin_index, long long end_index, long long step,
+                                             long long max_parallel)
+{
+    char id[64];
+    long long i;
+    double now;
+    job_array_rec *array;
+    drmaa2_jarray *ja = NULL;
+    if (!check_template(jt)) {
+        return NULL;
+    }
+    if (begin_index < 1 || end_index < begin_index || step < 1) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Invalid bulk job indices: %lld-%lld:%lld", begin_index, end_index,
+                  step);
+        return NULL;
+    }
+    lock_state();
+    if (check_session(&jsessions, js ? js->name : NULL)) {
+        now = get_time();
+        array = calloc(1, sizeof(job_array_rec));
+        snprintf(id, sizeof(id), "%lld", next_id++);
+        array->id = strdup(id);
+        array->session_name = strdup(js->name);
+        array->jt = copy_jtemplate(jt, 1);
+        array->max_parallel = max_parallel;
+        array->tasks = malloc(((end_index - begin_index) / step + 1) * sizeof(job_rec *));
+        for (i = begin_index; i <= end_index; i += step) {
+            snprintf(id, sizeof(id), "%s.%lld", array->id, i);
+            array->tasks[array->n_tasks] = create_job(id, js->name, jt, now);
+            array->tasks[array->n_tasks]->array = array;
+            array->n_tasks++;
+        }
+        vector_add(&job_arrays, array);
+        ja = create_jarray(array);
+    }
+    unlock_state();
+    return ja;
+}
+
+drmaa2_jarray *drmaa2_jsession_run_bulk_jobs_as(const drmaa2_sudo *sudo, const drmaa2_jsession *js,
+                                                const drmaa2_jtemplate *jt, long long begin_index,
+                                                long long end_index, long long step, long long max_parallel)
+{
+    return drmaa2_jsession_run_bulk_jobs(js, jt, begin_index, end_index, step, max_parallel);
+}
+
+/* Caller must hold the state lock. */
+static job_array_rec *find_job_array(const char *id)
+{
+    long i;
+    job_array_rec *array;
+    for (i = 0; id != NULL && i < job_arrays.size; i++) {
+        array = job_arrays.items[i];
+        if (strcmp(array->id, id) == 0) {
+            return array;
+        }
+    }
+    set_error(DRMAA2_INVALID_ARGUMENT, "Job array %s does not exist", id ? id : "(null)");
+    return NULL;
+}
+
+drmaa2_jarray *drmaa2_jsession_get_job_array(const drmaa2_jsession *js, const char *job_array_id)
+{
+    job_array_rec *array;
+    drmaa2_jarray *ja = NULL;
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((array = find_job_array(job_array_id)) != NULL) {
+        ja = create_jarray(array);
+    }
+    unlock_state();
+    return ja;
+}
+
+static int wait_done(const job_rec *job, int terminated)
+{
+    return terminated ? is_final(job->state) : is_started(job->state);
+}
+
+/*
+ * Wait until any (or all) of the jobs have started (or terminated). The
+ * state lock is released while sleeping. Returns the index of the first
+ * job found, or -1 on error or timeout.
+ */
+static long wait_jobs(const drmaa2_j_list l, drmaa2_time timeout, int terminated, int all)
+{
+    long i;
+    long found;
+    job_rec *job;
+    double now = get_time();
+    double deadline = timeout == DRMAA2_INFINITE_TIME ? -1 : now + (timeout > 0 ? timeout : 0);
+    struct timespec poll_interval = {0, 1000000};
+    if (l == NULL || l->size == 0) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job list is empty");
+        return -1;
+    }
+    for (;;) {
+        found = -1;
+        lock_state();
+        now = get_time();
+        for (i = 0; i < l->size; i++) {
+            if ((job = find_job_checked(l->items[i])) == NULL) {
+                unlock_state();
+                return -1;
+            }
+            update_job(job, now);
+            if (wait_done(job, terminated)) {
+                if (found < 0) {
+                    found = i;
+                }
+                if (!all) {
+                    break;
+                }
+            } else if (all) {
+                found = -1;
+                break;
+            }
+        }
+        unlock_state();
+        if (found >= 0) {
+            return found;
+        }
+        if (deadline >= 0 && now >= deadline) {
+            set_error(DRMAA2_TIMEOUT, "Timeout while waiting for jobs");
+            return -1;
+        }
+        nanosleep(&poll_interval, NULL);
+    }
+}
+
+static drmaa2_j *wait_any(const drmaa2_jsession *js, const drmaa2_j_list l, drmaa2_time timeout, int terminated)
+{
+    long i;
+    drmaa2_j *j = NULL;
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    if ((i = wait_jobs(l, timeout, terminated, 0)) < 0) {
+        return NULL;
+    }
+    lock_state();
+    j = create_j(find_job(((drmaa2_j *) l->items[i])->id));
+    unlock_state();
+    return j;
+}
+
+static drmaa2_j_list wait_all(const drmaa2_jsession *js, const drmaa2_j_list l, drmaa2_time timeout,
+                              int terminated)
+{
+    long i;
+    drmaa2_j_list result;
+    if (js == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    if (wait_jobs(l, timeout, terminated, 1) < 0) {
+        return NULL;
+    }
+    result = drmaa2_list_create(DRMAA2_JOBLIST, free_j_entry);
+    lock_state();
+    for (i = 0; i < l->size; i++) {
+        drmaa2_list_add(result, create_j(find_job(((drmaa2_j *) l->items[i])->id)));
+    }
+    unlock_state();
+    return result;
+}
+
+drmaa2_j *drmaa2_jsession_wait_any_started(const drmaa2_jsession *js, const drmaa2_j_list l, drmaa2_time timeout)
+{
+    return wait_any(js, l, timeout, 0);
+}
+
+drmaa2_j *drmaa2_jsession_wait_any_terminated(const drmaa2_jsession *js, const drmaa2_j_list l,
+                                              drmaa2_time timeout)
+{
+    return wait_any(js, l, timeout, 1);
+}
+
+drmaa2_j_list drmaa2_jsession_wait_all_started(const drmaa2_jsession *js, const drmaa2_j_list l,
+                                               drmaa2_time timeout)
+{
+    return wait_all(js, l, timeout, 0);
+}
+
+drmaa2_j_list drmaa2_jsession_wait_all_terminated(const drmaa2_jsession *js, const drmaa2_j_list l,
+                                                  drmaa2_time timeout)
+{
+    return wait_all(js, l, timeout, 1);
+}
+
+/* Jobs. */
+
+drmaa2_error drmaa2_j_suspend(drmaa2_j *j) { return apply_to_job(j, suspend_job); }
+drmaa2_error drmaa2_j_suspend_as(const drmaa2_sudo *sudo, drmaa2_j *j) { return apply_to_job(j, suspend_job); }
+drmaa2_error drmaa2_j_resume(drmaa2_j *j) { return apply_to_job(j, resume_job); }
+drmaa2_error drmaa2_j_resume_as(const drmaa2_sudo *sudo, drmaa2_j *j) { return apply_to_job(j, resume_job); }
+drmaa2_error drmaa2_j_hold(drmaa2_j *j) { return apply_to_job(j, hold_job); }
+drmaa2_error drmaa2_j_hold_as(const drmaa2_sudo *sudo, drmaa2_j *j) { return apply_to_job(j, hold_job); }
+drmaa2_error drmaa2_j_release(drmaa2_j *j) { return apply_to_job(j, release_job); }
+drmaa2_error drmaa2_j_release_as(const drmaa2_sudo *sudo, drmaa2_j *j) { return apply_to_job(j, release_job); }
+drmaa2_error drmaa2_j_terminate(drmaa2_j *j) { return apply_to_job(j, terminate_job); }
+drmaa2_error drmaa2_j_terminate_forced(drmaa2_j *j) { return apply_to_job(j, terminate_job); }
+drmaa2_error drmaa2_j_terminate_all(drmaa2_j *j) { return apply_to_job(j, terminate_job); }
+drmaa2_error drmaa2_j_terminate_forced_all(drmaa2_j *j) { return apply_to_job(j, terminate_job); }
+
+drmaa2_error drmaa2_j_terminate_as(const drmaa2_sudo *sudo, drmaa2_j *j, drmaa2_bool forced)
+{
+    return apply_to_job(j, terminate_job);
+}
+
+drmaa2_error drmaa2_j_terminate_all_as(const drmaa2_sudo *sudo, drmaa2_j *j, drmaa2_bool forced)
+{
+    return apply_to_job(j, terminate_job);
+}
+
+static drmaa2_error reap_job(job_rec *job, double now)
+{
+    update_job(job, now);
+    if (!is_final(job->state)) {
+        set_error(DRMAA2_INVALID_STATE, "Job %s has not finished", job->id);
+        return DRMAA2_INVALID_STATE;
+    }
+    job->reaped = 1;
+    return DRMAA2_SUCCESS;
+}
+
+drmaa2_error drmaa2_j_reap(drmaa2_j *j)
+{
+    return apply_to_job(j, reap_job);
+}
+
+drmaa2_string drmaa2_j_get_id(const drmaa2_j *j)
+{
+    if (j == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job is NULL");
+        return NULL;
+    }
+    return copy_string(j->id);
+}
+
+drmaa2_string drmaa2_j_get_session_name(const drmaa2_j *j)
+{
+    if (j == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job is NULL");
+        return NULL;
+    }
+    return copy_string(j->session_name);
+}
+
+drmaa2_jtemplate *drmaa2_j_get_jtemplate(const drmaa2_j *j)
+{
+    job_rec *job;
+    drmaa2_jtemplate *jt = NULL;
+    lock_state();
+    if ((job = find_job_checked(j)) != NULL) {
+        jt = copy_jtemplate(job->jt, 0);
+    }
+    unlock_state();
+    return jt;
+}
+
+drmaa2_jstate drmaa2_j_get_state(const drmaa2_j *j, drmaa2_string *substate)
+{
+    job_rec *job;
+    drmaa2_jstate state = DRMAA2_UNSET_JSTATE;
+    if (substate != NULL) {
+        *substate = NULL;
+    }
+    lock_state();
+    if ((job = find_job_checked(j)) != NULL) {
+        update_job(job, get_time());
+        state = job->state;
+    }
+    unlock_state();
+    return state;
+}
+
+/* Caller must hold the state lock. */
+static drmaa2_jinfo *create_jinfo(job_rec *job, double now)
+{
+    drmaa2_jinfo *ji = drmaa2_jinfo_create();
+    update_job(job, now);
+    ji->jobId = strdup(job->id);
+    ji->jobName = strdup(job->job_name);
+    ji->jobState = job->state;
+    ji->submissionMachine = strdup(host_name);
+    ji->jobOwner = strdup(user_name);
+    ji->submissionTime = (drmaa2_time) job->submission_time;
+    if (job->start_time >= 0) {
+        ji->allocatedMachines = create_string_list(job->host);
+        ji->slots = 1;
+        ji->queueName = strdup(queue_names[0]);
+        ji->dispatchTime = (drmaa2_time) job->start_time;
+        ji->wallclockTime = (drmaa2_time) ((is_final(job->state) ? job->finish_time : now) - job->start_time);
+        ji->cpuTime = 0;
+    }
+    if (is_final(job->state)) {
+        ji->finishTime = (drmaa2_time) job->finish_time;
+        ji->exitStatus = job->terminated ? 137 : 0;
+        if (job->terminated) {
+            ji->terminatingSignal = strdup("SIGKILL");
+        }
+    }
+    return ji;
+}
+
+drmaa2_jinfo *drmaa2_j_get_info(const drmaa2_j *j)
+{
+    job_rec *job;
+    drmaa2_jinfo *ji = NULL;
+    lock_state();
+    if ((job = find_job_checked(j)) != NULL) {
+        ji = create_jinfo(job, get_time());
+    }
+    unlock_state();
+    return ji;
+}
+
+static drmaa2_error wait_job(const drmaa2_j *j, drmaa2_time timeout, int terminated)
+{
+    drmaa2_j_list l = drmaa2_list_create(DRMAA2_JOBLIST, NULL);
+    drmaa2_error rc = DRMAA2_SUCCESS;
+    drmaa2_list_add(l, j);
+    if (wait_jobs(l, timeout, terminated, 0) < 0) {
+        rc = last_error;
+    }
+    drmaa2_list_free(&l);
+    return rc;
+}
+
+drmaa2_error drmaa2_j_wait_started(const drmaa2_j *j, const drmaa2_time timeout)
+{
+    return wait_job(j, timeout, 0);
+}
+
+drmaa2_error drmaa2_j_wait_terminated(const drmaa2_j *j, const drmaa2_time timeout)
+{
+    return wait_job(j, timeout, 1);
+}
+
+/* Job arrays. */
+
+static drmaa2_error apply_to_job_array(const drmaa2_jarray *ja, job_operation operation)
+{
+    long i;
+    long n_applied = 0;
+    double now;
+    job_array_rec *array;
+    drmaa2_error rc = DRMAA2_INVALID_ARGUMENT;
+    if (ja == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job array is NULL");
+        return rc;
+    }
+    lock_state();
+    if ((array = find_job_array(ja->id)) != NULL) {
+        now = get_time();
+        /* Tasks in a state the operation does not apply to are skipped. */
+        for (i = 0; i < array->n_tasks; i++) {
+            if (operation(array->tasks[i], now) == DRMAA2_SUCCESS) {
+                n_applied++;
+            }
+        }
+        rc = DRMAA2_SUCCESS;
+        if (n_applied == 0) {
+            set_error(DRMAA2_INVALID_STATE, "Operation does not apply to any task of job array %s", array->id);
+            rc = DRMAA2_INVALID_STATE;
+        }
+    }
+    unlock_state();
+    return rc;
+}
+
+drmaa2_error drmaa2_jarray_suspend(drmaa2_jarray *ja) { return apply_to_job_array(ja, suspend_job); }
+drmaa2_error drmaa2_jarray_resume(drmaa2_jarray *ja) { return apply_to_job_array(ja, resume_job); }
+drmaa2_error drmaa2_jarray_hold(drmaa2_jarray *ja) { return apply_to_job_array(ja, hold_job); }
+drmaa2_error drmaa2_jarray_release(drmaa2_jarray *ja) { return apply_to_job_array(ja, release_job); }
+drmaa2_error drmaa2_jarray_terminate(drmaa2_jarray *ja) { return apply_to_job_array(ja, terminate_job); }
+drmaa2_error drmaa2_jarray_terminate_all(drmaa2_jarray *ja) { return apply_to_job_array(ja, terminate_job); }
+drmaa2_error drmaa2_jarray_reap(drmaa2_jarray *ja) { return apply_to_job_array(ja, reap_job); }
+
+drmaa2_error drmaa2_jarray_suspend_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, suspend_job);
+}
+
+drmaa2_error drmaa2_jarray_resume_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, resume_job);
+}
+
+drmaa2_error drmaa2_jarray_hold_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, hold_job);
+}
+
+drmaa2_error drmaa2_jarray_release_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, release_job);
+}
+
+drmaa2_error drmaa2_jarray_terminate_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, terminate_job);
+}
+
+drmaa2_error drmaa2_jarray_terminate_all_as(const drmaa2_sudo *sudo, drmaa2_jarray *ja)
+{
+    return apply_to_job_array(ja, terminate_job);
+}
+
+drmaa2_string drmaa2_jarray_get_id(const drmaa2_jarray *ja)
+{
+    if (ja == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job array is NULL");
+        return NULL;
+    }
+    return copy_string(ja->id);
+}
+
+drmaa2_string drmaa2_jarray_get_session_name(const drmaa2_jarray *ja)
+{
+    if (ja == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job array is NULL");
+        return NULL;
+    }
+    return copy_string(ja->session_name);
+}
+
+drmaa2_j_list drmaa2_jarray_get_jobs(const drmaa2_jarray *ja)
+{
+    job_array_rec *array;
+    drmaa2_jarray *copy;
+    drmaa2_j_list l = NULL;
+    if (ja == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job array is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((array = find_job_array(ja->id)) != NULL) {
+        copy = create_jarray(array);
+        l = copy->job_list;
+        copy->job_list = NULL;
+        drmaa2_jarray_free(&copy);
+    }
+    unlock_state();
+    return l;
+}
+
+drmaa2_jtemplate *drmaa2_jarray_get_jtemplate(const drmaa2_jarray *ja)
+{
+    job_array_rec *array;
+    drmaa2_jtemplate *jt = NULL;
+    if (ja == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Job array is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((array = find_job_array(ja->id)) != NULL) {
+        jt = copy_jtemplate(array->jt, 0);
+    }
+    unlock_state();
+    return jt;
+}
+
+/* Reservations. */
+
+static drmaa2_r *create_r(const reservation_rec *reservation)
+{
+    drmaa2_r *r = malloc(sizeof(drmaa2_r));
+    r->id = strdup(reservation->id);
+    r->session_name = strdup(reservation->session_name);
+    return r;
+}
+
+/* Caller must hold the state lock. */
+static reservation_rec *find_reservation(const char *id)
+{
+    long i;
+    reservation_rec *reservation;
+    for (i = 0; id != NULL && i < reservations.size; i++) {
+        reservation = reservations.items[i];
+        if (!reservation->terminated && strcmp(reservation->id, id) == 0) {
+            return reservation;
+        }
+    }
+    set_error(DRMAA2_INVALID_ARGUMENT, "Reservation %s does not exist", id ? id : "(null)");
+    return NULL;
+}
+
+drmaa2_r *drmaa2_rsession_request_reservation(const drmaa2_rsession *rs, const drmaa2_rtemplate *rt)
+{
+    char id[32];
+    drmaa2_time now;
+    reservation_rec *reservation;
+    drmaa2_r *r = NULL;
+    if (rt == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation template is NULL");
+        return NULL;
+    }
+    lock_state();
+    if (check_session(&rsessions, rs ? rs->name : NULL)) {
+        now = (drmaa2_time) get_time();
+        reservation = calloc(1, sizeof(reservation_rec));
+        snprintf(id, sizeof(id), "%lld", next_id++);
+        reservation->id = strdup(id);
+        reservation->session_name = strdup(rs->name);
+        reservation->rt = copy_rtemplate(rt, 1);
+        reservation->host = machine_names[reservations.size % (n_machines > 0 ? n_machines : 1)];
+        reservation->start_time = rt->startTime >= 0 ? rt->startTime : now;
+        if (rt->duration >= 0) {
+            reservation->end_time = reservation->start_time + rt->duration;
+        } else {
+            reservation->end_time = rt->endTime >= 0 ? rt->endTime : DRMAA2_UNSET_TIME;
+        }
+        reservation->slots = rt->minSlots > 0 ? rt->minSlots : 1;
+        vector_add(&reservations, reservation);
+        r = create_r(reservation);
+    }
+    unlock_state();
+    return r;
+}
+
+drmaa2_r *drmaa2_rsession_request_reservation_as(const drmaa2_sudo *sudo, const drmaa2_rsession *rs,
+                                                 const drmaa2_rtemplate *rt)
+{
+    return drmaa2_rsession_request_reservation(rs, rt);
+}
+
+drmaa2_r *drmaa2_rsession_get_reservation(const drmaa2_rsession *rs, const char *reservation_id)
+{
+    reservation_rec *reservation;
+    drmaa2_r *r = NULL;
+    if (rs == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((reservation = find_reservation(reservation_id)) != NULL) {
+        r = create_r(reservation);
+    }
+    unlock_state();
+    return r;
+}
+
+/* Caller must hold the state lock. */
+static int match_reservation(const reservation_rec *reservation, const drmaa2_rinfo *filter)
+{
+    return filter == NULL || (match_string(filter->reservationId, reservation->id) &&
+                              match_string(filter->reservationName, reservation->rt->reservationName));
+}
+
+static drmaa2_r_list get_reservations(const char *session_name, const drmaa2_rinfo *filter)
+{
+    long i;
+    reservation_rec *reservation;
+    drmaa2_r_list l = drmaa2_list_create(DRMAA2_RESERVATIONLIST, free_r_entry);
+    lock_state();
+    for (i = 0; i < reservations.size; i++) {
+        reservation = reservations.items[i];
+        if (!reservation->terminated &&
+            (session_name == NULL || strcmp(reservation->session_name, session_name) == 0) &&
+            match_reservation(reservation, filter)) {
+            drmaa2_list_add(l, create_r(reservation));
+        }
+    }
+    unlock_state();
+    return l;
+}
+
+drmaa2_r_list drmaa2_rsession_get_reservations(const drmaa2_rsession *rs)
+{
+    if (rs == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return get_reservations(rs->name, NULL);
+}
+
+drmaa2_string drmaa2_r_get_id(const drmaa2_r *r)
+{
+    if (r == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation is NULL");
+        return NULL;
+    }
+    return copy_string(r->id);
+}
+
+drmaa2_string drmaa2_r_get_session_name(const drmaa2_r *r)
+{
+    if (r == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation is NULL");
+        return NULL;
+    }
+    return copy_string(r->session_name);
+}
+
+drmaa2_rtemplate *drmaa2_r_get_rtemplate(const drmaa2_r *r)
+{
+    reservation_rec *reservation;
+    drmaa2_rtemplate *rt = NULL;
+    if (r == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((reservation = find_reservation(r->id)) != NULL) {
+        rt = copy_rtemplate(reservation->rt, 0);
+    }
+    unlock_state();
+    return rt;
+}
+
+drmaa2_rtemplate *drmaa2_r_get_reservation_template(const drmaa2_r *r)
+{
+    return drmaa2_r_get_rtemplate(r);
+}
+
+drmaa2_rinfo *drmaa2_r_get_info(const drmaa2_r *r)
+{
+    reservation_rec *reservation;
+    drmaa2_rinfo *ri = NULL;
+    if (r == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation is NULL");
+        return NULL;
+    }
+    lock_state();
+    if ((reservation = find_reservation(r->id)) != NULL) {
+        ri = drmaa2_rinfo_create();
+        ri->reservationId = strdup(reservation->id);
+        ri->reservationName = copy_string(reservation->rt->reservationName);
+        ri->reservedStartTime = reservation->start_time;
+        ri->reservedEndTime = reservation->end_time;
+        ri->usersACL = reservation->rt->usersACL != NULL ? copy_string_list(reservation->rt->usersACL, free_entry)
+                                                         : create_string_list(user_name);
+        ri->reservedSlots = reservation->slots;
+        ri->reservedMachines = create_string_list(reservation->host);
+    }
+    unlock_state();
+    return ri;
+}
+
+static drmaa2_error terminate_reservation(const drmaa2_r *r)
+{
+    reservation_rec *reservation;
+    drmaa2_error rc = DRMAA2_INVALID_ARGUMENT;
+    if (r == NULL) {
+        set_error(DRMAA2_INVALID_ARGUMENT, "Reservation is NULL");
+        return rc;
+    }
+    lock_state();
+    if ((reservation = find_reservation(r->id)) != NULL) {
+        reservation->terminated = 1;
+        rc = DRMAA2_SUCCESS;
+    }
+    unlock_state();
+    return rc;
+}
+
+drmaa2_error drmaa2_r_terminate(drmaa2_r *r)
+{
+    return terminate_reservation(r);
+}
+
+drmaa2_error drmaa2_r_terminate_as(const drmaa2_sudo *sudo, drmaa2_r *r)
+{
+    return terminate_reservation(r);
+}
+
+/* Monitoring sessions. */
+
+drmaa2_r_list drmaa2_msession_get_all_reservations(const drmaa2_msession *ms, const drmaa2_rinfo *filter)
+{
+    if (ms == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return get_reservations(NULL, filter);
+}
+
+drmaa2_j_list drmaa2_msession_get_all_jobs(const drmaa2_msession *ms, const drmaa2_jinfo *filter)
+{
+    if (ms == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    return get_jobs(NULL, filter);
+}
+
+static int in_filter(const drmaa2_string_list names, const char *name)
+{
+    long i;
+    if (names == NULL || names->size == 0) {
+        return 1;
+    }
+    for (i = 0; i < names->size; i++) {
+        if (names->items[i] != NULL && strcmp(names->items[i], name) == 0) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+drmaa2_list drmaa2_msession_get_all_queues(const drmaa2_msession *ms, const drmaa2_string_list names)
+{
+    int i;
+    drmaa2_queueinfo *qi;
+    drmaa2_list l;
+    if (ms == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    l = drmaa2_list_create(DRMAA2_QUEUEINFOLIST, free_queueinfo_entry);
+    for (i = 0; i < n_queues; i++) {
+        if (in_filter(names, queue_names[i])) {
+            qi = calloc(1, sizeof(drmaa2_queueinfo));
+            qi->name = strdup(queue_names[i]);
+            drmaa2_list_add(l, qi);
+        }
+    }
+    return l;
+}
+
+drmaa2_list drmaa2_msession_get_all_machines(const drmaa2_msession *ms, const drmaa2_string_list names)
+{
+    int i;
+    long k;
+    long running;
+    double now;
+    drmaa2_machineinfo *mi;
+    drmaa2_list l;
+    if (ms == NULL) {
+        set_error(DRMAA2_INVALID_SESSION, "Session is NULL");
+        return NULL;
+    }
+    l = drmaa2_list_create(DRMAA2_MACHINEINFOLIST, free_machineinfo_entry);
+    lock_state();
+    now = get_time();
+    for (i = 0; i < n_machines; i++) {
+        if (!in_filter(names, machine_names[i])) {
+            continue;
+        }
+        running = 0;
+        for (k = 0; k < jobs.size; k++) {
+            job_rec *job = jobs.items[k];
+            if (job->host == machine_names[i] && is_running_at(job, now) && !job->suspended) {
+                running++;
+            }
+        }
+        mi = calloc(1, sizeof(drmaa2_machineinfo));
+        mi->name = strdup(machine_names[i]);
+        mi->available = DRMAA2_TRUE;
+        mi->sockets = 2;
+        mi->coresPerSocket = 8;
+        mi->threadsPerCore = 2;
+        mi->load = running / 32.0f;
+        mi->physMemory = 64LL * 1024 * 1024 * 1024;
+        mi->virtMemory = 128LL * 1024 * 1024 * 1024;
+        mi->machineArch = DRMAA2_X64;
+        mi->machineOSVersion = calloc(1, sizeof(drmaa2_version));
+        mi->machineOSVersion->major = strdup("5");
+        mi->machineOSVersion->minor = strdup("15");
+        mi->machineOS = DRMAA2_LINUX;
+        drmaa2_list_add(l, mi);
+    }
+    unlock_state();
+    return l;
+}
+
+/* Library information. */
+
+static drmaa2_version *create_version(const char *major, const char *minor)
+{
+    drmaa2_version *v = calloc(1, sizeof(drmaa2_version));
+    v->major = strdup(major);
+    v->minor = strdup(minor);
+    return v;
+}
+
+drmaa2_string drmaa2_get_drms_name(void)
+{
+    return strdup("DRMAA2 stub");
+}
+
+drmaa2_version *drmaa2_get_drms_version(void)
+{
+    return create_version("1", "0");
+}
+
+drmaa2_string drmaa2_get_drmaa_name(void)
+{
+    return strdup("DRMAA2 stub library");
+}
+
+drmaa2_version *drmaa2_get_drmaa_version(void)
+{
+    return create_version("2", "0");
+}
+
+drmaa2_dict uge_vi_impl_spec_get(const drmaa2_version *v)
+{
+    drmaa2_dict d = drmaa2_dict_create(free_dict_entry);
+    if (v != NULL) {
+        char json[128];
+        snprintf(json, sizeof(json), "{\"major\": \"%s\", \"minor\": \"%s\"}", v->major ? v->major : "",
+                 v->minor ? v->minor : "");
+        drmaa2_dict_set(d, strdup("uge_version_json"), strdup(json));
+    }
+    return d;
+}
+
+drmaa2_bool drmaa2_supports(const drmaa2_capability c)
+{
+    switch (c) {
+        case 0:  /* ADVANCE_RESERVATION */
+        case 1:  /* RESERVE_SLOTS */
+        case 3:  /* BULK_JOBS_MAXPARALLEL */
+        case 7:  /* JT_MAXSLOTS */
+        case 8:  /* JT_ACCOUNTINGID */
+        case 9:  /* RT_STARTNOW */
+        case 10: /* RT_DURATION */
+            return DRMAA2_TRUE;
+        default:
+            return DRMAA2_FALSE;
+    }
+}
+
+drmaa2_error drmaa2_register_event_notification(const drmaa2_callback callback)
+{
+    if (callback == NULL) {
+        return DRMAA2_SUCCESS;
+    }
+    set_error(DRMAA2_UNSUPPORTED_OPERATION, "Event notification is not supported");
+    return DRMAA2_UNSUPPORTED_OPERATION;
+}
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import asyncio
+import threading
+from drmaa2 import Event
+from drmaa2 import JobState
+from drmaa2 import JobStateCache
+from drmaa2 import AsyncJobSession
+from drmaa2 import TimeoutError
+from .test_job_state_cache import StubJob
+from .test_job_state_cache import create_notification
+
+
+class StubJobSession(object):
+    """ Job session that does not call the library. """
+
+    def wait_any_terminated(self, job_list, timeout):
+        job_list[0].wait_terminated(timeout)
+        return job_list[0]
+
+
+class BlockingStubJob(StubJob):
+    """ Job whose wait_terminated() blocks until released. """
+
+    def __init__(self, id, state):
+        StubJob.__init__(self, id, state)
+        self.terminated = threading.Event()
+
+    def wait_terminated(self, timeout):
+        self.terminated.wait()
+
+
+def test_wait_terminated_via_notifications():
+    state_cache = JobStateCache()
+    n_jobs = 1000
+
+    async def wait_all(jobs):
+        async with AsyncJobSession(StubJobSession(), max_workers=2, state_cache=state_cache) as aj_session:
+            tasks = [asyncio.ensure_future(aj_session.wait_terminated(j)) for j in jobs]
+            while state_cache.get_stats()['misses'] < n_jobs:
+                await asyncio.sleep(0.01)
+            notifier = threading.Thread(target=lambda: [state_cache.on_notification(
+                create_notification(Event.NEW_STATE, j.id, JobState.DONE)) for j in jobs])
+            notifier.start()
+            result = await asyncio.gather(*tasks)
+            notifier.join()
+            return result
+
+    jobs = [StubJob(str(i), JobState.RUNNING) for i in range(n_jobs)]
+    assert asyncio.run(wait_all(jobs)) == jobs
+    print('\nWaited for %s jobs using 2 worker threads' % (n_jobs))
+
+
+def test_wait_any_terminated_timeout():
+    state_cache = JobStateCache()
+
+    async def wait_any(jobs):
+        async with AsyncJobSession(StubJobSession(), state_cache=state_cache) as aj_session:
+            await aj_session.wait_any_terminated(jobs, timeout=0)
+
+    try:
+        asyncio.run(wait_any([StubJob('1', JobState.RUNNING), StubJob('2', JobState.QUEUED)]))
+        assert False
+    except TimeoutError:
+        pass
+    print('\nWait timed out')
+
+
+def test_wait_terminated_in_executor():
+    j = BlockingStubJob('1', JobState.RUNNING)
+
+    async def wait(job):
+        async with AsyncJobSession(StubJobSession(), max_workers=1) as aj_session:
+            task = asyncio.ensure_future(aj_session.wait_terminated(job))
+            await asyncio.sleep(0.01)
+            assert not task.done()
+            job.terminated.set()
+            return await task
+
+    assert asyncio.run(wait(j)) is j
+    print('\nWaited for job in executor thread')
+
+
+class CountingAsyncJobSession(AsyncJobSession):
+    """ Async job session counting executor calls. """
+
+    n_calls = 0
+
+    async def run_in_executor(self, function, *args):
+        self.n_calls += 1
+        return await AsyncJobSession.run_in_executor(self, function, *args)
+
+
+def test_wait_any_terminated_single_state_check():
+    state_cache = JobStateCache()
+    jobs = [StubJob(str(i), JobState.RUNNING) for i in range(100)]
+    jobs[-1].state = JobState.DONE
+
+    async def wait_any():
+        async with CountingAsyncJobSession(StubJobSession(), state_cache=state_cache) as aj_session:
+            j = await aj_session.wait_any_terminated(jobs, timeout=10)
+            return (j, aj_session.n_calls)
+
+    (j, n_calls) = asyncio.run(wait_any())
+    assert j is jobs[-1]
+    assert n_calls == 1
+    print('\nChecked states of %s jobs in %s executor call' % (len(jobs), n_calls))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+from drmaa2.byte_string import ByteString
+from drmaa2.byte_string import encode_string
+from drmaa2.byte_string import decode_string
+from drmaa2.drmaa2_ctypes import drmaa2_string
+
+
+def test_codec_matches_byte_string():
+    values = ['abc', u'été', '', b'abc', b'', None, 10, drmaa2_string(b'abc')]
+    for v in values:
+        assert encode_string(v) == ByteString(v).encode()
+        assert decode_string(v) == ByteString(v).decode()
+    assert decode_string(encode_string(u'été')) == u'été'
+    print('\nEncoded values: %s' % ([encode_string(v) for v in values]))
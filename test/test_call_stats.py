@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+from drmaa2.call_stats import CallStats
+
+
+def test_get_bucket():
+    assert CallStats.get_bucket(0) == 0
+    assert CallStats.get_bucket(0.9e-6) == 0
+    assert CallStats.get_bucket(1.5e-6) == 1
+    assert CallStats.get_bucket(3e-6) == 2
+    assert CallStats.get_bucket(1e6) == CallStats.N_BUCKETS - 1
+    for latency in [1e-6, 1e-5, 1e-3, 0.5, 10.0]:
+        bucket = CallStats.get_bucket(latency)
+        assert latency <= CallStats.get_bucket_upper_bound(bucket) * 1.000001
+        assert bucket == 0 or latency >= CallStats.get_bucket_upper_bound(bucket - 1) * 0.999999
+
+
+def test_percentiles():
+    stats = CallStats('f')
+    assert stats.get_percentile(50) is None
+    for i in range(90):
+        stats.record(1e-4)
+    for i in range(10):
+        stats.record(0.1, 3)
+    d = stats.to_dict()
+    assert d['count'] == 100
+    assert d['error_codes'] == {3: 10}
+    assert 1e-4 <= d['p50'] < 2e-4
+    assert 1e-4 <= d['p90'] < 2e-4
+    assert 0.1 <= d['p99'] < 0.2
+    assert abs(d['total_time'] - (90 * 1e-4 + 10 * 0.1)) < 1e-9
+    print('\nGot stats: %s' % (d))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import array
+from drmaa2.columns import Columns
+
+
+def test_to_column():
+    column = Columns.to_column([1, 2, 3], 'q')
+    assert list(column) == [1, 2, 3]
+    column = Columns.to_column(['a', 'b'])
+    assert column == ['a', 'b']
+    print('\nGot column: %s' % (column))
+
+
+def test_to_column_without_numpy():
+    numpy = Columns.get_numpy()
+    Columns._Columns__numpy = None
+    try:
+        column = Columns.to_column([0.5, 1.5], 'd')
+        assert isinstance(column, array.array)
+        assert list(column) == [0.5, 1.5]
+    finally:
+        Columns._Columns__numpy = numpy
+    print('\nGot column without NumPy: %s' % (column))
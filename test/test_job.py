@@ -20,6 +20,9 @@
 
 from drmaa2 import JobState
 from drmaa2 import JobSession
+from drmaa2 import JobInfo
+from drmaa2.job import Job
+from drmaa2.job import JobRef
 from .utils import generate_random_string
 
 
@@ -132,3 +135,67 @@ def test_get_template():
     jt = j.get_template()
     assert jt.job_name == job_name
     print('\nGet template: %s' % (jt))
+
+
+def test_create_from_fields():
+    job_name = 'drmaa2python-%s' % generate_random_string()
+    j = Job.create_from_fields(b'123', b'session', job_name.encode())
+    assert j.id == '123'
+    assert j.session_name == 'session'
+    assert j.job_name == job_name
+    assert j._struct.contents.job_name.value == job_name.encode()
+    print('\nCreated job from fields: %s' % (j))
+
+
+def test_job_ref():
+    session_name = 'drmaa2python-%s' % generate_random_string()
+    js = JobSession(session_name)
+    job_name = 'drmaa2python-%s' % generate_random_string()
+    d = {'remote_command': '/bin/sleep', 'args': ['1'], 'job_name': job_name, 'output_path': '/dev/null', 'join_files': True}
+    j = js.run_job(d)
+    j_refs = js.get_jobs(JobInfo({'job_id': j.id}), as_refs=True)
+    assert len(j_refs) == 1
+    j_ref = j_refs[0]
+    assert isinstance(j_ref, JobRef)
+    assert not hasattr(j_ref, '__dict__')
+    assert (j_ref.id, j_ref.session_name, j_ref.job_name) == (j.id, session_name, job_name)
+    assert j_ref == j and j == j_ref
+    j_ref.wait_terminated()
+    assert j_ref.get_state()[0] == JobState.DONE
+    assert j_ref.get_info().job_name == job_name
+    assert j_ref.to_job().id == j.id
+    print('\nJob reference: %s' % (repr(j_ref)))
+
+
+def test_job_ref_wait():
+    session_name = 'drmaa2python-%s' % generate_random_string()
+    js = JobSession(session_name)
+    d = {'remote_command': '/bin/sleep', 'args': ['1'], 'output_path': '/dev/null', 'join_files': True}
+    ids = set([js.run_job(d).id for i in range(3)])
+    j_refs = js.get_jobs(None, as_refs=True)
+    assert set([j.id for j in j_refs]) == ids
+    assert js.wait_any_started(j_refs, 10).id in ids
+    assert set([j.id for j in js.wait_all_started(j_refs, 10)]) == ids
+    assert js.wait_any_terminated(j_refs, 10).id in ids
+    assert set([j.id for j in js.wait_all_terminated(j_refs, 10)]) == ids
+    terminated = list(js.iter_terminated(j_refs, 10))
+    assert set([j.id for j in terminated]) == ids
+    assert all([isinstance(j, JobRef) for j in terminated])
+    assert j_refs[0] != None
+    assert not (j_refs[0] == 'job')
+    print('\nWaited on job references: %s' % (terminated))
+
+
+def test_field_access_does_not_allocate_struct():
+    j = Job.create_from_fields(b'123', b'session', b'job')
+    k = Job.create_from_fields(b'123', b'session', b'job')
+    j.job_name = 'renamed'
+    assert (j.id, j.session_name, j.job_name) == ('123', 'session', 'renamed')
+    assert str(j) == str({'id': '123', 'job_name': 'renamed', 'session_name': 'session'})
+    assert j != k
+    assert '_struct' not in j.__dict__ and '_struct' not in k.__dict__
+    assert j._struct.contents.job_name.value == b'renamed'
+    j.job_name = 'job'
+    assert j._struct.contents.job_name.value == b'job'
+    assert j == k
+    print('\nJob with lazily allocated struct: %s' % (j))
@@ -195,3 +195,40 @@ def test_implementation_specific_attr():
     ji.implementation_specific = implementation_specific
     assert ji.implementation_specific == implementation_specific
     print('\nJob info object with implementation_specific: %s' % (implementation_specific))
+
+
+def test_to_dict_matches_attributes():
+    ji = JobInfo({'job_name': generate_random_string(), 'slots': 4, 'allocated_machines': ['node01', 'node02'],
+                  'job_state': JobState.RUNNING, 'submission_time': datetime.datetime.now()})
+    d = ji.to_dict()
+    expected = {}
+    for attr_name in JobInfo.get_attribute_names():
+        v = getattr(ji, attr_name)
+        if v is not None:
+            expected[attr_name] = v
+    assert d == expected
+    print('\nJob info dictionary: %s' % (d))
+
+
+def test_field_table_per_subclass():
+    class AnnotatedJobInfo(JobInfo):
+        extra_annotation = JobInfo.StringDescriptor('annotation')
+
+    assert 'extra_annotation' in AnnotatedJobInfo.get_attribute_names()
+    assert 'extra_annotation' not in JobInfo.get_attribute_names()
+    assert len(AnnotatedJobInfo.get_field_table()) == len(JobInfo.get_field_table()) + 1
+    print('\nSubclass attribute names: %s' % (AnnotatedJobInfo.get_attribute_names()))
+
+
+def test_bytes_mode():
+    job_name = generate_random_string()
+    ji = JobInfo({'job_name': job_name, 'allocated_machines': ['node01', 'node02']})
+    ji.bytes_mode = True
+    assert ji.job_name == job_name.encode()
+    assert ji.allocated_machines == [b'node01', b'node02']
+    assert ji.to_dict()['job_name'] == job_name.encode()
+    ji.job_name = b'bytes-name'
+    ji.bytes_mode = False
+    assert ji.job_name == 'bytes-name'
+    assert not JobInfo().bytes_mode
+    print('\nJob info in bytes mode: %s' % (ji))
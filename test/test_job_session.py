@@ -18,9 +18,17 @@
 #######################################################################################
 # ___INFO__MARK_END__
 
+import os
 import random
+import threading
+from ctypes import pointer
+from drmaa2 import InternalError
 from drmaa2 import JobInfo
 from drmaa2 import JobSession
+from drmaa2 import JobTemplate
+from drmaa2 import ProcessPoolSubmitter
+from drmaa2 import RateLimiter
+from drmaa2.drmaa2_ctypes import drmaa2_j
 from .utils import generate_random_string
 from .utils import needs_uge
 
@@ -180,3 +188,186 @@ def test_get_jobs():
     j_list = js.get_jobs(ji2)
     print('Got jobs: %s' % j_list)
     assert len(j_list) >= 1
+
+
+def test_run_jobs():
+    session_name = generate_random_string()
+    js = JobSession(session_name)
+    d = {'remote_command': '/bin/sleep', 'args': ['5'], 'output_path': '/dev/null', 'join_files': True}
+    templates = [d, d, JobTemplate(d), dict(d, args=['6'])]
+    j_list = list(js.run_jobs(templates))
+    assert len(j_list) == len(templates)
+    assert len(set([j.id for j in j_list])) == len(templates)
+    print('\nSubmitted job ids: %s' % [j.id for j in j_list])
+
+
+def test_run_jobs_in_pool():
+    session_name = generate_random_string()
+    js = JobSession(session_name)
+    templates = [{'remote_command': '/bin/sleep', 'args': [str(i)], 'job_name': 'drmaa2python-%s' % i,
+                  'output_path': '/dev/null', 'join_files': True} for i in range(10)]
+    j_list = list(js.run_jobs(templates, max_workers=4))
+    assert len(j_list) == len(templates)
+    for (i, j) in enumerate(j_list):
+        assert j.get_template().job_name == 'drmaa2python-%s' % i
+    print('\nSubmitted job ids: %s' % [j.id for j in j_list])
+
+
+class FailingSubmissionLibrary(object):
+    """ Library wrapper failing one job submission. """
+
+    def __init__(self, drmaa2_lib, fail_at):
+        self.drmaa2_lib = drmaa2_lib
+        self.fail_at = fail_at
+        self.submitted = 0
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.drmaa2_lib, name)
+
+    def drmaa2_jsession_run_job(self, session, template):
+        with self.lock:
+            self.submitted += 1
+            if self.submitted == self.fail_at:
+                raise InternalError('Submission %s failed' % self.fail_at)
+        return self.drmaa2_lib.drmaa2_jsession_run_job(session, template)
+
+
+def test_run_jobs_in_pool_failed_submission():
+    js = JobSession(generate_random_string())
+    templates = [{'remote_command': '/bin/sleep', 'args': [str(i)], 'output_path': '/dev/null',
+                  'join_files': True} for i in range(10)]
+    drmaa2_lib = JobSession.get_drmaa2_library()
+    JobSession.drmaa2_lib = FailingSubmissionLibrary(drmaa2_lib, fail_at=3)
+    j_list = []
+    try:
+        for j in js.run_jobs(templates, max_workers=2):
+            j_list.append(j)
+        assert False, 'InternalError not raised'
+    except InternalError as ex:
+        # Jobs submitted by other in-flight submissions are not lost.
+        submitted = JobSession.drmaa2_lib.submitted
+        assert len(j_list) + len(ex.submitted_jobs) == submitted - 1
+        assert len(set([j.id for j in j_list + ex.submitted_jobs])) == submitted - 1
+        print('\nGot expected error: %s, submitted jobs: %s' % (ex, [j.id for j in ex.submitted_jobs]))
+    finally:
+        JobSession.drmaa2_lib = drmaa2_lib
+
+
+def test_iter_terminated():
+    session_name = generate_random_string()
+    js = JobSession(session_name)
+    templates = [{'remote_command': '/bin/sleep', 'args': [str(i % 3)], 'output_path': '/dev/null',
+                  'join_files': True} for i in range(6)]
+    j_list = list(js.run_jobs(templates))
+    terminated_j_list = list(js.iter_terminated(j_list, timeout=60))
+    assert sorted([j.id for j in terminated_j_list]) == sorted([j.id for j in j_list])
+    for j in terminated_j_list:
+        assert j in j_list
+    print('\nTerminated job ids: %s' % [j.id for j in terminated_j_list])
+
+
+class ForeignJobLibrary(object):
+    """ Library wrapper returning a job that is not in the waited-on list. """
+
+    def __init__(self, drmaa2_lib):
+        self.drmaa2_lib = drmaa2_lib
+
+    def __getattr__(self, name):
+        return getattr(self.drmaa2_lib, name)
+
+    def drmaa2_jsession_wait_any_terminated(self, session, job_list, timeout):
+        return pointer(drmaa2_j(b'foreign', b'session', b'job'))
+
+    def drmaa2_j_free(self, job_ptr):
+        pass
+
+
+class TimeoutRecordingLibrary(ForeignJobLibrary):
+    """ Library wrapper recording wait timeouts. """
+
+    def __init__(self, drmaa2_lib):
+        ForeignJobLibrary.__init__(self, drmaa2_lib)
+        self.timeouts = []
+
+    def drmaa2_jsession_wait_any_terminated(self, session, job_list, timeout):
+        self.timeouts.append(timeout)
+        return self.drmaa2_lib.drmaa2_jsession_wait_any_terminated(session, job_list, timeout)
+
+    def drmaa2_j_free(self, job_ptr):
+        self.drmaa2_lib.drmaa2_j_free(job_ptr)
+
+
+def test_iter_terminated_timeout_rounding():
+    js = JobSession(generate_random_string())
+    d = {'remote_command': '/bin/sleep', 'args': ['0'], 'output_path': '/dev/null', 'join_files': True}
+    j_list = [js.run_job(d) for i in range(3)]
+    drmaa2_lib = JobSession.get_drmaa2_library()
+    JobSession.drmaa2_lib = TimeoutRecordingLibrary(drmaa2_lib)
+    try:
+        assert len(list(js.iter_terminated(j_list, timeout=5))) == 3
+        # Sub-second remainders are rounded up rather than truncated.
+        assert JobSession.drmaa2_lib.timeouts == [5, 5, 5]
+        print('\nWait timeouts: %s' % (JobSession.drmaa2_lib.timeouts))
+    finally:
+        JobSession.drmaa2_lib = drmaa2_lib
+
+
+def test_iter_terminated_foreign_job():
+    js = JobSession(generate_random_string())
+    j = js.run_job({'remote_command': '/bin/sleep', 'args': ['1'], 'output_path': '/dev/null', 'join_files': True})
+    drmaa2_lib = JobSession.get_drmaa2_library()
+    JobSession.drmaa2_lib = ForeignJobLibrary(drmaa2_lib)
+    try:
+        list(js.iter_terminated([j], timeout=10))
+        assert False, 'InternalError not raised'
+    except InternalError as ex:
+        print('\nGot expected error: %s' % (ex))
+    finally:
+        JobSession.drmaa2_lib = drmaa2_lib
+
+
+def test_process_pool_submitter():
+    session_name = generate_random_string()
+    js = JobSession(session_name)
+    templates = [{'remote_command': '/bin/sleep', 'args': [str(i)], 'job_name': 'drmaa2python-%s' % i,
+                  'output_path': '/dev/null', 'join_files': True} for i in range(10)]
+    with ProcessPoolSubmitter(session_name, processes=2) as submitter:
+        j_list = list(submitter.run_jobs(templates, chunk_size=3))
+    assert len(j_list) == len(templates)
+    for (i, j) in enumerate(j_list):
+        assert j.job_name == 'drmaa2python-%s' % i
+    print('\nSubmitted job ids: %s' % [j.id for j in j_list])
+
+
+def test_run_jobs_with_rate_limiter():
+    session_name = generate_random_string()
+    limiter = RateLimiter(rate=5, burst=1)
+    js = JobSession(session_name, rate_limiter=limiter)
+    d = {'remote_command': '/bin/sleep', 'args': ['1'], 'output_path': '/dev/null', 'join_files': True}
+    j_list = list(js.run_jobs([d] * 4))
+    assert len(j_list) == 4
+    assert limiter.get_stats()['waited'] == 3
+    print('\nSubmitted job ids: %s' % [j.id for j in j_list])
+
+
+def test_reopen_after_fork():
+    if not hasattr(os, 'register_at_fork'):
+        return
+    js = JobSession(generate_random_string())
+    d = {'remote_command': '/bin/sleep', 'args': ['1'], 'output_path': '/dev/null', 'join_files': True}
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            # The session is only reopened when used.
+            if '_struct' not in js.__dict__ and JobSession.get_open_session_count() > 0:
+                j = js.run_job(d)
+                if j.id and js.__dict__.get('_struct'):
+                    exit_code = 0
+        finally:
+            os._exit(exit_code)
+    (_, status) = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert js._struct
+    print('\nJob session was reopened lazily in child process %s' % (pid))
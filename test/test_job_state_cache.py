@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import time
+from ctypes import pointer
+from drmaa2 import Event
+from drmaa2 import JobState
+from drmaa2 import JobStateCache
+from drmaa2 import Notification
+from drmaa2.job import Job
+from drmaa2.drmaa2_ctypes import drmaa2_j
+from drmaa2.drmaa2_ctypes import drmaa2_notification
+
+
+class StubJob(Job):
+    """ Job that counts state queries instead of calling the library. """
+
+    def __init__(self, id, state):
+        Job.__init__(self, pointer(drmaa2_j(id.encode(), b'session', b'job')))
+        self.state = state
+        self.n_queries = 0
+
+    def get_state(self):
+        self.n_queries += 1
+        return (self.state, None)
+
+
+def create_notification(event, job_id, job_state=JobState.UNSET_JSTATE):
+    Notification.implementation_specific_keys = []
+    struct = drmaa2_notification(event=int(event), jobId=job_id.encode(), sessionName=b'session',
+                                 jobState=int(job_state))
+    return Notification(pointer(struct))
+
+
+def test_new_state():
+    state_cache = JobStateCache()
+    j = StubJob('1', JobState.QUEUED)
+    assert state_cache.get_state(j)[0] == JobState.QUEUED
+    state_cache.on_notification(create_notification(Event.NEW_STATE, '1', JobState.RUNNING))
+    assert state_cache.get_state(j)[0] == JobState.RUNNING
+    assert j.n_queries == 1
+    stats = state_cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    print('\nGot cache stats: %s' % (stats))
+
+
+def test_invalidating_events():
+    state_cache = JobStateCache()
+    j = StubJob('2', JobState.RUNNING)
+    state_cache.get_state(j)
+    for event in [Event.MIGRATED, Event.ATTRIBUTE_CHANGE]:
+        n_queries = j.n_queries
+        state_cache.on_notification(create_notification(event, '2'))
+        state_cache.get_state(j)
+        assert j.n_queries == n_queries + 1
+    print('\nGot cache stats after invalidating events: %s' % (state_cache.get_stats()))
+
+
+def test_max_age():
+    state_cache = JobStateCache(max_age=0.01)
+    j = StubJob('3', JobState.RUNNING)
+    state_cache.get_state(j)
+    time.sleep(0.02)
+    state_cache.get_state(j)
+    assert j.n_queries == 2
+    j.state = JobState.DONE
+    state_cache.on_notification(create_notification(Event.NEW_STATE, '3', JobState.DONE))
+    time.sleep(0.02)
+    assert state_cache.get_state(j)[0] == JobState.DONE
+    assert j.n_queries == 2
+    print('\nFinal job states do not expire')
+
+
+def test_max_entries():
+    state_cache = JobStateCache(max_entries=2)
+    for job_id in ['4', '5', '6']:
+        state_cache.on_notification(create_notification(Event.NEW_STATE, job_id, JobState.DONE))
+    # Updating an entry makes it the most recent one.
+    state_cache.on_notification(create_notification(Event.NEW_STATE, '5', JobState.DONE))
+    state_cache.on_notification(create_notification(Event.NEW_STATE, '7', JobState.DONE))
+    stats = state_cache.get_stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 2
+    for (job_id, n_queries) in [('5', 0), ('7', 0), ('4', 1)]:
+        j = StubJob(job_id, JobState.DONE)
+        state_cache.get_state(j)
+        assert j.n_queries == n_queries
+    print('\nGot cache stats after evictions: %s' % (state_cache.get_stats()))
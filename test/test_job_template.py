@@ -24,6 +24,8 @@ from drmaa2 import Os
 from drmaa2 import Cpu
 from drmaa2 import JobTemplate
 from drmaa2 import Drmaa2Exception
+from drmaa2 import LibraryManager
+from drmaa2.drmaa2_object import Drmaa2Object
 from drmaa2.drmaa2_constants import POSIX_EPOCH
 from .utils import generate_random_string
 from .utils import generate_random_int
@@ -308,3 +310,51 @@ def test_implementation_specific_attr():
     jt.implementation_specific = implementation_specific
     assert jt.implementation_specific == implementation_specific
     print('\nJob template object with implementation_specific: %s' % (implementation_specific))
+
+
+def test_impl_spec_key_values():
+    keys = JobTemplate.get_implementation_specific_keys()
+    jt = JobTemplate()
+    assert jt.get_impl_spec_key_values() == {}
+    values = {k: generate_random_string() for k in keys}
+    jt.set_impl_spec_key_values(values)
+    assert jt.get_impl_spec_key_values() == values
+    assert jt.get_impl_spec_key_values(keys[:1]) == {keys[0]: values[keys[0]]}
+    jt.set_impl_spec_key_values({keys[0]: None})
+    assert keys[0] not in jt.get_impl_spec_key_values()
+    print('\nJob template implementation specific values: %s' % (jt.get_impl_spec_key_values()))
+
+
+def test_lazy_impl_spec_init():
+    keys = JobTemplate.get_implementation_specific_keys()
+    LibraryManager.enable_instrumentation()
+    Drmaa2Object.enable_lazy_impl_spec_init()
+    try:
+        LibraryManager.reset_stats()
+        jt = JobTemplate({'remote_command': '/bin/sleep', 'args': ['10']})
+        assert 'drmaa2_set_instance_value' not in LibraryManager.get_stats()
+        assert jt.implementation_specific == {}
+        jt.implementation_specific = {keys[0]: 'value'}
+        assert jt.implementation_specific == {keys[0]: 'value'}
+        assert LibraryManager.get_stats()['drmaa2_set_instance_value']['count'] == 1
+    finally:
+        Drmaa2Object.disable_lazy_impl_spec_init()
+        LibraryManager.disable_instrumentation()
+    print('\nLazily initialized job template: %s' % (jt))
+
+
+def test_update():
+    job_environment = {}
+    for _ in range(0, 10):
+        job_environment[generate_random_string().upper()] = generate_random_string()
+    jt = JobTemplate({'remote_command': '/bin/sleep', 'args': ['10'], 'job_environment': job_environment})
+    job_environment2 = dict(job_environment)
+    job_environment2.pop(list(job_environment2.keys())[0])
+    job_environment2[generate_random_string().upper()] = generate_random_string()
+    jt.update(args=['10', '20'], job_environment=job_environment2)
+    assert jt.remote_command == '/bin/sleep'
+    assert jt.args == ['10', '20']
+    assert jt.job_environment == job_environment2
+    jt.update(args=None)
+    assert not jt.args
+    print('\nUpdated job template: %s' % (jt))
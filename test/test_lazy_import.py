@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import os
+import sys
+import subprocess
+
+import drmaa2
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JOB_SESSION_MODULES = ['drmaa2.job_session', 'drmaa2.job', 'drmaa2.job_template', 'drmaa2.job_info']
+RESERVATION_AND_MONITORING_MODULES = ['drmaa2.reservation_session', 'drmaa2.reservation', 'drmaa2.monitoring_session',
+                                      'drmaa2.machine_info', 'drmaa2.queue_info', 'drmaa2.notification',
+                                      'drmaa2.version']
+
+
+def get_imported_modules(statement):
+    """ Run statement with -X importtime and return {imported module: cumulative usec}. """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([PACKAGE_ROOT, env.get('PYTHONPATH', '')])
+    p = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', statement], stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE, env=env)
+    (_, stderr) = p.communicate()
+    assert p.returncode == 0
+    imported_modules = {}
+    for line in stderr.decode().splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        fields = [f.strip() for f in line[len('import time:'):].split('|')]
+        try:
+            imported_modules[fields[2]] = int(fields[1])
+        except ValueError:
+            # Header line
+            pass
+    return imported_modules
+
+
+def test_import_drmaa2_is_lazy():
+    # Guards against eager imports of submodules; import time itself is not asserted.
+    imported_modules = get_imported_modules('import drmaa2')
+    assert 'drmaa2' in imported_modules
+    assert 'drmaa2.library_manager' not in imported_modules
+    for module in JOB_SESSION_MODULES + RESERVATION_AND_MONITORING_MODULES:
+        assert module not in imported_modules
+    print('\nImport time for drmaa2: %s usec' % (imported_modules['drmaa2']))
+
+
+def test_import_job_session_is_lazy():
+    imported_modules = get_imported_modules('from drmaa2 import JobSession')
+    for module in JOB_SESSION_MODULES:
+        assert module in imported_modules
+    for module in RESERVATION_AND_MONITORING_MODULES:
+        assert module not in imported_modules
+    print('\nImport time for drmaa2.JobSession: %s usec' % (imported_modules['drmaa2.job_session']))
+
+
+def test_lazy_attributes():
+    for name in drmaa2.__all__:
+        assert getattr(drmaa2, name) is not None
+    assert drmaa2.get_job_session_names == drmaa2.JobSession.list_session_names
+    assert 'JobSession' in dir(drmaa2)
+    try:
+        drmaa2.NoSuchAttribute
+        assert False
+    except AttributeError:
+        pass
@@ -18,8 +18,19 @@
 #######################################################################################
 # ___INFO__MARK_END__
 
+import os
+import stat
+import shutil
+import tempfile
+import threading
+import ctypes
+import ctypes.util
+from ctypes import c_char_p
+from ctypes import c_size_t
+
 from drmaa2 import LibraryManager
 from drmaa2 import Capability
+from drmaa2.library_manager import Drmaa2Library
 
 
 def test_get_drms_name():
@@ -47,3 +58,198 @@ def test_drmaa_supports():
         print('Support for %s: %s' % (c, s))
     assert len(supported) > 0
     print('DRMAA2 supports %s out of %s capabilities' % (len(supported), len(Capability)))
+
+
+def test_bind_on_demand():
+    libc = ctypes.CDLL(ctypes.util.find_library('c'))
+    lib = Drmaa2Library(libc, prototypes={'strlen': (c_size_t, [c_char_p])})
+    assert lib.get_bound_names() == []
+    assert lib.strlen(b'drmaa2') == 6
+    assert lib.get_bound_names() == ['strlen']
+    assert lib.strlen.argtypes == [c_char_p]
+    print('\nBound functions: %s' % (lib.get_bound_names()))
+
+
+def test_get_drmaa2_library():
+    lm = LibraryManager.get_instance()
+    lib = lm.get_drmaa2_library()
+    # Other tests may have bound functions already.
+    lib.reset()
+    lib.drmaa2_get_drms_name()
+    assert 'drmaa2_get_drms_name' in lib.get_bound_names()
+    assert 'drmaa2_jsession_run_bulk_jobs' not in lib.get_bound_names()
+
+
+def test_find_drmaa2_library_path_cache():
+    tmp_dir = tempfile.mkdtemp()
+    saved_env = dict(os.environ)
+    try:
+        sge_root = os.path.join(tmp_dir, 'sge')
+        lib_dir = os.path.join(sge_root, 'drmaa', 'lib', 'lx-test')
+        os.makedirs(lib_dir)
+        os.makedirs(os.path.join(sge_root, 'util'))
+        lib_path = os.path.join(lib_dir, 'libdrmaa2.so')
+        open(lib_path, 'w').close()
+        # The arch script records each invocation.
+        counter_file = os.path.join(tmp_dir, 'arch_calls')
+        arch_script = os.path.join(sge_root, 'util', 'arch')
+        with open(arch_script, 'w') as f:
+            f.write('#!/bin/sh\necho x >> %s\necho lx-test\n' % counter_file)
+        os.chmod(arch_script, stat.S_IRWXU)
+
+        os.environ.pop('DRMAA2_LIBRARY_PATH', None)
+        os.environ['SGE_ROOT'] = sge_root
+        os.environ['DRMAA2_LIBRARY_PATH_CACHE'] = os.path.join(tmp_dir, 'cache', 'library_path.json')
+        assert LibraryManager.find_drmaa2_library_path() == lib_path
+        assert LibraryManager.find_drmaa2_library_path() == lib_path
+        with open(counter_file) as f:
+            assert len(f.readlines()) == 1
+
+        os.environ['DRMAA2_LIBRARY_PATH'] = '/tmp/libdrmaa2_override.so'
+        assert LibraryManager.find_drmaa2_library_path() == '/tmp/libdrmaa2_override.so'
+
+        os.environ.pop('DRMAA2_LIBRARY_PATH')
+        LibraryManager.clear_library_path_cache()
+        assert LibraryManager.find_drmaa2_library_path() == lib_path
+        with open(counter_file) as f:
+            assert len(f.readlines()) == 2
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        shutil.rmtree(tmp_dir)
+
+
+def test_library_path_cache_write_failure():
+    tmp_dir = tempfile.mkdtemp()
+    saved_env = dict(os.environ)
+    try:
+        sge_root = os.path.join(tmp_dir, 'sge')
+        lib_dir = os.path.join(sge_root, 'drmaa', 'lib', 'lx-test')
+        os.makedirs(lib_dir)
+        os.makedirs(os.path.join(sge_root, 'util'))
+        lib_path = os.path.join(lib_dir, 'libdrmaa2.so')
+        open(lib_path, 'w').close()
+        arch_script = os.path.join(sge_root, 'util', 'arch')
+        with open(arch_script, 'w') as f:
+            f.write('#!/bin/sh\necho lx-test\n')
+        os.chmod(arch_script, stat.S_IRWXU)
+
+        # The cache file path is a directory, so the cache cannot be written.
+        cache_dir = os.path.join(tmp_dir, 'cache')
+        os.makedirs(os.path.join(cache_dir, 'library_path.json'))
+        os.environ.pop('DRMAA2_LIBRARY_PATH', None)
+        os.environ['SGE_ROOT'] = sge_root
+        os.environ['DRMAA2_LIBRARY_PATH_CACHE'] = os.path.join(cache_dir, 'library_path.json')
+        for _ in range(3):
+            assert LibraryManager.find_drmaa2_library_path() == lib_path
+        assert os.listdir(cache_dir) == ['library_path.json']
+        print('\nCache directory contents: %s' % os.listdir(cache_dir))
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+        shutil.rmtree(tmp_dir)
+
+
+class StubErrorLibrary(object):
+    """ Library stub with a process-wide last error; both DRM functions fail. """
+
+    def __init__(self):
+        self.error = (0, b'')
+        self.drmaa2_jsession_run_job = self.fail_with(5, b'error 5')
+        self.drmaa2_open_jsession = self.fail_with(7, b'error 7')
+
+    def fail_with(self, code, message):
+        def function(*args):
+            self.error = (code, message)
+            return None
+
+        return function
+
+    def drmaa2_lasterror(self):
+        return self.error[0]
+
+    def drmaa2_lasterror_text(self):
+        return c_char_p(self.error[1])
+
+    def drmaa2_string_free(self, string_ptr):
+        pass
+
+
+def test_last_error_per_thread():
+    drmaa2_lib = Drmaa2Library(StubErrorLibrary(), prototypes={},
+                               drm_functions=['drmaa2_jsession_run_job', 'drmaa2_open_jsession'])
+    failed = threading.Event()
+    errors = {}
+
+    def run_job():
+        assert not drmaa2_lib.drmaa2_jsession_run_job()
+        failed.set()
+        # Wait for the other thread to overwrite the library last error.
+        t2.join()
+        errors['run_job'] = drmaa2_lib.get_last_error()
+
+    def open_session():
+        failed.wait()
+        assert not drmaa2_lib.drmaa2_open_jsession()
+        errors['open_session'] = drmaa2_lib.get_last_error()
+
+    t1 = threading.Thread(target=run_job)
+    t2 = threading.Thread(target=open_session)
+    t2.start()
+    t1.start()
+    t1.join()
+    assert errors['run_job'] == (5, 'error 5')
+    assert errors['open_session'] == (7, 'error 7')
+    print('\nGot per-thread errors: %s' % (errors))
+
+
+def test_reset_after_fork():
+    if not hasattr(os, 'register_at_fork'):
+        return
+    from drmaa2 import Job
+    from drmaa2.drmaa2_object_descriptors import Drmaa2Descriptor
+    Job.drmaa2_lib = StubErrorLibrary()
+    Drmaa2Descriptor.drmaa2_lib = Job.drmaa2_lib
+    try:
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0 if Job.drmaa2_lib is None and Drmaa2Descriptor.drmaa2_lib is None else 1
+            os._exit(exit_code)
+        (_, status) = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        assert Job.drmaa2_lib is not None
+        print('\nLibrary references were reset in child process %s' % (pid))
+    finally:
+        Job.drmaa2_lib = None
+        Drmaa2Descriptor.drmaa2_lib = None
+
+
+def test_instrumentation():
+    libc = ctypes.CDLL(ctypes.util.find_library('c'))
+    lib = Drmaa2Library(libc, prototypes={'strlen': (c_size_t, [c_char_p])})
+    strlen = lib.strlen
+    lib.enable_instrumentation()
+    for i in range(100):
+        assert lib.strlen(b'drmaa2') == 6
+    stats = lib.get_stats()['strlen']
+    assert stats['count'] == 100
+    assert stats['min_time'] <= stats['p50'] and stats['p50'] <= stats['p99']
+    assert sum([n for (_, n) in stats['histogram']]) == 100
+    print('\nGot strlen stats: %s' % (stats))
+    lib.reset_stats()
+    assert lib.get_stats() == {}
+    lib.disable_instrumentation()
+    # Without instrumentation, the typed library function is bound again.
+    assert type(lib.strlen) == type(strlen)
+    assert lib.get_stats() == {}
+
+
+def test_instrumentation_error_codes():
+    drmaa2_lib = Drmaa2Library(StubErrorLibrary(), prototypes={}, drm_functions=['drmaa2_jsession_run_job'])
+    drmaa2_lib.enable_instrumentation()
+    for i in range(3):
+        drmaa2_lib.drmaa2_jsession_run_job()
+    stats = drmaa2_lib.get_stats()
+    assert stats['drmaa2_jsession_run_job']['error_codes'] == {5: 3}
+    assert 'drmaa2_lasterror' in stats
+    print('\nGot error codes: %s' % (stats['drmaa2_jsession_run_job']['error_codes']))
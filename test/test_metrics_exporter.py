@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import os
+import shutil
+import tempfile
+try:
+    from urllib.request import urlopen
+except ImportError:
+    from urllib2 import urlopen
+
+from drmaa2 import MetricsExporter
+from drmaa2.query_cache import QueryCache
+from drmaa2 import RetryPolicy
+from drmaa2.library_manager import Drmaa2Library
+from .test_retry_policy import FlakyLibrary
+from .test_retry_policy import DRM_FUNCTIONS
+
+
+def create_exporter():
+    drmaa2_lib = Drmaa2Library(FlakyLibrary(2), prototypes={}, drm_functions=DRM_FUNCTIONS,
+                               retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001))
+    drmaa2_lib.enable_instrumentation()
+    drmaa2_lib.drmaa2_jsession_run_job()
+    drmaa2_lib.drmaa2_jsession_run_job()
+    cache = QueryCache()
+    cache.get('get_all_queues', None, lambda: [])
+    cache.get('get_all_queues', None, lambda: [])
+    exporter = MetricsExporter(drmaa2_lib)
+    exporter.add_cache('queues', cache)
+    return exporter
+
+
+def test_render():
+    text = create_exporter().render()
+    print('\n' + text)
+    lines = text.splitlines()
+    assert lines[-1] == '# EOF'
+    assert 'drmaa2_submissions_total{function="drmaa2_jsession_run_job"} 2' in lines
+    assert 'drmaa2_call_duration_seconds_count{function="drmaa2_jsession_run_job"} 2' in lines
+    assert 'drmaa2_call_duration_seconds_bucket{function="drmaa2_jsession_run_job",le="+Inf"} 2' in lines
+    assert 'drmaa2_call_errors_total{code="3",function="drmaa2_jsession_run_job"} 1' in lines
+    assert 'drmaa2_retries_total{function="drmaa2_jsession_run_job"} 1' in lines
+    assert 'drmaa2_retry_outcomes_total{outcome="exhausted"} 1' in lines
+    assert 'drmaa2_cache_hits_total{cache="queues"} 1' in lines
+    assert 'drmaa2_cache_misses_total{cache="queues"} 1' in lines
+    assert 'drmaa2_open_job_sessions 0' in lines
+    for line in lines:
+        if line.startswith('drmaa2_call_duration_seconds_bucket'):
+            assert 'le=' in line
+
+
+def test_write_textfile():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, 'drmaa2.prom')
+        exporter = create_exporter()
+        exporter.write_textfile(path)
+        with open(path) as f:
+            assert f.read().endswith('# EOF\n')
+        assert os.listdir(tmp_dir) == ['drmaa2.prom']
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_http_server():
+    exporter = create_exporter()
+    port = exporter.start_http_server(0, '127.0.0.1')
+    try:
+        response = urlopen('http://127.0.0.1:%s/metrics' % port)
+        assert response.headers['Content-Type'] == MetricsExporter.CONTENT_TYPE
+        text = response.read().decode('utf-8')
+        assert 'drmaa2_submissions_total' in text
+        print('\nGot %s bytes of metrics from port %s' % (len(text), port))
+    finally:
+        exporter.stop_http_server()
@@ -40,6 +40,21 @@ def test_get_all_queues():
         assert q_name in q_name_list
 
 
+@needs_uge
+def test_get_all_queues_cached():
+    q_name_list = os.popen('qconf -sql').read().split()
+    ms = MonitoringSession('ms-01')
+    ms.enable_cache(ttl=60)
+    qi_list = ms.get_all_queues(q_name_list)
+    qi_list2 = ms.get_all_queues(list(reversed(q_name_list)))
+    assert [qi.name for qi in qi_list] == [qi.name for qi in qi_list2]
+    stats = ms.get_cache_stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    print('\nGot cache stats: %s' % (stats))
+    ms.disable_cache()
+
+
 def test_get_all_machines():
     h_name_list = os.popen('qconf -sel').read().split()
     print('\nGot host list: %s' % h_name_list)
@@ -52,6 +67,17 @@ def test_get_all_machines():
         assert h_name in h_name_list
 
 
+def test_get_all_machines_as_columns():
+    h_name_list = os.popen('qconf -sel').read().split()
+    print('\nGot host list: %s' % h_name_list)
+    ms = MonitoringSession('ms-01')
+    columns = ms.get_all_machines(h_name_list, as_columns=True)
+    assert sorted(columns['name']) == sorted(h_name_list)
+    for name in ['load', 'sockets', 'cores_per_socket', 'phys_memory', 'virt_memory']:
+        assert len(columns[name]) == len(h_name_list)
+    print('Got machine columns: %s' % (columns))
+
+
 def test_get_all_jobs():
     js = JobSession('js-01')
     j_name = 'drmaa2python-%s' % int(random.uniform(0, 1000))
@@ -69,6 +95,22 @@ def test_get_all_jobs():
     assert len(j_list) >= 1
 
 
+def test_iter_all_jobs():
+    js = JobSession('js-01')
+    j_name = 'drmaa2python-%s' % int(random.uniform(0, 1000))
+    d = {'remote_command': '/bin/sleep', 'args': ['10'], 'job_name': j_name, 'output_path': '/dev/null', 'join_files': True}
+    j = js.run_job(d)
+    print('\nSubmitted job: %s' % j)
+    j.wait_started()
+    ms = MonitoringSession('ms-01')
+    j_list = list(ms.iter_all_jobs(None))
+    print('Got all jobs: %s' % j_list)
+    assert j.id in [j2.id for j2 in j_list]
+    j_iter = ms.iter_all_jobs(None)
+    print('Got first job: %s' % next(j_iter))
+    j_iter.close()
+
+
 def test_get_all_reservatios():
     rs = ReservationSession('rs-01')
     r_name = 'drmaa2python-%s' % int(random.uniform(0, 1000))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import array
+import time
+import threading
+from drmaa2.query_cache import QueryCache
+
+
+def test_get():
+    cache = QueryCache(ttl=60)
+    n_queries = []
+
+    def query():
+        n_queries.append(1)
+        return ['a', 'b']
+
+    for _ in range(3):
+        assert cache.get('get_all_queues', QueryCache.normalize_filter(['b', 'a']), query) == ['a', 'b']
+    assert len(n_queries) == 1
+    stats = cache.get_stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    print('\nGot cache stats: %s' % (stats))
+
+
+def test_ttl():
+    cache = QueryCache(ttl=60, ttls={'get_all_queues': 0.01})
+    n_queries = []
+
+    def query():
+        n_queries.append(1)
+        return []
+
+    cache.get('get_all_queues', None, query)
+    time.sleep(0.02)
+    cache.get('get_all_queues', None, query)
+    assert len(n_queries) == 2
+    print('\nGot cache stats after expiry: %s' % (cache.get_stats()))
+
+
+def test_remove_expired():
+    cache = QueryCache(ttl=0.1)
+    for key in range(10):
+        cache.get('get_jobs', key, lambda: [])
+    assert cache.get_stats()['entries'] == 10
+    time.sleep(0.2)
+    # Entries for keys that are not requested again are removed on the next miss.
+    cache.get('get_jobs', 'other', lambda: [])
+    stats = cache.get_stats()
+    assert stats['entries'] == 1
+    print('\nGot cache stats after expiry: %s' % (stats))
+
+
+def test_coalesce():
+    cache = QueryCache(ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    n_queries = []
+
+    def query():
+        n_queries.append(1)
+        started.set()
+        release.wait()
+        return ['all.q']
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('get_all_queues', None, query)))
+               for _ in range(4)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    while cache.get_stats()['coalesced'] < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(n_queries) == 1
+    assert results == [['all.q']] * 4
+    print('\nGot cache stats for coalesced requests: %s' % (cache.get_stats()))
+
+
+def test_exception():
+    cache = QueryCache(ttl=60)
+
+    def query():
+        raise ValueError('query failed')
+
+    for _ in range(2):
+        try:
+            cache.get('get_all_queues', None, query)
+            assert False
+        except ValueError:
+            pass
+    assert cache.get_stats()['misses'] == 2
+    assert cache.get_stats()['entries'] == 0
+    print('\nQuery exceptions are not cached')
+
+
+def test_copy_result():
+    cache = QueryCache(ttl=60)
+    element = object()
+    results = {'list': [element], 'columns': {'name': ['a'], 'load': array.array('d', [0.5])}}
+    for query_name in results:
+        result = cache.get(query_name, None, lambda: results[query_name])
+        if query_name == 'list':
+            result.append(None)
+        else:
+            result['name'].append('b')
+            result['load'][0] = 1.0
+    assert cache.get('list', None, None) == [element]
+    assert cache.get('list', None, None)[0] is element
+    assert cache.get('columns', None, None) == {'name': ['a'], 'load': array.array('d', [0.5])}
+    print('\nCached results are not changed by callers')
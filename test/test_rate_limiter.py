@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+import time
+import threading
+
+from drmaa2 import RateLimiter
+from drmaa2 import TryLaterError
+
+
+def test_burst():
+    limiter = RateLimiter(rate=1, burst=5, block=False)
+    for i in range(5):
+        assert limiter.acquire() == 0.0
+    try:
+        limiter.acquire()
+        assert False
+    except TryLaterError as ex:
+        print('\nGot expected exception: %s' % ex)
+    stats = limiter.get_stats()
+    assert stats['acquired'] == 5
+    assert stats['rejected'] == 1
+
+
+def test_blocking_rate():
+    rate = 200.0
+    limiter = RateLimiter(rate=rate, burst=1)
+    n_threads = 4
+    n_acquisitions = 20
+
+    def acquire():
+        for i in range(n_acquisitions):
+            limiter.acquire()
+
+    start_time = time.time()
+    threads = [threading.Thread(target=acquire) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed_time = time.time() - start_time
+    n_tokens = n_threads * n_acquisitions
+    assert elapsed_time >= (n_tokens - 1) / rate * 0.9
+    stats = limiter.get_stats()
+    assert stats['acquired'] == n_tokens
+    assert stats['waited'] >= n_tokens - 1
+    print('\nAcquired %s tokens in %.3f seconds: %s' % (n_tokens, elapsed_time, stats))
+
+
+def test_timeout():
+    limiter = RateLimiter(rate=1, burst=1, timeout=0.1)
+    limiter.acquire()
+    try:
+        limiter.acquire()
+        assert False
+    except TryLaterError as ex:
+        print('\nGot expected exception: %s' % ex)
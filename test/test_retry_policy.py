@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# ___INFO__MARK_BEGIN__
+#######################################################################################
+# Copyright 2008-2022 Altair Engineering Inc.
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not
+# use this file except in compliance with the License.
+#
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#######################################################################################
+# ___INFO__MARK_END__
+
+from ctypes import c_char_p
+
+from drmaa2 import RetryPolicy
+from drmaa2 import StatusCode
+from drmaa2.library_manager import Drmaa2Library
+
+DRM_FUNCTIONS = ['drmaa2_jsession_run_job', 'drmaa2_close_jsession', 'drmaa2_jsession_wait_any_terminated']
+
+
+class FlakyLibrary(object):
+    """ Library stub whose DRM functions fail a given number of times before succeeding. """
+
+    def __init__(self, n_failures, code=StatusCode.TRY_LATER):
+        self.n_failures = n_failures
+        self.code = int(code)
+        self.calls = 0
+        self.error = (0, b'')
+
+    def __fail(self):
+        self.calls += 1
+        if self.calls <= self.n_failures:
+            self.error = (self.code, b'error %d' % self.code)
+            return True
+        self.error = (0, b'')
+        return False
+
+    def drmaa2_jsession_run_job(self, *args):
+        if self.__fail():
+            return None
+        return 'job'
+
+    def drmaa2_close_jsession(self, *args):
+        if self.__fail():
+            return self.code
+        return 0
+
+    def drmaa2_jsession_wait_any_terminated(self, *args):
+        if self.__fail():
+            return None
+        return 'job'
+
+    def drmaa2_lasterror(self):
+        return self.error[0]
+
+    def drmaa2_lasterror_text(self):
+        return c_char_p(self.error[1])
+
+    def drmaa2_string_free(self, string_ptr):
+        pass
+
+
+def create_library(stub, retry_policy):
+    return Drmaa2Library(stub, prototypes={}, drm_functions=DRM_FUNCTIONS, retry_policy=retry_policy)
+
+
+def test_retry_until_success():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001)
+    stub = FlakyLibrary(3)
+    drmaa2_lib = create_library(stub, policy)
+    assert drmaa2_lib.drmaa2_jsession_run_job() == 'job'
+    assert stub.calls == 4
+    assert drmaa2_lib.get_last_error() == (0, '')
+    stats = policy.get_stats()
+    assert stats['retries'] == 3
+    assert stats['retries_by_function'] == {'drmaa2_jsession_run_job': 3}
+    assert stats['retries_by_code'] == {int(StatusCode.TRY_LATER): 3}
+    assert stats['recovered'] == 1
+    assert stats['exhausted'] == 0
+    print('\nGot retry stats: %s' % (stats))
+
+
+def test_retry_status_function():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    stub = FlakyLibrary(5, code=StatusCode.DRM_COMMUNICATION)
+    drmaa2_lib = create_library(stub, policy)
+    assert drmaa2_lib.drmaa2_close_jsession() == StatusCode.DRM_COMMUNICATION
+    assert stub.calls == 3
+    assert drmaa2_lib.get_last_error() == (int(StatusCode.DRM_COMMUNICATION), 'error 2')
+    stats = policy.get_stats()
+    assert stats['retries'] == 2
+    assert stats['exhausted'] == 1
+    print('\nGot retry stats: %s' % (stats))
+
+
+def test_no_retry_for_other_codes():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001)
+    stub = FlakyLibrary(1, code=StatusCode.INVALID_ARGUMENT)
+    drmaa2_lib = create_library(stub, policy)
+    assert drmaa2_lib.drmaa2_jsession_run_job() is None
+    assert stub.calls == 1
+    assert policy.get_stats()['retries'] == 0
+
+
+def test_no_retry_for_waits():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.001)
+    stub = FlakyLibrary(1)
+    drmaa2_lib = create_library(stub, policy)
+    assert drmaa2_lib.drmaa2_jsession_wait_any_terminated() is None
+    assert stub.calls == 1
+    assert drmaa2_lib.get_last_error()[0] == StatusCode.TRY_LATER
+    assert policy.get_stats()['retries'] == 0
+
+
+def test_set_retry_policy():
+    stub = FlakyLibrary(2)
+    drmaa2_lib = create_library(stub, None)
+    assert drmaa2_lib.drmaa2_jsession_run_job() is None
+    drmaa2_lib.set_retry_policy(RetryPolicy(base_delay=0.001))
+    assert drmaa2_lib.drmaa2_jsession_run_job() == 'job'
+    assert stub.calls == 3
+
+
+def test_get_delay():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, multiplier=2.0, jitter=0.5)
+    for retry in range(1, 10):
+        delay = policy.get_delay(retry)
+        max_delay = min(2.0 ** (retry - 1), 5.0)
+        assert max_delay / 2 <= delay <= max_delay
+    assert RetryPolicy(base_delay=1.0, jitter=0).get_delay(3) == 4.0
@@ -22,6 +22,8 @@ import string
 import random
 import os
 import os.path
+import subprocess
+import warnings
 from tempfile import NamedTemporaryFile
 
 from nose import SkipTest
@@ -31,6 +33,23 @@ DEFAULT_RANDOM_STRING_LENGTH = 6
 DEFAULT_RANDOM_INT_MIN = 0
 DEFAULT_RANDOM_INT_MAX = 65536
 
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+DRMAA2_STUB_SOURCE = os.path.join(TEST_DIR, 'drmaa2_stub.c')
+DRMAA2_STUB_BUILD_DIR = os.path.join(os.path.dirname(TEST_DIR), 'build', 'drmaa2_stub')
+DRMAA2_STUB_ENV = {
+    'DRMAA2_STUB_TIME_SCALE': '0.05',
+    'DRMAA2_STUB_MACHINES': 'node01,node02,node03,node04',
+    'DRMAA2_STUB_QUEUES': 'all.q,short.q',
+}
+QCONF_SHIM = '''#!/bin/sh
+# qconf replacement for tests run against the stub DRMAA2 library.
+case "$1" in
+    -sql) echo "$DRMAA2_STUB_QUEUES" | tr ',' '\\n' ;;
+    -sel) echo "$DRMAA2_STUB_MACHINES" | tr ',' '\\n' ;;
+    *) echo "qconf: option $1 is not supported with the stub DRMAA2 library" >&2; exit 1 ;;
+esac
+'''
+
 
 def generate_random_string(size=DEFAULT_RANDOM_STRING_LENGTH,
                            chars=string.ascii_lowercase + string.ascii_uppercase + string.digits):
@@ -56,12 +75,65 @@ def generate_random_string_list(n_strings, string_length, delimiter=',', string_
     string_list = ''
 
 
+def build_drmaa2_stub(build_dir=DRMAA2_STUB_BUILD_DIR):
+    """
+    Compile the stub DRMAA2 library, unless it is up to date.
+
+    :returns: Library path, or None if it could not be built.
+    """
+    library_path = os.path.join(build_dir, 'libdrmaa2.so')
+    if os.path.exists(library_path) and os.path.getmtime(library_path) >= os.path.getmtime(DRMAA2_STUB_SOURCE):
+        return library_path
+    if not os.path.isdir(build_dir):
+        os.makedirs(build_dir)
+    # Build under a temporary name, so that concurrent test runs never load a partially written library.
+    tmp_path = '%s.%s' % (library_path, os.getpid())
+    command = [os.environ.get('CC', 'cc'), '-shared', '-fPIC', '-O2', '-pthread', '-o', tmp_path,
+               DRMAA2_STUB_SOURCE]
+    try:
+        subprocess.check_call(command)
+    except (OSError, subprocess.CalledProcessError) as ex:
+        warnings.warn('Could not build stub DRMAA2 library: %s' % ex)
+        return None
+    os.rename(tmp_path, library_path)
+    return library_path
+
+
+def setup_drmaa2_stub():
+    """
+    Point the library manager to the stub DRMAA2 library if neither a
+    Grid Engine installation (SGE_ROOT) nor a DRMAA2 library
+    (DRMAA2_LIBRARY_PATH) is configured, and put a qconf replacement on
+    the path if qconf is not available.
+    """
+    if os.environ.get('SGE_ROOT') or os.environ.get('DRMAA2_LIBRARY_PATH'):
+        return
+    library_path = build_drmaa2_stub()
+    if library_path is None:
+        return
+    os.environ['DRMAA2_LIBRARY_PATH'] = library_path
+    for (name, value) in DRMAA2_STUB_ENV.items():
+        os.environ.setdefault(name, value)
+    path = os.environ.get('PATH', '')
+    if any(os.access(os.path.join(d, 'qconf'), os.X_OK) for d in path.split(os.pathsep) if d):
+        return
+    bin_dir = os.path.join(os.path.dirname(library_path), 'bin')
+    qconf_path = os.path.join(bin_dir, 'qconf')
+    if not os.path.exists(qconf_path):
+        if not os.path.isdir(bin_dir):
+            os.makedirs(bin_dir)
+        with open(qconf_path, 'w') as f:
+            f.write(QCONF_SHIM)
+        os.chmod(qconf_path, 0o755)
+    os.environ['PATH'] = os.pathsep.join([bin_dir, path]) if path else bin_dir
+
+
 # Common decorators
 def needs_uge(func):
     def inner(*args, **kwargs):
         from drmaa2 import Drmaa2Exception
-        if not os.environ.get('SGE_ROOT'):
-            raise Drmaa2Exception('SGE_ROOT is not defined.')
+        if not os.environ.get('SGE_ROOT') and not os.environ.get('DRMAA2_LIBRARY_PATH'):
+            raise Drmaa2Exception('Neither SGE_ROOT nor DRMAA2_LIBRARY_PATH is defined.')
         return func(*args, **kwargs)
 
     return make_decorator(func)(inner)